@@ -6,25 +6,33 @@ API documentation and descriptions in Bahasa Indonesia.
 from fastapi import APIRouter, HTTPException
 import asyncio
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Dict, Any, Optional, Tuple
+from app.config import PERPLEXITY_COMBINED_MODE
 from app.schemas.company import CompanyAnalysisRequest, CompanyAnalysisResponse
 from app.schemas.news import NewsAnalysisResponse
+from app.services.dedup import deduplicate_articles, skip_repeated_titles
 from app.services.perplexity_service import PerplexityService
 from app.services.sentiment_service import SentimentAnalysisService
 from app.services.mahkamah_crawler import MahkamahAgungCrawler
 from app.services.risk_scoring import RiskScoringService
+from app.services.stage_executor import StageExecutor
+from app.utils.exceptions import PerplexityQuotaExceededError, PerplexityUnavailableError
 from app.utils.logger import logger
 
 router = APIRouter(prefix="/api/v1/company", tags=["company"])
 
+LEGAL_STAGE_TIMEOUT = 45.0  # Max 45 seconds for crawler
+NEWS_STAGE_TIMEOUT = 90.0  # Perplexity news search + per-article sentiment
+
 
 @router.post("/analyze", response_model=CompanyAnalysisResponse)
 async def analyze_company(request: CompanyAnalysisRequest):
     """
     Endpoint utama untuk menganalisis perusahaan.
-    Mengorchestrasi: Perplexity → Sentiment → Legal → Risk Score
+    Mengorchestrasi: (Perplexity → Sentiment) ‖ Legal ‖ Berita → Risk Score
     
-    Durasi: 15-30 detik (khas)
+    Tahap yang independen dijalankan paralel, sehingga durasi kira-kira
+    sama dengan tahap paling lambat (biasanya crawler Mahkamah Agung).
     
     Args:
         request: CompanyAnalysisRequest dengan pt_name dan detailed flag
@@ -43,132 +51,70 @@ async def analyze_company(request: CompanyAnalysisRequest):
         
         logger.info(f"Memulai analisis untuk: {request.pt_name}")
         
-        # 1. Get company data from Perplexity
         perplexity_service = PerplexityService()
-        company_data = await perplexity_service.search_company(request.pt_name)
-        
-        # 2. Sentiment analysis
         sentiment_service = SentimentAnalysisService()
-        extracted_text = perplexity_service.extract_sentiment_text(
-            company_data['extracted_text']
-        )
-        sentiment_results = sentiment_service.analyze_batch([extracted_text])
+        crawler = MahkamahAgungCrawler()
         
-        # 3. Legal records crawl (with timeout protection)
-        try:
-            crawler = MahkamahAgungCrawler()
-            legal_results = await asyncio.wait_for(
-                crawler.search_company(request.pt_name),
-                timeout=45.0  # Max 45 seconds for crawler
+        # 1. Get company data from Perplexity
+        async def company_stage():
+            return await perplexity_service.search_company(request.pt_name)
+        
+        # Combined mode: profile and news come from one structured call
+        async def perplexity_stage():
+            return await perplexity_service.search_company_and_news(request.pt_name, limit=10)
+        
+        async def combined_company_stage(perplexity):
+            return perplexity[0]
+        
+        # 2. Sentiment analysis (only stage that depends on another one)
+        async def sentiment_stage(company):
+            extracted_text = perplexity_service.extract_sentiment_text(
+                company['extracted_text']
             )
-        except asyncio.TimeoutError:
-            logger.warning(f"Timeout saat crawling Mahkamah Agung untuk {request.pt_name}")
-            legal_results = {
-                "company_name": request.pt_name,
-                "cases_found": 0,
-                "cases": [],
-                "max_severity": "tidak ada",
-                "timestamp": datetime.now().isoformat(),
-                "source": "mahkamah_agung",
-                "error": "Timeout saat mengakses database Mahkamah Agung"
-            }
-        except Exception as e:
-            logger.error(f"Error crawling Mahkamah Agung: {str(e)}")
-            legal_results = {
-                "company_name": request.pt_name,
-                "cases_found": 0,
-                "cases": [],
-                "max_severity": "tidak ada",
-                "timestamp": datetime.now().isoformat(),
-                "source": "mahkamah_agung",
-                "error": f"Kesalahan crawler: {str(e)}"
-            }
-        
-        # 4. News analysis (optional, run in parallel or after main analysis)
-        news_analysis: Optional[Dict[str, Any]] = None
-        news_sources: list = []
-        try:
-            logger.info(f"Memulai analisis berita untuk: {request.pt_name}")
-            news_data = await perplexity_service.search_latest_news(request.pt_name, limit=10)
-            # Collect sources from news search
-            news_sources = news_data.get('sources', [])
-            
-            # Analyze sentiment for each news article
-            # First, check if news is directly related to the company
-            company_name_lower = request.pt_name.lower()
-            company_keywords = [company_name_lower]
-            # Extract key words from company name (e.g., "Bank Mandiri" -> ["bank", "mandiri"])
-            company_words = [w for w in company_name_lower.split() if len(w) > 3]
-            company_keywords.extend(company_words)
-            
-            articles_with_sentiment = []
-            for article in news_data.get('news_articles', []):
-                title = article.get('title', '')
-                summary = article.get('summary', '')
-                combined_text = f"{title} {summary}".lower()
-                
-                # Check if news is directly related to the company
-                is_relevant = False
-                for keyword in company_keywords:
-                    if keyword in combined_text:
-                        is_relevant = True
-                        break
-                
-                # Skip news that doesn't mention the company
-                if not is_relevant:
-                    logger.debug(f"Berita tidak relevan (tidak menyebutkan {request.pt_name}): {title[:50]}...")
-                    continue
-                
-                text_to_analyze = f"{title} {summary}"
-                text_to_analyze = perplexity_service.extract_sentiment_text(text_to_analyze)
-                
-                if len(text_to_analyze.strip()) < 10:
-                    continue
-                
-                sentiment_result = sentiment_service.analyze_text(text_to_analyze)
-                if 'error' in sentiment_result:
-                    continue
-                
-                articles_with_sentiment.append({
-                    "title": title,
-                    "summary": summary,
-                    "source_url": article.get('source_url', ''),
-                    "date": article.get('date'),
-                    "sentiment_label": sentiment_result.get('sentiment_label', 'NETRAL'),
-                    "sentiment_score": sentiment_result.get('consensus_score', 0.5),
-                    "confidence": sentiment_result.get('confidence', 0.0),
-                    "is_relevant": True  # Mark as relevant since we filtered
-                })
-            
-            # Calculate statistics
-            positive_count = sum(1 for a in articles_with_sentiment if a['sentiment_label'] == "POSITIF")
-            neutral_count = sum(1 for a in articles_with_sentiment if a['sentiment_label'] == "NETRAL")
-            negative_count = sum(1 for a in articles_with_sentiment if a['sentiment_label'] == "NEGATIF")
-            
-            news_analysis = {
-                "company_name": request.pt_name,
-                "total_articles": len(articles_with_sentiment),
-                "positive_count": positive_count,
-                "neutral_count": neutral_count,
-                "negative_count": negative_count,
-                "articles": articles_with_sentiment,
-                "timestamp": datetime.now().isoformat(),
-                "status": "sukses"
-            }
-            logger.info(f"Analisis berita selesai: {positive_count} positif, {neutral_count} netral, {negative_count} negatif")
-        except Exception as e:
-            logger.warning(f"Gagal menganalisis berita untuk {request.pt_name}: {str(e)}")
-            news_analysis = {
-                "company_name": request.pt_name,
-                "total_articles": 0,
-                "positive_count": 0,
-                "neutral_count": 0,
-                "negative_count": 0,
-                "articles": [],
-                "timestamp": datetime.now().isoformat(),
-                "status": "gagal",
-                "error": f"Gagal menganalisis berita: {str(e)}"
-            }
+            return await sentiment_service.analyze_batch_async([extracted_text])
+        
+        # 3. Legal records crawl (with timeout protection)
+        async def legal_stage():
+            return await crawler.search_company(request.pt_name)
+        
+        # 4. News analysis
+        async def news_stage():
+            try:
+                return await _analyze_news(request.pt_name, perplexity_service, sentiment_service)
+            finally:
+                # Streamed articles that were never claimed (search failed, or filtered out)
+                sentiment_service.discard_early_scores()
+        
+        async def combined_news_stage(perplexity):
+            return await _analyze_news(request.pt_name, perplexity_service, sentiment_service, news_data=perplexity[1])
+        
+        # Stages 1, 3 and 4 are independent and run concurrently
+        executor = StageExecutor(name=f"analyze:{request.pt_name}")
+        if PERPLEXITY_COMBINED_MODE:
+            executor.add_stage("perplexity", perplexity_stage)
+            executor.add_stage("company", combined_company_stage, depends_on=["perplexity"])
+        else:
+            executor.add_stage("company", company_stage)
+        executor.add_stage("sentiment", sentiment_stage, depends_on=["company"])
+        executor.add_stage(
+            "legal",
+            legal_stage,
+            timeout=LEGAL_STAGE_TIMEOUT,
+            fallback=lambda e: _legal_fallback(request.pt_name, e)
+        )
+        executor.add_stage(
+            "news",
+            combined_news_stage if PERPLEXITY_COMBINED_MODE else news_stage,
+            depends_on=["perplexity"] if PERPLEXITY_COMBINED_MODE else [],
+            timeout=NEWS_STAGE_TIMEOUT,
+            fallback=lambda e: (_news_fallback(request.pt_name, e), [])
+        )
+        results = await executor.run()
+        
+        company_data = results["company"]
+        sentiment_results = results["sentiment"]
+        legal_results = results["legal"]
+        news_analysis, news_sources = results["news"]
         
         # 5. Risk calculation
         # Combine sentiment from company search and news analysis
@@ -176,7 +122,8 @@ async def analyze_company(request: CompanyAnalysisRequest):
         
         # If we have news analysis, incorporate it into risk calculation
         if news_analysis and news_analysis.get('total_articles', 0) > 0:
-            # Add news sentiment scores to the analysis
+            # Add news sentiment scores to the analysis; each near-duplicate
+            # cluster counts once (cluster_size is reported, not weighted)
             news_scores = [a.get('sentiment_score', 0.5) for a in news_analysis.get('articles', [])]
             if news_scores:
                 # Combine with existing sentiment scores
@@ -212,7 +159,8 @@ async def analyze_company(request: CompanyAnalysisRequest):
                 },
                 "news_analysis": news_analysis,  # Add news analysis
                 "perplexity_sources": company_data.get('sources', []),  # Add Perplexity sources from company search
-                "perplexity_news_sources": news_sources  # Add Perplexity sources from news search
+                "perplexity_news_sources": news_sources,  # Add Perplexity sources from news search
+                "stages": executor.report  # Per-stage status and duration
             },
             "timestamp": company_data['timestamp']
         }
@@ -222,6 +170,13 @@ async def analyze_company(request: CompanyAnalysisRequest):
     
     except HTTPException:
         raise
+    except PerplexityUnavailableError as e:
+        # No cached profile to fall back on: fail fast instead of queueing
+        logger.warning(f"Analisis {request.pt_name} ditolak: {str(e)}")
+        raise HTTPException(
+            status_code=429 if isinstance(e, PerplexityQuotaExceededError) else 503,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Gagal menganalisis perusahaan: {str(e)}")
         raise HTTPException(
@@ -229,3 +184,136 @@ async def analyze_company(request: CompanyAnalysisRequest):
             detail=f"Gagal menganalisis perusahaan: {str(e)}"
         )
 
+
+
+async def _analyze_news(
+    company_name: str,
+    perplexity_service: PerplexityService,
+    sentiment_service: SentimentAnalysisService,
+    news_data: Optional[Dict[str, Any]] = None
+) -> Tuple[Dict[str, Any], list]:
+    """
+    Search latest news (unless ``news_data`` is already given) and score each
+    relevant article. Returns (news_analysis, news_sources).
+    """
+    logger.info(f"Memulai analisis berita untuk: {company_name}")
+    if news_data is None:
+        # Streamed articles start scoring while later ones are generated;
+        # repeated titles are dropped before they reach the model
+        news_data = await perplexity_service.search_latest_news(
+            company_name,
+            limit=10,
+            on_article=skip_repeated_titles(lambda article: sentiment_service.score_early(
+                perplexity_service.article_sentiment_text(article)
+            ))
+        )
+    # Collect sources from news search
+    news_sources = news_data.get('sources', [])
+    
+    # Analyze sentiment for each news article
+    # First, check if news is directly related to the company
+    company_name_lower = company_name.lower()
+    company_keywords = [company_name_lower]
+    # Extract key words from company name (e.g., "Bank Mandiri" -> ["bank", "mandiri"])
+    company_words = [w for w in company_name_lower.split() if len(w) > 3]
+    company_keywords.extend(company_words)
+    
+    candidates = []
+    # Syndicated or re-parsed copies of a story are scored and counted once
+    for article, cluster_size in deduplicate_articles(news_data.get('news_articles', [])):
+        title = article.get('title', '')
+        summary = article.get('summary', '')
+        combined_text = f"{title} {summary}".lower()
+        
+        # Check if news is directly related to the company
+        is_relevant = False
+        for keyword in company_keywords:
+            if keyword in combined_text:
+                is_relevant = True
+                break
+        
+        # Skip news that doesn't mention the company
+        if not is_relevant:
+            logger.debug(f"Berita tidak relevan (tidak menyebutkan {company_name}): {title[:50]}...")
+            continue
+        
+        text_to_analyze = perplexity_service.article_sentiment_text(article)
+        
+        if len(text_to_analyze.strip()) < 10:
+            continue
+        
+        candidates.append((article, cluster_size, text_to_analyze))
+    
+    # Score all relevant articles together (batched with concurrent requests)
+    sentiment_results = await sentiment_service.analyze_texts([text for _, _, text in candidates])
+    
+    articles_with_sentiment = []
+    for (article, cluster_size, _), sentiment_result in zip(candidates, sentiment_results):
+        if 'error' in sentiment_result:
+            continue
+        
+        articles_with_sentiment.append({
+            "title": article.get('title', ''),
+            "summary": article.get('summary', ''),
+            "source_url": article.get('source_url', ''),
+            "date": article.get('date'),
+            "sentiment_label": sentiment_result.get('sentiment_label', 'NETRAL'),
+            "sentiment_score": sentiment_result.get('consensus_score', 0.5),
+            "confidence": sentiment_result.get('confidence', 0.0),
+            "is_relevant": True,  # Mark as relevant since we filtered
+            "cluster_size": cluster_size
+        })
+    
+    # Calculate statistics
+    positive_count = sum(1 for a in articles_with_sentiment if a['sentiment_label'] == "POSITIF")
+    neutral_count = sum(1 for a in articles_with_sentiment if a['sentiment_label'] == "NETRAL")
+    negative_count = sum(1 for a in articles_with_sentiment if a['sentiment_label'] == "NEGATIF")
+    
+    news_analysis = {
+        "company_name": company_name,
+        "total_articles": len(articles_with_sentiment),
+        "positive_count": positive_count,
+        "neutral_count": neutral_count,
+        "negative_count": negative_count,
+        "articles": articles_with_sentiment,
+        "timestamp": datetime.now().isoformat(),
+        "status": "sukses"
+    }
+    logger.info(f"Analisis berita selesai: {positive_count} positif, {neutral_count} netral, {negative_count} negatif")
+    return news_analysis, news_sources
+
+
+def _legal_fallback(company_name: str, error: Exception) -> Dict[str, Any]:
+    """Empty legal result used when the crawler stage fails or times out."""
+    if isinstance(error, asyncio.TimeoutError):
+        logger.warning(f"Timeout saat crawling Mahkamah Agung untuk {company_name}")
+        message = "Timeout saat mengakses database Mahkamah Agung"
+    else:
+        logger.error(f"Error crawling Mahkamah Agung: {str(error)}")
+        message = f"Kesalahan crawler: {str(error)}"
+    return {
+        "company_name": company_name,
+        "cases_found": 0,
+        "cases": [],
+        "max_severity": "tidak ada",
+        "timestamp": datetime.now().isoformat(),
+        "source": "mahkamah_agung",
+        "error": message
+    }
+
+
+def _news_fallback(company_name: str, error: Exception) -> Dict[str, Any]:
+    """Empty news analysis used when the news stage fails or times out."""
+    message = str(error) or "Timeout saat mencari berita"
+    logger.warning(f"Gagal menganalisis berita untuk {company_name}: {message}")
+    return {
+        "company_name": company_name,
+        "total_articles": 0,
+        "positive_count": 0,
+        "neutral_count": 0,
+        "negative_count": 0,
+        "articles": [],
+        "timestamp": datetime.now().isoformat(),
+        "status": error.stage_status if isinstance(error, PerplexityUnavailableError) else "gagal",
+        "error": f"Gagal menganalisis berita: {message}"
+    }
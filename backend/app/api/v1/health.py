@@ -3,12 +3,63 @@ Health check endpoint.
 """
 
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from app.services.browser_pool import browser_pool
+from app.services.host_scheduler import host_scheduler
+from app.services.inference_executor import inference_executor
+from app.services.mahkamah_crawler import crawl_metrics
+from app.services.model_registry import model_registry
+from app.services.perplexity_cache import perplexity_cache
+from app.services.perplexity_quota import perplexity_quota
+from app.services.perplexity_service import perplexity_upstream
+from app.services.sentiment_cache import sentiment_cache
+from app.services.sentiment_service import inference_queue
 
 router = APIRouter(tags=["health"])
 
 
 @router.get("/health")
 async def health_check():
-    """Health check endpoint."""
-    return {"status": "ok", "message": "Layanan berjalan dengan baik"}
+    """Liveness check: in-process counters only, answers without touching the inference pool."""
+    return {
+        "status": "ok",
+        "message": "Layanan berjalan dengan baik",
+        "sentiment_model": model_registry.status(),
+        "inference_queue": inference_queue.stats(),
+        "inference_executor": inference_executor.stats(),
+        "sentiment_cache": sentiment_cache.stats() if sentiment_cache is not None else None,
+        "perplexity_cache": perplexity_cache.stats() if perplexity_cache is not None else None,
+        "perplexity_quota": perplexity_quota.stats(),
+        "perplexity_upstream": perplexity_upstream.stats(),
+        "browser_pool": browser_pool.stats(),
+        "host_scheduler": host_scheduler.stats(),
+        "mahkamah_fetch": crawl_metrics
+    }
 
+
+@router.get("/health/ready")
+async def readiness_check():
+    """
+    Readiness check: 503 until the sentiment model is loaded and warmed up.
+    In remote mode this asks the shared worker pool (per-worker stats included).
+    """
+    # Refreshes readiness of the shared worker pool in remote mode
+    worker_stats = await inference_executor.worker_stats()
+    model_status = model_registry.status()
+    model_status["ready"] = inference_executor.ready()
+    if not model_status["ready"]:
+        return JSONResponse(
+            status_code=503,
+            content={
+                "status": "loading",
+                "message": "Model sentimen sedang dimuat",
+                "sentiment_model": model_status,
+                "inference_workers": worker_stats
+            }
+        )
+    return {
+        "status": "ready",
+        "message": "Layanan siap menerima analisis",
+        "sentiment_model": model_status,
+        "inference_workers": worker_stats
+    }
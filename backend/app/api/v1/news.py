@@ -5,13 +5,19 @@ API untuk mencari dan menganalisis sentimen berita terbaru tentang perusahaan.
 
 from fastapi import APIRouter, HTTPException
 from app.schemas.news import NewsAnalysisRequest, NewsAnalysisResponse, NewsArticle
+from app.services.dedup import deduplicate_articles, skip_repeated_titles
 from app.services.perplexity_service import PerplexityService
 from app.services.sentiment_service import SentimentAnalysisService
+from app.services.stage_executor import StageExecutor
+from app.utils.exceptions import PerplexityUnavailableError
 from app.utils.logger import logger
 from datetime import datetime
+from typing import Any, Dict, List
 
 router = APIRouter(prefix="/api/v1/news", tags=["news"])
 
+SEARCH_STAGE_TIMEOUT = 75.0  # Perplexity client itself times out at 60 seconds
+
 
 @router.post("/analyze", response_model=NewsAnalysisResponse, summary="Analisis sentimen berita terbaru")
 async def analyze_news(request: NewsAnalysisRequest):
@@ -42,48 +48,36 @@ async def analyze_news(request: NewsAnalysisRequest):
         
         logger.info(f"Memulai pencarian berita untuk: {request.company_name}")
         
-        # 1. Search for latest news using Perplexity
         perplexity_service = PerplexityService()
-        news_data = await perplexity_service.search_latest_news(
-            request.company_name,
-            limit=request.limit
-        )
+        sentiment_service = SentimentAnalysisService()
         
-        logger.info(f"Ditemukan {news_data.get('total_found', 0)} artikel berita")
+        # 1. Search for latest news using Perplexity
+        async def search_stage():
+            # Streamed articles start scoring while later ones are generated;
+            # repeated titles are dropped before they reach the model
+            news_data = await perplexity_service.search_latest_news(
+                request.company_name,
+                limit=request.limit,
+                on_article=skip_repeated_titles(lambda article: sentiment_service.score_early(
+                    perplexity_service.article_sentiment_text(article)
+                ))
+            )
+            logger.info(f"Ditemukan {news_data.get('total_found', 0)} artikel berita")
+            return news_data
         
         # 2. Analyze sentiment for each news article
-        sentiment_service = SentimentAnalysisService()
-        articles_with_sentiment = []
+        async def sentiment_stage(search):
+            return await _score_articles(search, perplexity_service, sentiment_service)
         
-        for article in news_data.get('news_articles', []):
-            # Combine title and summary for sentiment analysis
-            text_to_analyze = f"{article.get('title', '')} {article.get('summary', '')}"
-            text_to_analyze = perplexity_service.extract_sentiment_text(text_to_analyze)
-            
-            if len(text_to_analyze.strip()) < 10:
-                # Skip if text is too short
-                logger.warning(f"Artikel '{article.get('title', '')}' terlalu pendek untuk dianalisis")
-                continue
-            
-            # Analyze sentiment
-            sentiment_result = sentiment_service.analyze_text(text_to_analyze)
-            
-            if 'error' in sentiment_result:
-                logger.warning(f"Gagal menganalisis sentimen untuk artikel: {article.get('title', '')}")
-                continue
-            
-            # Create article with sentiment
-            article_with_sentiment = NewsArticle(
-                title=article.get('title', 'Tidak ada judul'),
-                summary=article.get('summary', 'Tidak ada ringkasan'),
-                source_url=article.get('source_url', ''),
-                date=article.get('date'),
-                sentiment_label=sentiment_result.get('sentiment_label', 'NETRAL'),
-                sentiment_score=sentiment_result.get('consensus_score', 0.5),
-                confidence=sentiment_result.get('confidence', 0.0)
-            )
-            
-            articles_with_sentiment.append(article_with_sentiment)
+        executor = StageExecutor(name=f"news:{request.company_name}")
+        executor.add_stage("search", search_stage, timeout=SEARCH_STAGE_TIMEOUT)
+        executor.add_stage("sentiment", sentiment_stage, depends_on=["search"])
+        try:
+            results = await executor.run()
+        finally:
+            # Streamed articles that were never claimed, e.g. when the search stage failed
+            sentiment_service.discard_early_scores()
+        articles_with_sentiment = results["sentiment"]
         
         # 3. Calculate statistics
         positive_count = sum(1 for a in articles_with_sentiment if a.sentiment_label == "POSITIF")
@@ -116,9 +110,60 @@ async def analyze_news(request: NewsAnalysisRequest):
             negative_count=0,
             articles=[],
             timestamp=datetime.now().isoformat(),
-            status="gagal",
+            status=e.stage_status if isinstance(e, PerplexityUnavailableError) else "gagal",
             error=f"Gagal menganalisis berita: {str(e)}"
         )
 
 
-
+async def _score_articles(
+    news_data: Dict[str, Any],
+    perplexity_service: PerplexityService,
+    sentiment_service: SentimentAnalysisService
+) -> List[NewsArticle]:
+    """
+    Analyze sentiment for each news article returned by the search stage.
+    Near-duplicate articles are scored once; the representative carries the
+    cluster size.
+    """
+    candidates = []
+    
+    articles = news_data.get('news_articles', [])
+    clusters = deduplicate_articles(articles)
+    if len(clusters) < len(articles):
+        logger.info(f"{len(articles) - len(clusters)} artikel duplikat digabung")
+    
+    for article, cluster_size in clusters:
+        # Combine title and summary for sentiment analysis
+        text_to_analyze = perplexity_service.article_sentiment_text(article)
+        
+        if len(text_to_analyze.strip()) < 10:
+            # Skip if text is too short
+            logger.warning(f"Artikel '{article.get('title', '')}' terlalu pendek untuk dianalisis")
+            continue
+        
+        candidates.append((article, cluster_size, text_to_analyze))
+    
+    # Analyze sentiment for all articles in one batched call
+    sentiment_results = await sentiment_service.analyze_texts([text for _, _, text in candidates])
+    
+    articles_with_sentiment = []
+    for (article, cluster_size, _), sentiment_result in zip(candidates, sentiment_results):
+        if 'error' in sentiment_result:
+            logger.warning(f"Gagal menganalisis sentimen untuk artikel: {article.get('title', '')}")
+            continue
+        
+        # Create article with sentiment
+        article_with_sentiment = NewsArticle(
+            title=article.get('title', 'Tidak ada judul'),
+            summary=article.get('summary', 'Tidak ada ringkasan'),
+            source_url=article.get('source_url', ''),
+            date=article.get('date'),
+            sentiment_label=sentiment_result.get('sentiment_label', 'NETRAL'),
+            sentiment_score=sentiment_result.get('consensus_score', 0.5),
+            confidence=sentiment_result.get('confidence', 0.0),
+            cluster_size=cluster_size
+        )
+        
+        articles_with_sentiment.append(article_with_sentiment)
+    
+    return articles_with_sentiment
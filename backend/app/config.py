@@ -10,7 +10,37 @@ load_dotenv()
 
 # Perplexity API
 PERPLEXITY_API_KEY = os.getenv("PERPLEXITY_API_KEY")
-PERPLEXITY_MAX_REQUESTS_PER_DAY = int(os.getenv("PERPLEXITY_MAX_REQUESTS_PER_DAY", "100"))
+PERPLEXITY_MAX_REQUESTS_PER_DAY = int(os.getenv("PERPLEXITY_MAX_REQUESTS_PER_DAY", "100"))  # Per UTC day, 0 = unlimited
+PERPLEXITY_RATE_PER_SECOND = float(os.getenv("PERPLEXITY_RATE_PER_SECOND", "1"))  # Token bucket refill, 0 = unpaced
+PERPLEXITY_BURST = float(os.getenv("PERPLEXITY_BURST", "2"))  # Token bucket capacity
+PERPLEXITY_MAX_WAITERS = int(os.getenv("PERPLEXITY_MAX_WAITERS", "20"))  # Callers queued for a token before rejecting
+PERPLEXITY_MAX_QUEUE_WAIT = float(os.getenv("PERPLEXITY_MAX_QUEUE_WAIT", "10"))  # Seconds a caller may wait for a token
+PERPLEXITY_RETRY_ATTEMPTS = int(os.getenv("PERPLEXITY_RETRY_ATTEMPTS", "3"))  # Attempts per call (429, 5xx, timeouts)
+PERPLEXITY_RETRY_BASE_DELAY = float(os.getenv("PERPLEXITY_RETRY_BASE_DELAY", "0.5"))  # Seconds, doubled per attempt, full jitter
+PERPLEXITY_RETRY_MAX_DELAY = float(os.getenv("PERPLEXITY_RETRY_MAX_DELAY", "8"))  # Longer Retry-After values are not waited for
+PERPLEXITY_RETRY_BUDGET = float(os.getenv("PERPLEXITY_RETRY_BUDGET", "75"))  # No retry starts after this many seconds
+PERPLEXITY_HEDGE_ENABLED = os.getenv("PERPLEXITY_HEDGE_ENABLED", "false").lower() == "true"  # Duplicate requests slower than p95
+PERPLEXITY_HEDGE_MIN_DELAY = float(os.getenv("PERPLEXITY_HEDGE_MIN_DELAY", "2"))  # Floor for the p95 hedge delay (seconds)
+PERPLEXITY_BREAKER_FAILURES = int(os.getenv("PERPLEXITY_BREAKER_FAILURES", "5"))  # Consecutive failures that open the circuit
+PERPLEXITY_BREAKER_RESET = float(os.getenv("PERPLEXITY_BREAKER_RESET", "30"))  # Seconds before a half-open probe
+PERPLEXITY_COMBINED_MODE = os.getenv("PERPLEXITY_COMBINED_MODE", "false").lower() == "true"  # Profile + news in one JSON call
+PERPLEXITY_STREAM_NEWS = os.getenv("PERPLEXITY_STREAM_NEWS", "false").lower() == "true"  # Score news articles while the answer streams
+PERPLEXITY_CACHE_ENABLED = os.getenv("PERPLEXITY_CACHE_ENABLED", "true").lower() == "true"
+PERPLEXITY_CACHE_COMPANY_TTL = float(os.getenv("PERPLEXITY_CACHE_COMPANY_TTL", "604800"))  # Seconds (7 days)
+PERPLEXITY_CACHE_NEWS_TTL = float(os.getenv("PERPLEXITY_CACHE_NEWS_TTL", "21600"))  # Seconds (6 hours)
+PERPLEXITY_CACHE_STALE_FACTOR = float(os.getenv("PERPLEXITY_CACHE_STALE_FACTOR", "4"))  # Serve stale up to TTL x factor
+
+# Shared outbound HTTP client (keep-alive pool)
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "60"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))  # Seconds an idle connection is kept
+HTTP_HTTP2 = os.getenv("HTTP_HTTP2", "true").lower() == "true"  # Needs the h2 package
+
+# News
+NEWS_DEDUP_ENABLED = os.getenv("NEWS_DEDUP_ENABLED", "true").lower() == "true"  # Score one article per near-duplicate cluster
+NEWS_DEDUP_MAX_DISTANCE = int(os.getenv("NEWS_DEDUP_MAX_DISTANCE", "10"))  # SimHash Hamming distance (of 64 bits)
 
 # Database
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/credit_scoring.db")
@@ -21,9 +51,47 @@ HOST = os.getenv("HOST", "0.0.0.0")
 PORT = int(os.getenv("PORT", "8000"))
 
 # Crawling
-MAHKAMAH_CRAWL_DELAY = float(os.getenv("MAHKAMAH_CRAWL_DELAY_SECONDS", "0.5"))
+MAHKAMAH_CRAWL_DELAY = float(os.getenv("MAHKAMAH_CRAWL_DELAY_SECONDS", "0.5"))  # Minimum interval between requests to one host, across all searches
+MAHKAMAH_HOST_BURST = float(os.getenv("MAHKAMAH_HOST_BURST", "1"))  # Requests allowed back to back before the interval applies
+MAHKAMAH_MAX_PAGES = int(os.getenv("MAHKAMAH_MAX_PAGES", "5"))  # Result pages crawled per search (1 = first page only)
+MAHKAMAH_MAX_CASES = int(os.getenv("MAHKAMAH_MAX_CASES", "50"))  # Cases collected per search before crawling stops
+MAHKAMAH_SEARCH_DEADLINE = float(os.getenv("MAHKAMAH_SEARCH_DEADLINE", "30"))  # Seconds per search; later pages still pending are dropped
+MAHKAMAH_FETCH_MODE = os.getenv("MAHKAMAH_FETCH_MODE", "auto").lower()  # auto | race | browser | http
+MAHKAMAH_BROWSER_POOL_SIZE = int(os.getenv("MAHKAMAH_BROWSER_POOL_SIZE", "2"))  # Concurrent pages on the shared browser
+MAHKAMAH_BROWSER_MAX_USES = int(os.getenv("MAHKAMAH_BROWSER_MAX_USES", "50"))  # Searches before a page is recycled
+MAHKAMAH_BROWSER_PREWARM = os.getenv("MAHKAMAH_BROWSER_PREWARM", "false").lower() == "true"  # Launch the browser on startup
 
 # NLP Model
-SENTIMENT_MODEL = os.getenv("SENTIMENT_MODEL", "distilbert-base-multilingual-uncased-sentiment")
+SENTIMENT_MODEL = os.getenv("SENTIMENT_MODEL", "nlptown/bert-base-multilingual-uncased-sentiment")
+# Comma-separated, tried in order after SENTIMENT_MODEL
+SENTIMENT_MODEL_FALLBACKS = os.getenv("SENTIMENT_MODEL_FALLBACKS", "cardiffnlp/twitter-xlm-roberta-base-sentiment")
+SENTIMENT_MODEL_STORE = os.getenv("SENTIMENT_MODEL_STORE", "./models")  # Pre-baked artifacts (scripts/pull_models.py)
+SENTIMENT_OFFLINE = os.getenv("SENTIMENT_OFFLINE", "false").lower() == "true"  # Load only from the model store
 TORCH_DEVICE = os.getenv("TORCH_DEVICE", "cpu")  # Always CPU for on-premise
+# Bundled NLTK data (vader_lexicon); nothing is downloaded at runtime
+NLTK_DATA_DIR = os.getenv("NLTK_DATA_DIR", "./nltk_data")
+SENTIMENT_BACKEND = os.getenv("SENTIMENT_BACKEND", "torch")  # torch | onnx
+SENTIMENT_ONNX_DIR = os.getenv("SENTIMENT_ONNX_DIR", "./models/onnx")
+SENTIMENT_ONNX_QUANTIZED = os.getenv("SENTIMENT_ONNX_QUANTIZED", "true").lower() == "true"
+SENTIMENT_LEXICON = os.getenv("SENTIMENT_LEXICON", "vader")  # vader | indonesian
+SENTIMENT_MAX_TOKENS = int(os.getenv("SENTIMENT_MAX_TOKENS", "512"))  # Token window per chunk (capped at the model limit)
+SENTIMENT_BATCH_MAX_SIZE = int(os.getenv("SENTIMENT_BATCH_MAX_SIZE", "32"))  # Texts per padded forward pass
+SENTIMENT_BATCH_MAX_WAIT_MS = float(os.getenv("SENTIMENT_BATCH_MAX_WAIT_MS", "10"))  # Wait for more texts before running a batch
+INFERENCE_EXECUTOR = os.getenv("INFERENCE_EXECUTOR", "thread")  # thread | process | remote
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "1"))
+INFERENCE_TORCH_THREADS = int(os.getenv("INFERENCE_TORCH_THREADS", "0"))  # 0 = cpu_count / INFERENCE_WORKERS
+# Shared worker pool (scripts/run_inference_workers.py) used by INFERENCE_EXECUTOR=remote
+INFERENCE_SOCKET = os.getenv("INFERENCE_SOCKET", "./data/inference.sock")
+INFERENCE_AUTHKEY = os.getenv("INFERENCE_AUTHKEY", "")  # Required in remote mode (HMAC handshake on the socket)
+INFERENCE_REMOTE_TIMEOUT = float(os.getenv("INFERENCE_REMOTE_TIMEOUT", "120"))
+# Tiered scoring: lexicon first, transformer only when the lexicon score is
+# inside (SENTIMENT_TIER_LOW, SENTIMENT_TIER_HIGH) on the 0-1 scale
+SENTIMENT_TIERED_MODE = os.getenv("SENTIMENT_TIERED_MODE", "false").lower() == "true"
+SENTIMENT_TIER_LOW = float(os.getenv("SENTIMENT_TIER_LOW", "0.2"))
+SENTIMENT_TIER_HIGH = float(os.getenv("SENTIMENT_TIER_HIGH", "0.8"))
+SENTIMENT_CACHE_ENABLED = os.getenv("SENTIMENT_CACHE_ENABLED", "true").lower() == "true"
+SENTIMENT_CACHE_MAX_ENTRIES = int(os.getenv("SENTIMENT_CACHE_MAX_ENTRIES", "10000"))  # In-process LRU size
+SENTIMENT_CACHE_PERSISTENT = os.getenv("SENTIMENT_CACHE_PERSISTENT", "true").lower() == "true"  # SQLite tier
+SENTIMENT_CACHE_VERSION = os.getenv("SENTIMENT_CACHE_VERSION", "1")  # Bump to invalidate cached results
+SENTIMENT_WARMUP_ON_STARTUP = os.getenv("SENTIMENT_WARMUP_ON_STARTUP", "true").lower() == "true"
 
@@ -29,7 +29,7 @@ def get_db() -> Session:
 
 def init_db():
     """Initialize database tables."""
-    from app.models import company, sentiment, legal_record, analysis_summary
+    from app.models import company, sentiment, legal_record, analysis_summary, sentiment_cache, perplexity_cache, perplexity_usage
     from app.models.company import Base
     
     # Create all tables
@@ -0,0 +1,18 @@
+"""
+Perplexity response cache ORM model.
+Stores raw Perplexity results per normalized company name and query type.
+"""
+
+from sqlalchemy import Column, String, DateTime, Text
+from app.models.company import Base
+
+
+class PerplexityCacheEntry(Base):
+    """Cached Perplexity result keyed by query type + normalized company name."""
+    __tablename__ = "perplexity_cache"
+
+    cache_key = Column(String(300), primary_key=True)  # "<query_type>:<normalized name>[:<params>]"
+    query_type = Column(String(50), nullable=False, index=True)  # company, news
+    company_name = Column(String(255), nullable=False, index=True)  # Normalized
+    response_json = Column(Text, nullable=False)  # UTF-8 for Indonesian content
+    fetched_at = Column(DateTime(timezone=True), nullable=False)
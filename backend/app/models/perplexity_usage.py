@@ -0,0 +1,16 @@
+"""
+Perplexity usage ORM model.
+Persists the daily request count so restarts do not reset the quota.
+"""
+
+from sqlalchemy import Column, String, Integer, DateTime
+from app.models.company import Base
+
+
+class PerplexityUsage(Base):
+    """Number of Perplexity requests issued on one (UTC) day."""
+    __tablename__ = "perplexity_usage"
+
+    day = Column(String(10), primary_key=True)  # YYYY-MM-DD (UTC)
+    request_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,18 @@
+"""
+Sentiment result cache ORM model.
+Persistent tier of the content-addressed sentiment cache.
+"""
+
+from sqlalchemy import Column, String, DateTime, Text
+from sqlalchemy.sql import func
+from app.models.company import Base
+
+
+class SentimentCacheEntry(Base):
+    """Cached sentiment result keyed by hash(model id, version, normalized text)."""
+    __tablename__ = "sentiment_cache"
+
+    cache_key = Column(String(64), primary_key=True)  # SHA-256 hex digest
+    model_id = Column(String(255), nullable=False, index=True)
+    result_json = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
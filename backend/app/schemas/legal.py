@@ -24,6 +24,7 @@ class LegalRecords(BaseModel):
     company_name: str
     cases_found: int
     cases: List[LegalCase]
+    pages_crawled: Optional[int] = None
     max_severity: str  # tinggi, sedang, rendah, tidak ada
     timestamp: str
     source: str = "mahkamah_agung"
@@ -16,6 +16,7 @@ class NewsArticle(BaseModel):
     sentiment_label: str = Field(..., description="Label sentimen (POSITIF, NETRAL, NEGATIF)")
     sentiment_score: float = Field(..., description="Skor sentimen (0.0-1.0)")
     confidence: float = Field(..., description="Tingkat kepercayaan analisis")
+    cluster_size: int = Field(1, description="Jumlah artikel hampir identik yang digabung ke artikel ini")
 
 
 class NewsAnalysisRequest(BaseModel):
@@ -51,7 +52,7 @@ class NewsAnalysisResponse(BaseModel):
     negative_count: int = Field(..., description="Jumlah berita negatif")
     articles: List[NewsArticle] = Field(..., description="Daftar artikel dengan analisis sentimen")
     timestamp: str = Field(..., description="Waktu analisis")
-    status: str = Field(..., description="Status analisis (sukses/gagal)")
+    status: str = Field(..., description="Status analisis (sukses/gagal/kuota_habis/tidak_tersedia)")
     error: Optional[str] = Field(None, description="Pesan kesalahan jika analisis gagal")
 
     class Config:
@@ -20,16 +20,19 @@ class TransformerScores(BaseModel):
     label: str
     score: float
     confidence: float
+    chunks: Optional[int] = None  # Token windows scored for long texts
 
 
 class SentimentScore(BaseModel):
     """Individual sentiment score result."""
     vader_scores: VaderScores
-    transformer_scores: TransformerScores
+    transformer_scores: Optional[TransformerScores] = None  # None when decided by the lexicon tier
     consensus_score: float
     sentiment_label: str  # POSITIF, NETRAL, NEGATIF
     confidence: float
     text_length: int
+    tier: Optional[str] = None  # lexicon, transformer
+    model_id: Optional[str] = None  # Model that scored the text, e.g. after a fallback
 
 
 class SentimentAnalysis(BaseModel):
@@ -0,0 +1,155 @@
+"""
+Long-lived headless browser pool for Crawl4AI.
+One browser per process, started on first use (or at startup) and closed on
+application shutdown. Searches borrow one of a bounded number of page
+sessions; sessions are recycled after N uses or after a failure, and the
+browser is restarted when it is found disconnected.
+"""
+
+import asyncio
+import itertools
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+from app.config import MAHKAMAH_BROWSER_POOL_SIZE, MAHKAMAH_BROWSER_MAX_USES
+from app.utils.logger import logger
+
+
+class BrowserSession:
+    """A borrowed page: pass ``session_id`` to ``crawler.arun`` to reuse its tab."""
+
+    def __init__(self, crawler: Any, session_id: str):
+        self.crawler = crawler
+        self.session_id = session_id
+        self.uses = 0
+        self.broken = False
+
+    async def arun(self, **kwargs: Any) -> Any:
+        return await self.crawler.arun(session_id=self.session_id, **kwargs)
+
+
+class BrowserPool:
+    """Bounded set of reusable Crawl4AI page sessions on one shared browser."""
+
+    def __init__(self, size: int = 2, max_uses: int = 50):
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self._crawler: Optional[Any] = None
+        self._slots: Optional[asyncio.Queue] = None
+        self._start_lock = asyncio.Lock()
+        self._restart_lock = asyncio.Lock()
+        self._ids = itertools.count(1)
+        self.launches = 0
+        self.recycled = 0
+        self.borrowed = 0
+
+    @property
+    def started(self) -> bool:
+        return self._crawler is not None
+
+    async def start(self) -> None:
+        """Launch the browser (idempotent)."""
+        async with self._start_lock:
+            if self._crawler is not None:
+                return
+            from crawl4ai import AsyncWebCrawler
+
+            crawler = AsyncWebCrawler(verbose=False)
+            await crawler.__aenter__()
+            self._crawler = crawler
+            self.launches += 1
+            if self._slots is None:
+                self._slots = asyncio.Queue()
+                for _ in range(self.size):
+                    self._slots.put_nowait(self._new_session())
+            logger.info(f"Browser Crawl4AI dijalankan dengan {self.size} sesi halaman")
+
+    async def warm_up(self) -> None:
+        """Launch at startup without failing it; searches retry the launch on demand."""
+        try:
+            await self.start()
+        except Exception as e:
+            logger.warning(f"Gagal menjalankan browser Crawl4AI saat startup: {str(e)}")
+
+    def _new_session(self) -> BrowserSession:
+        return BrowserSession(self._crawler, f"mahkamah-{next(self._ids)}")
+
+    @asynccontextmanager
+    async def session(self, timeout: Optional[float] = None) -> AsyncIterator[BrowserSession]:
+        """
+        Borrow a page session, waiting at most ``timeout`` seconds for a free
+        one (asyncio.TimeoutError otherwise). Errors inside the block mark the
+        session broken so its page is discarded.
+        """
+        await self.start()
+        if not self._browser_alive():
+            await self._restart()
+        slot = await asyncio.wait_for(self._slots.get(), timeout=timeout)
+        self.borrowed += 1
+        try:
+            if slot.crawler is not self._crawler:
+                # Browser was restarted while this slot sat in the queue
+                slot = self._new_session()
+            yield slot
+        except BaseException:
+            slot.broken = True
+            raise
+        finally:
+            slot.uses += 1
+            if slot.broken or slot.uses >= self.max_uses:
+                await self._discard(slot)
+                slot = self._new_session()
+                self.recycled += 1
+            self._slots.put_nowait(slot)
+
+    async def _discard(self, slot: BrowserSession) -> None:
+        """Close the session's page; a failure here only costs a leaked tab."""
+        try:
+            await slot.crawler.crawler_strategy.kill_session(slot.session_id)
+        except Exception as e:
+            logger.debug(f"Gagal menutup sesi browser {slot.session_id}: {str(e)}")
+
+    def _browser_alive(self) -> bool:
+        """False when the underlying Playwright browser reports a lost connection."""
+        strategy = getattr(self._crawler, "crawler_strategy", None)
+        # Location of the Playwright browser differs between Crawl4AI versions
+        browser = getattr(strategy, "browser", None) or getattr(getattr(strategy, "browser_manager", None), "browser", None)
+        if browser is None or not hasattr(browser, "is_connected"):
+            return True
+        try:
+            return browser.is_connected()
+        except Exception:
+            return False
+
+    async def _restart(self) -> None:
+        async with self._restart_lock:
+            # Another borrower may have restarted it already
+            if self._crawler is not None and self._browser_alive():
+                return
+            logger.warning("Browser Crawl4AI terputus, menjalankan ulang")
+            await self.close()
+            await self.start()
+
+    async def close(self) -> None:
+        """Close the browser (called on application shutdown)."""
+        async with self._start_lock:
+            crawler, self._crawler = self._crawler, None
+            if crawler is None:
+                return
+            try:
+                await crawler.__aexit__(None, None, None)
+            except Exception as e:
+                logger.warning(f"Gagal menutup browser Crawl4AI: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "started": self.started,
+            "size": self.size,
+            "available": self._slots.qsize() if self._slots is not None else None,
+            "max_uses": self.max_uses,
+            "launches": self.launches,
+            "borrowed": self.borrowed,
+            "recycled": self.recycled
+        }
+
+
+browser_pool = BrowserPool(size=MAHKAMAH_BROWSER_POOL_SIZE, max_uses=MAHKAMAH_BROWSER_MAX_USES)
@@ -0,0 +1,281 @@
+"""
+Parser for Mahkamah Agung search result pages.
+Built on lxml: the page is parsed once in C and only the result containers
+are walked, with patterns compiled once. Output is identical to the original
+BeautifulSoup (html.parser) implementation.
+"""
+
+import re
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Tuple
+import lxml.html
+from lxml import etree
+from app.utils.logger import logger
+
+# Severity mapping to Bahasa Indonesia
+SEVERITY_MAP = {
+    "pidana": "tinggi",      # Criminal - high severity
+    "perdata": "sedang",      # Civil - medium severity
+    "tata usaha negara": "sedang",  # Administrative - medium severity
+    "tata": "sedang",         # Administrative - medium severity
+    "niaga": "tinggi",        # Commercial - high severity
+    "pajak": "sedang",        # Tax - medium severity
+    "pidana umum": "tinggi",  # General criminal - high severity
+    "pidana khusus": "tinggi", # Special criminal - high severity
+}
+
+UNKNOWN = "Tidak diketahui"
+MAX_CASES = 10
+
+PUTUS_DATE_RE = re.compile(r'Putus\s*:\s*(\d{2}-\d{2}-\d{4})')  # "Putus : DD-MM-YYYY"
+ANY_DATE_RE = re.compile(r'(\d{2}-\d{2}-\d{4})')
+# "132 — 68 — Berkekuatan Hukum Tetap" (views, downloads, status) at the end of the title
+METADATA_RE = re.compile(r'\s*\d+\s*—\s*\d+\s*—\s*Berkekuatan.*$', re.IGNORECASE)
+TRAILING_DASH_RE = re.compile(r'\s*—\s*$')
+SPACES_RE = re.compile(r'\s+')
+# Result header: "Ditemukan 1.287 data" or "1.287 putusan ditemukan" (dot as thousands separator)
+TOTAL_RES = (
+    re.compile(r'ditemukan\s*:?\s*(\d[\d.,]*)\s*(?:data|putusan|dokumen|hasil)', re.IGNORECASE),
+    re.compile(r'(\d[\d.,]*)\s*(?:data|putusan|dokumen|hasil)\s+ditemukan', re.IGNORECASE),
+)
+# Elements that hold the result count or the pager
+SUMMARY_CLASSES = ("heading-block", "pagination", "summary", "result-count")
+
+# Text inside these elements is not page text (BeautifulSoup keeps it out of get_text too)
+_NON_TEXT_TAGS = frozenset(("script", "style", "template"))
+
+
+def _strings(el: Any, skip: FrozenSet[Any] = frozenset()) -> Iterator[str]:
+    """Text nodes of ``el`` in document order, skipping comments, script/style content and ``skip`` subtrees."""
+    if el.tag not in _NON_TEXT_TAGS and el.text:
+        yield el.text
+    for child in el:
+        # Comments and processing instructions have a non-string tag; only their tail is text
+        if isinstance(child.tag, str) and child not in skip:
+            yield from _strings(child, skip)
+        if child.tail:
+            yield child.tail
+
+
+def text_of(el: Any, separator: str = "") -> str:
+    """Equivalent of BeautifulSoup ``get_text(separator=..., strip=True)``."""
+    return separator.join(s for s in (s.strip() for s in _strings(el)) if s)
+
+
+def _classes(el: Any) -> List[str]:
+    return el.get("class", "").split()
+
+
+def _descendants(el: Any, tag: str) -> Iterator[Any]:
+    return el.iterdescendants(tag)
+
+
+def _has_class(el: Any, name: str) -> bool:
+    return name in _classes(el)
+
+
+def find_case_elements(root: Any) -> List[Any]:
+    """Result containers: div.entry-c, else the alternative layouts, in document order."""
+    divs = list(_descendants(root, "div"))
+    for name in ("entry-c", "putusan-item", "case-item"):
+        found = [div for div in divs if _has_class(div, name)]
+        if found:
+            return found
+    return [div for div in divs if "entry" in div.get("class", "").lower()]
+
+
+def _absolute(url: str, base_url: str) -> str:
+    if url and not url.startswith('http'):
+        return f"{base_url}{url}"
+    return url
+
+
+def determine_case_type(title: str) -> str:
+    """
+    Classify case type from title.
+    Returns Indonesian case types: pidana, perdata, tata usaha negara, niaga
+    """
+    if not title:
+        return "perdata"
+
+    title_lower = title.lower()
+
+    if any(word in title_lower for word in ['pidana', 'criminal', 'penal', 'kriminal', '/pid']):
+        if 'khusus' in title_lower or '/pid.sus' in title_lower:
+            return "pidana khusus"
+        return "pidana"
+    elif any(word in title_lower for word in ['niaga', 'commercial', 'dagang', 'perdagangan', '/pdt.sus']):
+        return "niaga"
+    elif any(word in title_lower for word in ['tata usaha negara', 'administrative', 'administrasi', 'tata usaha', '/tun']):
+        return "tata usaha negara"
+    elif any(word in title_lower for word in ['pajak', 'tax', '/pjk']):
+        return "pajak"
+    else:
+        return "perdata"
+
+
+def _case_number(element: Any, base_url: str):
+    # Case number is in a strong > a link to the putusan detail page
+    for strong in _descendants(element, "strong"):
+        for link in _descendants(strong, "a"):
+            href = link.get("href")
+            if href and 'direktori/putusan' in href.lower():
+                return text_of(link), _absolute(href, base_url)
+
+    # Fallback: any putusan link with "Putusan" and "Nomor" in its text
+    for link in _descendants(element, "a"):
+        href = link.get("href")
+        if href and 'putusan' in href.lower():
+            link_text = text_of(link)
+            if 'Putusan' in link_text and 'Nomor' in link_text:
+                return link_text, _absolute(href, base_url)
+    return UNKNOWN, ""
+
+
+def _case_date(element: Any) -> str:
+    # Date information is in div.small ("Register : ... — Putus : ... — Upload : ...")
+    for div in _descendants(element, "div"):
+        if not _has_class(div, "small"):
+            continue
+        date_text = text_of(div, " ")
+        if 'Putus' in date_text or 'Register' in date_text:
+            match = PUTUS_DATE_RE.search(date_text) or ANY_DATE_RE.search(date_text)
+            if match:
+                return match.group(1)
+    return UNKNOWN
+
+
+def _case_title(element: Any) -> str:
+    # Description is the first div mentioning "Tanggal"
+    for div in _descendants(element, "div"):
+        div_text = text_of(div)
+        if 'Tanggal' in div_text and len(div_text) > 20:
+            # <mark> highlights need no unwrapping: text is joined per node anyway
+            title = METADATA_RE.sub('', text_of(div, " ")).strip()
+            title = TRAILING_DASH_RE.sub('', title).strip()
+            return SPACES_RE.sub(' ', title).strip()
+    return UNKNOWN
+
+
+def _verdict_summary(element: Any, case_number: str, case_title: str) -> str:
+    parts = []
+    for blockquote in list(_descendants(element, "blockquote"))[:3]:  # First 3 blockquotes
+        text = text_of(blockquote, " ")
+        if text and len(text) > 20:  # Only substantial text
+            parts.append(text)
+    if parts:
+        summary = ' '.join(parts)
+        return summary[:500] + "..." if len(summary) > 500 else summary
+
+    # No usable blockquote: a chunk of the element text without number and title
+    all_text = text_of(element, " ")
+    if case_number in all_text:
+        all_text = all_text.replace(case_number, '', 1)
+    if case_title in all_text:
+        all_text = all_text.replace(case_title, '', 1)
+    return all_text[:300].strip() if len(all_text) > 100 else "Tidak ada ringkasan"
+
+
+def parse_case_element(element: Any, base_url: str) -> Optional[Dict[str, Any]]:
+    """Parse one result container into a case dict, None if it cannot be parsed."""
+    try:
+        case_number, source_url = _case_number(element, base_url)
+        case_date = _case_date(element)
+        case_title = _case_title(element)
+        if case_title == UNKNOWN and case_number != UNKNOWN:
+            case_title = case_number
+        case_type = determine_case_type(case_title)
+        return {
+            "case_number": case_number,
+            "case_date": case_date,
+            "case_title": case_title,
+            "case_type": case_type,
+            "verdict_summary": _verdict_summary(element, case_number, case_title),
+            "severity": SEVERITY_MAP.get(case_type.lower(), "sedang"),
+            "source_url": source_url
+        }
+    except Exception as e:
+        logger.warning(f"Error parsing case element: {str(e)}")
+        return None
+
+
+def parse_document(html: str) -> Optional[Any]:
+    """lxml tree of a search page, None for an empty or unparseable page."""
+    if not html or not html.strip():
+        return None
+    try:
+        return lxml.html.document_fromstring(html)
+    except ValueError:
+        # Strings with an XML encoding declaration must be passed as bytes
+        return lxml.html.document_fromstring(html.encode("utf-8"))
+    except etree.ParserError:
+        return None
+
+
+def _match_total(text: str) -> Optional[int]:
+    for pattern in TOTAL_RES:
+        match = pattern.search(text)
+        if match:
+            digits = match.group(1).replace('.', '').replace(',', '')
+            if digits.isdigit():
+                return int(digits)
+    return None
+
+
+def parse_total(root: Any, case_elements: Optional[List[Any]] = None) -> Optional[int]:
+    """
+    Total number of results announced in the page header, None if the page has none.
+    Only the summary/pagination elements are searched, else the page text
+    outside the result containers: a case title such as "... ditemukan 5
+    putusan ..." is not a result count.
+    """
+    if case_elements is None:
+        case_elements = find_case_elements(root)
+    cases = frozenset(case_elements)
+
+    for el in root.iter():
+        if not isinstance(el.tag, str):
+            continue
+        classes = el.get("class", "").lower()
+        if not any(name in classes for name in SUMMARY_CLASSES):
+            continue
+        if any(ancestor in cases for ancestor in el.iterancestors()) or el in cases:
+            continue
+        total = _match_total(text_of(el, " "))
+        if total is not None:
+            return total
+
+    return _match_total(" ".join(s for s in (s.strip() for s in _strings(root, cases)) if s))
+
+
+def _parse_cases(root: Any, base_url: str, limit: Optional[int], case_elements: Optional[List[Any]] = None) -> List[Dict[str, Any]]:
+    if case_elements is None:
+        case_elements = find_case_elements(root)
+    logger.info(f"Found {len(case_elements)} potential case elements")
+
+    cases = []
+    for element in case_elements[:limit]:
+        case_data = parse_case_element(element, base_url)
+        if case_data:
+            cases.append(case_data)
+    return cases
+
+
+def parse_results_page(
+    html: str,
+    base_url: str,
+    limit: Optional[int] = MAX_CASES
+) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """Cases (up to ``limit``, None for all) and the announced total from one search page."""
+    root = parse_document(html)
+    if root is None:
+        return [], None
+    case_elements = find_case_elements(root)
+    return _parse_cases(root, base_url, limit, case_elements), parse_total(root, case_elements)
+
+
+def parse_search_page(html: str, base_url: str, limit: Optional[int] = MAX_CASES) -> List[Dict[str, Any]]:
+    """Up to ``limit`` cases from a search result page."""
+    root = parse_document(html)
+    if root is None:
+        return []
+    return _parse_cases(root, base_url, limit)
@@ -0,0 +1,107 @@
+"""
+Near-duplicate suppression for news articles.
+The same story often comes back several times (different parse strategies,
+overlapping paragraphs, syndication across outlets). Articles are clustered by
+a 64-bit SimHash of their title + summary so only one per cluster is scored.
+"""
+
+import hashlib
+import re
+from typing import Any, Callable, Dict, List, Set, Tuple
+from app.config import NEWS_DEDUP_ENABLED, NEWS_DEDUP_MAX_DISTANCE
+
+FINGERPRINT_BITS = 64
+
+_TOKEN = re.compile(r"\w+")
+
+
+def _features(text: str) -> List[str]:
+    """Word unigrams and bigrams; very short tokens carry little signal."""
+    words = [w for w in _TOKEN.findall(text.lower()) if len(w) > 2]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash fingerprint: similar texts differ in few bits."""
+    weights = [0] * FINGERPRINT_BITS
+    for feature in _features(text):
+        digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += 1 if digest >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def title_key(article: Dict[str, Any]) -> str:
+    """Normalized title: the cheap exact-duplicate check done before SimHash."""
+    return " ".join(_TOKEN.findall(article.get("title", "").lower()))
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def cluster_articles(
+    articles: List[Dict[str, Any]],
+    max_distance: int = 10
+) -> List[Tuple[Dict[str, Any], int]]:
+    """
+    Group near-identical articles. Returns (representative, cluster_size) in
+    order of first appearance; the representative is the cluster member with
+    the most text, so scoring sees the fullest version of the story.
+    """
+    clusters: List[Dict[str, Any]] = []
+    for article in articles:
+        title = title_key(article)
+        text = f"{article.get('title', '')} {article.get('summary', '')}"
+        fingerprint = simhash(text)
+
+        for cluster in clusters:
+            if (title and title == cluster["title"]) or \
+                    hamming_distance(fingerprint, cluster["fingerprint"]) <= max_distance:
+                cluster["size"] += 1
+                if len(text) > cluster["length"]:
+                    cluster.update(article=article, length=len(text))
+                break
+        else:
+            clusters.append({
+                "article": article,
+                "title": title,
+                "fingerprint": fingerprint,
+                "length": len(text),
+                "size": 1
+            })
+
+    return [(cluster["article"], cluster["size"]) for cluster in clusters]
+
+
+def deduplicate_articles(articles: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], int]]:
+    """cluster_articles with the configured threshold; a no-op when disabled."""
+    if not NEWS_DEDUP_ENABLED:
+        return [(article, 1) for article in articles]
+    return cluster_articles(articles, max_distance=NEWS_DEDUP_MAX_DISTANCE)
+
+
+def skip_repeated_titles(on_article: Callable[[Dict[str, Any]], None]) -> Callable[[Dict[str, Any]], None]:
+    """
+    Wrap a streaming ``on_article`` callback so an article whose title was
+    already seen is dropped: streamed articles are early-scored before
+    clustering runs, and a repeated story should not cost inference twice.
+    """
+    if not NEWS_DEDUP_ENABLED:
+        return on_article
+    seen: Set[str] = set()
+
+    def callback(article: Dict[str, Any]) -> None:
+        key = title_key(article)
+        if key:
+            if key in seen:
+                return
+            seen.add(key)
+        on_article(article)
+
+    return callback
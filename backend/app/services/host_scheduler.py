@@ -0,0 +1,46 @@
+"""
+Per-host politeness scheduler for outbound crawling.
+Every request to a host first takes a token from that host's bucket, so the
+request rate stays bounded across all concurrent searches in the process
+while local parsing runs unthrottled.
+"""
+
+import time
+from typing import Any, Dict
+from urllib.parse import urlsplit
+from app.config import MAHKAMAH_CRAWL_DELAY, MAHKAMAH_HOST_BURST
+from app.utils.rate_limit import TokenBucket
+
+
+class HostScheduler:
+    """One token bucket per host: at most ``burst`` requests back to back, then one per ``min_interval``."""
+
+    def __init__(self, min_interval: float = 0.5, burst: float = 1.0):
+        self.min_interval = min_interval
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    async def wait(self, url: str) -> None:
+        """Block until a request to ``url``'s host may be sent."""
+        if self.min_interval <= 0:
+            return
+        host = urlsplit(url).netloc.lower()
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(1.0 / self.min_interval, self.burst)
+            self._stats[host] = {"requests": 0, "waited_seconds": 0.0}
+        started = time.monotonic()
+        await bucket.acquire()
+        stats = self._stats[host]
+        stats["requests"] += 1
+        stats["waited_seconds"] += time.monotonic() - started
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "min_interval": self.min_interval,
+            "hosts": {host: {**s, "waited_seconds": round(s["waited_seconds"], 3)} for host, s in self._stats.items()}
+        }
+
+
+host_scheduler = HostScheduler(min_interval=MAHKAMAH_CRAWL_DELAY, burst=MAHKAMAH_HOST_BURST)
@@ -0,0 +1,70 @@
+"""
+Shared outbound HTTP client.
+One pooled httpx.AsyncClient per process, opened on application startup and
+closed on shutdown, so upstream calls reuse keep-alive connections instead of
+paying a new TCP+TLS handshake each time.
+"""
+
+import importlib.util
+from typing import Optional
+import httpx
+from app.config import (
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_HTTP2,
+)
+from app.utils.logger import logger
+
+
+class SharedHTTPClient:
+    """Owns the process-wide AsyncClient; services borrow it via ``get()``."""
+
+    def __init__(
+        self,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 60.0,
+        max_connections: int = 20,
+        max_keepalive: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True
+    ):
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout, pool=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry
+        )
+        # HTTP/2 needs the optional h2 package
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        if http2 and not self.http2:
+            logger.warning("Paket h2 tidak terpasang, klien HTTP memakai HTTP/1.1")
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def start(self) -> httpx.AsyncClient:
+        """Create the client (called on application startup)."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits, http2=self.http2)
+        return self._client
+
+    def get(self) -> httpx.AsyncClient:
+        """The shared client; created on first use for scripts that skip the app lifecycle."""
+        return self.start()
+
+    async def aclose(self) -> None:
+        """Close pooled connections (called on application shutdown)."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+http_client = SharedHTTPClient(
+    connect_timeout=HTTP_CONNECT_TIMEOUT,
+    read_timeout=HTTP_READ_TIMEOUT,
+    max_connections=HTTP_MAX_CONNECTIONS,
+    max_keepalive=HTTP_MAX_KEEPALIVE,
+    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+    http2=HTTP_HTTP2
+)
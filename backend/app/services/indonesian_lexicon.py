@@ -0,0 +1,256 @@
+"""
+Indonesian sentiment lexicon scorer.
+Alternative to the English-only VADER pass: the lexicon is compiled once into
+an Aho-Corasick automaton and scored in a single pass over the text, with
+negation ("tidak", "bukan", ...), intensifiers and common affixes handled.
+"""
+
+import math
+import re
+from bisect import bisect_right
+from collections import deque
+from itertools import product
+from typing import Dict, Iterable, List, Tuple
+
+# Valence on VADER's -4..+4 scale. Roots match inside affixed words
+# (ke-rugi-an, mem-buruk, ber-sengketa); forms with nasal substitution
+# (menurun <- turun, peningkatan <- tingkat) are listed explicitly.
+LEXICON: Dict[str, float] = {
+    # Positive
+    "untung": 2.0, "laba": 2.0, "naik": 1.5, "meningkat": 1.8, "peningkatan": 1.8,
+    "tumbuh": 1.8, "positif": 1.5, "baik": 1.8, "bagus": 2.0, "kuat": 1.5,
+    "menguat": 1.5, "penguatan": 1.5, "solid": 1.5, "sehat": 1.8, "stabil": 1.2,
+    "sukses": 2.2, "berhasil": 2.0, "prestasi": 1.8, "penghargaan": 1.8, "unggul": 2.0,
+    "terbaik": 2.5, "melampaui": 1.5, "ekspansi": 1.2, "lancar": 1.5, "optimis": 1.8,
+    "optimistis": 1.8, "apresiasi": 1.5, "dividen": 0.8, "surplus": 1.5, "efisien": 1.2,
+    "inovasi": 1.2, "inovatif": 1.5, "terpercaya": 2.0, "percaya": 1.2, "rekor": 1.2,
+    "tertinggi": 1.2, "terjaga": 1.2, "pulih": 1.5, "pemulihan": 1.5, "mampu": 1.2,
+    "bayar": 0.8, "membayar": 0.8, "pembayaran": 0.8, "tepat waktu": 1.5,
+    "kelebihan permintaan": 1.5, "menaikkan peringkat": 2.0, "peringkat naik": 2.0,
+    "kerja sama": 1.0, "kemitraan": 1.0, "menyerap": 0.8, "berkelanjutan": 1.0,
+    "mendukung": 1.2, "dukungan": 1.2, "aman": 1.5, "andal": 1.5, "menjanjikan": 1.8,
+    # Negative
+    "rugi": -2.0, "pailit": -3.0, "bangkrut": -3.0, "gagal bayar": -3.0, "gagal": -2.0,
+    "macet": -2.0, "kredit macet": -2.5, "menunggak": -2.0, "tunggak": -2.0,
+    "korupsi": -3.0, "suap": -2.5, "penyuapan": -2.5, "tersangka": -2.5, "terdakwa": -2.5,
+    "dakwa": -2.0, "pidana": -2.0, "penipuan": -2.5, "tipu": -2.5, "gugat": -1.5,
+    "sengketa": -1.5, "sanksi": -2.0, "denda": -1.5, "langgar": -2.0, "turun": -1.5,
+    "menurun": -1.5, "penurunan": -1.5, "anjlok": -2.5, "merosot": -2.5, "lemah": -1.5,
+    "buruk": -2.0, "krisis": -2.5, "defisit": -1.5, "negatif": -1.5, "disclaimer": -2.0,
+    "suspensi": -2.0, "phk": -2.0, "pemutusan hubungan kerja": -2.5, "mangkrak": -2.0,
+    "tunda": -1.0, "penundaan": -1.2, "menunda": -1.0, "pkpu": -2.5, "geledah": -2.0,
+    "pencucian uang": -3.0, "masalah": -1.5, "risiko": -0.8, "bengkak": -1.5,
+    "hilang": -1.5, "lambat": -1.2, "skandal": -2.5, "fraud": -3.0, "kolaps": -3.0,
+    "likuidasi": -2.5, "default": -2.5, "downgrade": -2.0, "menurunkan peringkat": -2.0,
+    "kasus": -1.0, "tuntut": -1.5, "menuntut": -1.5, "penyidik": -1.2, "penyidikan": -1.5,
+    "ditahan": -1.8, "mogok": -1.8, "protes": -1.2, "keluh": -1.2, "tertekan": -1.5,
+    "ancam": -1.8, "bermasalah": -1.8, "menggelapkan": -2.5, "penggelapan": -2.5,
+    "kehilangan": -1.8, "merugikan": -2.2, "tekanan": -1.2, "pelemahan": -1.5,
+}
+
+NEGATORS = {"tidak", "tak", "bukan", "belum", "tanpa", "tiada", "non"}
+BOOSTERS: Dict[str, float] = {
+    "sangat": 0.293, "amat": 0.293, "paling": 0.293, "terlalu": 0.293,
+    "semakin": 0.2, "makin": 0.2, "sungguh": 0.293,
+    "agak": -0.293, "sedikit": -0.293, "cukup": -0.2, "relatif": -0.2,
+}
+
+PREFIXES = ["me", "mem", "men", "meng", "meny", "ber", "be", "ter", "di", "ke",
+            "pe", "pem", "pen", "peng", "peny", "per", "se"]
+SUFFIXES = ["kan", "an", "i", "nya", "lah", "kah", "pun"]
+
+NEGATION_SCALAR = -0.74  # Same dampened flip VADER uses
+NEGATION_WINDOW = 3      # Words after a negator that it still applies to
+BOOSTER_WINDOW = 2
+MAX_AFFIX_LENGTH = 8
+
+_WORD = re.compile(r"\w+")
+_CLAUSE_BREAK = re.compile(r"[.,;:!?\n]")
+
+# Term kinds stored in the automaton
+_SENTIMENT, _NEGATOR, _BOOSTER = 0, 1, 2
+
+
+def _affix_chains(affixes: List[str], depth: int = 2) -> frozenset:
+    """All concatenations of up to ``depth`` affixes (ke+ter, an+nya, ...)."""
+    chains = {""}
+    for n in range(1, depth + 1):
+        chains.update("".join(parts) for parts in product(affixes, repeat=n))
+    return frozenset(chains)
+
+
+class AhoCorasickAutomaton:
+    """
+    Aho-Corasick automaton compiled to a DFA: every state holds its full
+    transition table (failure links resolved at build time), so scanning is a
+    single dict lookup per character.
+    """
+
+    def __init__(self, terms: Iterable[str]):
+        self.terms: List[str] = list(dict.fromkeys(terms))
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+
+        for term_id, term in enumerate(self.terms):
+            state = 0
+            for ch in term:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    outputs.append([])
+                state = nxt
+            outputs[state].append(term_id)
+
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict() for _ in goto]
+        delta[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            # Inherit the failure state's transitions, then override with own edges
+            delta[state] = dict(delta[fail[state]])
+            for ch, nxt in goto[state].items():
+                delta[state][ch] = nxt
+                fail[nxt] = delta[fail[state]].get(ch, 0) if state else 0
+                queue.append(nxt)
+            outputs[state] = outputs[state] + outputs[fail[state]]
+
+        self._delta = delta
+        # Longest match first for every state
+        self._outputs = [
+            tuple(sorted(ids, key=lambda i: -len(self.terms[i]))) for ids in outputs
+        ]
+
+    @property
+    def num_states(self) -> int:
+        return len(self._delta)
+
+    def find_all(self, text: str) -> List[Tuple[int, int, int]]:
+        """Return (start, end, term_id) for every occurrence, in one pass."""
+        delta = self._delta
+        outputs = self._outputs
+        terms = self.terms
+        matches = []
+        state = 0
+        for i, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                end = i + 1
+                for term_id in outputs[state]:
+                    matches.append((end - len(terms[term_id]), end, term_id))
+        return matches
+
+
+class IndonesianLexiconScorer:
+    """
+    Lexicon scorer with the VADER ``polarity_scores`` interface
+    ({"compound", "pos", "neg", "neu"}), so it can replace VADER in analyze_text.
+    """
+
+    name = "indonesian"
+
+    def __init__(
+        self,
+        lexicon: Dict[str, float] = LEXICON,
+        negators: Iterable[str] = NEGATORS,
+        boosters: Dict[str, float] = BOOSTERS
+    ):
+        self._kinds: Dict[str, Tuple[int, float]] = {}
+        for term, valence in lexicon.items():
+            self._kinds[term] = (_SENTIMENT, valence)
+        for term in negators:
+            self._kinds[term] = (_NEGATOR, 0.0)
+        for term, increment in boosters.items():
+            self._kinds[term] = (_BOOSTER, increment)
+
+        self._automaton = AhoCorasickAutomaton(self._kinds.keys())
+        self._term_kinds = [self._kinds[term] for term in self._automaton.terms]
+        self._prefix_chains = _affix_chains(PREFIXES)
+        self._suffix_chains = _affix_chains(SUFFIXES)
+
+    def _accept(self, text: str, start: int, end: int, kind: int) -> bool:
+        """A match must span whole words, allowing known affixes around sentiment roots."""
+        left = start
+        while left > 0 and text[left - 1].isalnum():
+            left -= 1
+            if start - left > MAX_AFFIX_LENGTH:
+                return False
+        right = end
+        while right < len(text) and text[right].isalnum():
+            right += 1
+            if right - end > MAX_AFFIX_LENGTH:
+                return False
+
+        prefix, suffix = text[left:start], text[end:right]
+        if kind != _SENTIMENT:
+            return not prefix and not suffix
+        return prefix in self._prefix_chains and suffix in self._suffix_chains
+
+    def _select(self, text: str, matches: List[Tuple[int, int, int]]) -> List[Tuple[int, int, int]]:
+        """Leftmost-longest, non-overlapping, affix-valid matches."""
+        matches.sort(key=lambda m: (m[0], m[0] - m[1]))
+        selected = []
+        last_end = -1
+        for start, end, term_id in matches:
+            if start < last_end:
+                continue
+            if self._accept(text, start, end, self._term_kinds[term_id][0]):
+                selected.append((start, end, term_id))
+                last_end = end
+        return selected
+
+    def polarity_scores(self, text: str) -> Dict[str, float]:
+        text = text.lower()
+        matches = self._select(text, self._automaton.find_all(text))
+
+        word_starts = [m.start() for m in _WORD.finditer(text)]
+        clause_breaks = [m.start() for m in _CLAUSE_BREAK.finditer(text)]
+
+        valences = []
+        matched_words = 0
+        last_negator = None  # (word index, clause index)
+        last_booster = None  # (word index, clause index, increment)
+
+        for start, end, term_id in matches:
+            kind, value = self._term_kinds[term_id]
+            word_index = bisect_right(word_starts, start) - 1
+            clause = bisect_right(clause_breaks, start)
+
+            if kind == _NEGATOR:
+                last_negator = (word_index, clause)
+                continue
+            if kind == _BOOSTER:
+                last_booster = (word_index, clause, value)
+                continue
+
+            valence = value
+            if last_booster and last_booster[1] == clause and 0 < word_index - last_booster[0] <= BOOSTER_WINDOW:
+                increment = last_booster[2]
+                valence += increment if valence > 0 else -increment
+            if last_negator and last_negator[1] == clause and 0 < word_index - last_negator[0] <= NEGATION_WINDOW:
+                valence *= NEGATION_SCALAR
+            valences.append(valence)
+            matched_words += len(_WORD.findall(text[start:end]))
+
+        return self._summarize(valences, max(0, len(word_starts) - matched_words))
+
+    @staticmethod
+    def _summarize(valences: List[float], neutral_words: int) -> Dict[str, float]:
+        """VADER-style normalization of summed valences."""
+        total = sum(valences)
+        compound = total / math.sqrt(total * total + 15) if valences else 0.0
+
+        pos = sum(v + 1 for v in valences if v > 0)
+        neg = sum(v - 1 for v in valences if v < 0)
+        neu = neutral_words + sum(1 for v in valences if v == 0)
+        denominator = pos + abs(neg) + neu
+        if not denominator:
+            return {"neg": 0.0, "neu": 1.0, "pos": 0.0, "compound": 0.0}
+        return {
+            "neg": round(abs(neg) / denominator, 3),
+            "neu": round(neu / denominator, 3),
+            "pos": round(pos / denominator, 3),
+            "compound": round(compound, 4)
+        }
@@ -0,0 +1,199 @@
+"""
+Executor for CPU-bound sentiment inference.
+Keeps VADER and PyTorch forward passes off the asyncio event loop.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+from app.config import (
+    INFERENCE_EXECUTOR,
+    INFERENCE_WORKERS,
+    INFERENCE_TORCH_THREADS,
+    INFERENCE_SOCKET,
+    INFERENCE_AUTHKEY,
+    INFERENCE_REMOTE_TIMEOUT,
+)
+from app.services.inference_workers import RemoteInferenceClient
+from app.services.model_registry import model_registry
+from app.utils.logger import logger
+
+
+def _configure_torch_threads(num_threads: int) -> None:
+    """Limit torch intra-op threads so concurrent workers don't oversubscribe cores."""
+    try:
+        import torch
+        torch.set_num_threads(num_threads)
+        logger.info(f"Torch intra-op threads: {num_threads}")
+    except Exception as e:
+        logger.warning(f"Gagal mengatur jumlah thread torch: {str(e)}")
+
+
+def _init_process_worker(num_threads: int) -> None:
+    """Process-pool initializer: pin threads, then load and warm the model once per worker."""
+    _configure_torch_threads(num_threads)
+    try:
+        import torch
+        torch.set_num_interop_threads(1)
+    except Exception:
+        pass  # Already set or torch unavailable
+    model_registry.warm_up()
+
+
+def _process_worker_ready() -> bool:
+    return model_registry.status()["ready"]
+
+
+class InferenceExecutor:
+    """
+    Runs inference functions in a thread pool or a process pool.
+
+    Thread mode shares the process-wide model registry and is the default:
+    PyTorch releases the GIL during forward passes. Process mode gives each
+    worker its own model copy and full isolation from the API process.
+    Remote mode sends calls to the shared InferenceWorkerPool, so no model is
+    loaded in the API process at all; threads only wait on the socket.
+    """
+
+    REMOTE_POLL_INTERVAL = 2.0
+
+    def __init__(
+        self,
+        mode: str = "thread",
+        max_workers: int = 1,
+        torch_threads: int = 0,
+        remote_client: Optional[RemoteInferenceClient] = None
+    ):
+        if mode not in ("thread", "process", "remote"):
+            raise ValueError(f"Mode executor inferensi tidak dikenal: {mode}")
+        self.mode = mode
+        self.max_workers = max(1, max_workers)
+        # 0 = split the available cores evenly between workers
+        self.torch_threads = torch_threads or max(1, (os.cpu_count() or 1) // self.max_workers)
+        self._pool: Optional[Executor] = None
+        self._warm_up_future: Optional[asyncio.Future] = None
+        self._remote = remote_client
+        self._remote_ready = False
+        self.in_flight = 0
+        self.completed = 0
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.mode == "process":
+                # spawn, not fork: forking after torch has started its thread
+                # pools can deadlock the child
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_process_worker,
+                    initargs=(self.torch_threads,)
+                )
+            elif self.mode == "remote":
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="inference-remote"
+                )
+            else:
+                _configure_torch_threads(self.torch_threads)
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="inference"
+                )
+        return self._pool
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run ``func(*args)`` on the pool and await its result."""
+        loop = asyncio.get_running_loop()
+        self.in_flight += 1
+        if self.mode == "remote":
+            call = partial(self._remote.call, func, *args)
+        else:
+            call = partial(func, *args)
+        try:
+            return await loop.run_in_executor(self._get_pool(), call)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def start_warm_up(self) -> None:
+        """Load and warm the model on the inference workers without blocking startup."""
+        loop = asyncio.get_running_loop()
+        if self.mode == "remote":
+            # The pool warms its own workers; poll until it reports ready
+            self._warm_up_future = loop.create_task(self._wait_for_remote())
+        elif self.mode == "process":
+            # The initializer warms each worker; one trivial task spawns them all
+            self._warm_up_future = loop.run_in_executor(self._get_pool(), _process_worker_ready)
+        else:
+            self._warm_up_future = loop.run_in_executor(self._get_pool(), model_registry.warm_up)
+
+    async def _wait_for_remote(self) -> None:
+        while not self._remote_ready:
+            await self.worker_stats()
+            if not self._remote_ready:
+                await asyncio.sleep(self.REMOTE_POLL_INTERVAL)
+
+    async def worker_stats(self) -> Optional[Dict[str, Any]]:
+        """Stats of the shared worker pool in remote mode (None otherwise)."""
+        if self.mode != "remote":
+            return None
+        loop = asyncio.get_running_loop()
+        try:
+            stats = await loop.run_in_executor(None, self._remote.server_stats)
+        except Exception as e:
+            self._remote_ready = False
+            return {"ready": False, "error": f"Pool inferensi tidak dapat dihubungi: {str(e)}"}
+        self._remote_ready = bool(stats.get("ready"))
+        return stats
+
+    def ready(self) -> bool:
+        """Whether inference can be served without a cold model load."""
+        if self.mode == "remote":
+            return self._remote_ready
+        if self.mode == "process":
+            return (
+                self._warm_up_future is not None
+                and self._warm_up_future.done()
+                and not self._warm_up_future.cancelled()
+                and self._warm_up_future.exception() is None
+                and bool(self._warm_up_future.result())
+            )
+        status = model_registry.status()
+        # Without start-up warm-up the models are loaded by the first request instead
+        return status["ready"] or (self._warm_up_future is None and status["loaded"])
+
+    def shutdown(self) -> None:
+        """Stop the pool (called on application shutdown)."""
+        if self._warm_up_future is not None and not self._warm_up_future.done():
+            self._warm_up_future.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        if self._remote is not None:
+            self._remote.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Executor statistics for monitoring."""
+        return {
+            "mode": self.mode,
+            "max_workers": self.max_workers,
+            "torch_threads": self.torch_threads,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "ready": self.ready()
+        }
+
+
+inference_executor = InferenceExecutor(
+    mode=INFERENCE_EXECUTOR,
+    max_workers=INFERENCE_WORKERS,
+    torch_threads=INFERENCE_TORCH_THREADS,
+    remote_client=RemoteInferenceClient(
+        INFERENCE_SOCKET,
+        authkey=INFERENCE_AUTHKEY.encode() or None,
+        timeout=INFERENCE_REMOTE_TIMEOUT
+    ) if INFERENCE_EXECUTOR == "remote" else None
+)
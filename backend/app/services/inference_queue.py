@@ -0,0 +1,152 @@
+"""
+Dynamic micro-batching queue for model inference.
+Collects texts from all concurrent requests for a few milliseconds and runs
+them through the model as one padded batch.
+"""
+
+import asyncio
+from typing import Any, Callable, List, Optional, Set, Tuple
+from app.services.inference_executor import InferenceExecutor
+from app.utils.logger import logger
+
+
+class BatchInferenceQueue:
+    """
+    Async queue in front of a batch inference function.
+
+    Callers ``await submit(text)`` and receive their own result. A single
+    worker task takes the first pending item, waits at most ``max_wait_ms``
+    for more to arrive (up to ``max_batch_size``), then calls
+    ``batch_fn(texts)`` once for the whole batch.
+
+    With an ``executor`` the batch runs off the event loop, and up to
+    ``executor.max_workers`` batches are in flight at once.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[str]], List[Any]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 10.0,
+        executor: Optional[InferenceExecutor] = None
+    ):
+        self._batch_fn = batch_fn
+        self._executor = executor
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.max_concurrent_batches = executor.max_workers if executor is not None else 1
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._batch_tasks: Set[asyncio.Task] = set()
+        self.batches_run = 0
+        self.texts_processed = 0
+
+    async def submit(self, text: str) -> Any:
+        """Queue one text and wait for its result."""
+        self._ensure_worker()
+        future = self._loop.create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def submit_many(self, texts: List[str]) -> List[Any]:
+        """Queue several texts; they may share a batch with other requests."""
+        return list(await asyncio.gather(*(self.submit(text) for text in texts)))
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        # Queues are bound to the loop they are used on; rebuild if the loop
+        # changed (e.g. scripts calling asyncio.run more than once).
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.max_concurrent_batches)
+            self._worker = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            # Wait for a free worker first: texts keep accumulating meanwhile,
+            # so batches grow under load instead of queueing up.
+            await self._slots.acquire()
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                remaining = deadline - self._loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            task = self._loop.create_task(self._process(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _process(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        try:
+            await self._process_batch(batch)
+        finally:
+            self._slots.release()
+
+    async def _process_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        # Callers that gave up (cancelled) are not worth a forward pass
+        live = [(text, future) for text, future in batch if not future.done()]
+        if not live:
+            return
+
+        texts = [text for text, _ in live]
+        error: Optional[BaseException] = None
+        try:
+            if self._executor is not None:
+                results = await self._executor.run(self._batch_fn, texts)
+            else:
+                results = self._batch_fn(texts)
+            if len(results) != len(texts):
+                raise RuntimeError(f"Fungsi batch mengembalikan {len(results)} hasil untuk {len(texts)} teks")
+
+            self.batches_run += 1
+            self.texts_processed += len(texts)
+            logger.debug(f"Inferensi batch: {len(texts)} teks")
+            for (_, future), result in zip(live, results):
+                if not future.done():
+                    future.set_result(result)
+        except Exception as e:
+            logger.error(f"Inferensi batch gagal ({len(texts)} teks): {str(e)}")
+            error = e
+        finally:
+            # Every caller gets an outcome, even when the batch task is cancelled
+            for _, future in live:
+                if not future.done():
+                    future.set_exception(error or RuntimeError("Inferensi batch dibatalkan sebelum selesai"))
+
+    async def close(self) -> None:
+        """Stop the worker task (called on application shutdown)."""
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        for task in list(self._batch_tasks):
+            task.cancel()
+        self._worker = None
+
+    def stats(self) -> dict:
+        """Batching statistics for monitoring."""
+        return {
+            "batches_run": self.batches_run,
+            "texts_processed": self.texts_processed,
+            "average_batch_size": round(self.texts_processed / self.batches_run, 2) if self.batches_run else 0.0,
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+            "batches_in_flight": len(self._batch_tasks),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0
+        }
@@ -0,0 +1,476 @@
+"""
+Standalone multi-process inference worker pool.
+The model is loaded once in the pool's parent process, then N workers are
+forked so the weights stay shared copy-on-write (a worker started later to
+replace a dead one is spawned and loads its own copy). API processes (any
+number of uvicorn workers) send batches over a local Unix socket instead of
+each loading their own model copy.
+
+The socket protocol carries JSON only: a whitelisted function name plus plain
+data, never pickled objects, and connections must pass the HMAC handshake
+(INFERENCE_AUTHKEY is required).
+
+Run with: python scripts/run_inference_workers.py
+"""
+
+import importlib
+import itertools
+import json
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from multiprocessing.connection import Client, Listener, wait
+from typing import Any, Callable, Deque, Dict, List, Optional
+from app.config import SENTIMENT_BACKEND
+from app.services.model_registry import model_registry
+from app.utils.logger import logger
+
+# Functions the pool will run for clients, by dotted path. Anything else is refused.
+REMOTE_FUNCTIONS = frozenset({
+    "app.services.sentiment_service.score_texts",
+})
+
+
+def remote_name(func: Callable[..., Any]) -> str:
+    """Dotted path of a whitelisted function; ValueError for anything else."""
+    name = f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', '')}"
+    if name not in REMOTE_FUNCTIONS:
+        raise ValueError(f"Fungsi tidak diizinkan untuk inferensi jarak jauh: {name}")
+    return name
+
+
+def _resolve(name: str) -> Callable[..., Any]:
+    if name not in REMOTE_FUNCTIONS:
+        raise ValueError(f"Fungsi tidak diizinkan untuk inferensi jarak jauh: {name}")
+    module, _, attr = name.rpartition(".")
+    return getattr(importlib.import_module(module), attr)
+
+
+def _send_json(conn, message: Any) -> None:
+    # default=float: numpy scalars in model outputs
+    conn.send_bytes(json.dumps(message, default=float).encode("utf-8"))
+
+
+def _recv_json(conn) -> Any:
+    return json.loads(conn.recv_bytes().decode("utf-8"))
+
+
+def _require_authkey(authkey: Optional[bytes]) -> bytes:
+    if not authkey:
+        raise ValueError("INFERENCE_AUTHKEY wajib diisi untuk pool inferensi (mode remote)")
+    return authkey
+
+
+def _read_memory_kb(pid: int) -> Dict[str, Optional[int]]:
+    """RSS and PSS of a process from /proc. PSS splits shared pages between sharers."""
+    memory: Dict[str, Optional[int]] = {"rss_kb": None, "pss_kb": None}
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    memory["rss_kb"] = int(line.split()[1])
+                    break
+        with open(f"/proc/{pid}/smaps_rollup") as rollup:
+            for line in rollup:
+                if line.startswith("Pss:"):
+                    memory["pss_kb"] = int(line.split()[1])
+                    break
+    except (OSError, ValueError):
+        pass  # Not Linux, or the process is gone
+    return memory
+
+
+def _worker_main(worker_id: int, conn, torch_threads: int) -> None:
+    """Worker process loop: report readiness, then run the jobs sent over its own pipe."""
+    # Imported here: the executor module imports this one for the client
+    from app.services.inference_executor import _configure_torch_threads
+
+    _configure_torch_threads(torch_threads)
+    model_registry.warm_up()
+    conn.send(("ready", model_registry.status()["ready"]))
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break  # Parent went away
+        if job is None:
+            break
+        job_id, name, args = job
+        try:
+            conn.send((job_id, "ok", _resolve(name)(*args)))
+        except Exception as e:
+            conn.send((job_id, "error", f"{type(e).__name__}: {str(e)}"))
+
+
+class _Job:
+    __slots__ = ("name", "args", "deadline", "attempts", "done", "status", "payload")
+
+    def __init__(self, name: str, args: list, deadline: float):
+        self.name = name
+        self.args = args
+        self.deadline = deadline
+        self.attempts = 0
+        self.done = threading.Event()
+        self.status: Optional[str] = None
+        self.payload: Any = None
+
+
+class _Worker:
+    __slots__ = ("worker_id", "process", "conn", "started", "ready", "job_id", "completed", "failed")
+
+    def __init__(self, worker_id: int, process: multiprocessing.Process, conn):
+        self.worker_id = worker_id
+        self.process = process
+        self.conn = conn
+        self.started = False  # Reported back after warm-up, successful or not
+        self.ready = False
+        self.job_id: Optional[int] = None  # Assigned by the dispatcher before the job is sent
+        self.completed = 0
+        self.failed = 0
+
+
+class InferenceWorkerPool:
+    """
+    Parent side of the pool: loads the model, forks the workers, accepts
+    client connections and hands their calls to the workers.
+
+    Each worker has a private pipe and runs one job at a time; a single
+    dispatcher thread owns the pipes, assigns jobs and records which worker
+    holds which job before sending it. A worker that dies is replaced and
+    its job requeued once (then failed); a job past ``job_timeout`` fails and
+    its worker is killed, which only affects that worker's own pipe.
+    Replacements are started with the spawn context: forking the parent
+    once its threads run could deadlock the child.
+    """
+
+    WATCH_INTERVAL = 1.0
+    MAX_ATTEMPTS = 2  # A job that kills two workers is failed, not retried again
+
+    def __init__(
+        self,
+        address: str,
+        num_workers: int = 2,
+        torch_threads: int = 1,
+        authkey: Optional[bytes] = None,
+        job_timeout: float = 120.0
+    ):
+        self.address = address
+        self.num_workers = max(1, num_workers)
+        self.torch_threads = max(1, torch_threads)
+        self.authkey = _require_authkey(authkey)
+        self.job_timeout = job_timeout
+        self._fork_context = multiprocessing.get_context("fork")
+        self._spawn_context = multiprocessing.get_context("spawn")
+        self._workers: List[_Worker] = []
+        self._jobs: Dict[int, _Job] = {}
+        self._backlog: Deque[int] = deque()
+        self._lock = threading.Lock()
+        self._job_ids = itertools.count()
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        self._dispatcher: Optional[threading.Thread] = None
+        self._started_at = time.time()
+        self._stopping = False
+        self.restarts = 0
+
+    def start(self) -> None:
+        """Preload the model, then fork the workers before any thread is started."""
+        # Rust tokenizers warn (and may deadlock) when used across fork
+        os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+        model_registry.get_lexicon()
+        if SENTIMENT_BACKEND != "onnx":
+            # Load only, no forward pass: a parent that has started torch's
+            # OpenMP pool can deadlock its forked children. ONNX Runtime
+            # sessions do not survive fork either, so each worker loads its own
+            # (the int8 model is small).
+            model_registry.get_backend()
+
+        self._workers = [self._start_worker(worker_id, self._fork_context) for worker_id in range(self.num_workers)]
+        logger.info(f"{self.num_workers} worker inferensi dijalankan (pid {[w.process.pid for w in self._workers]})")
+
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="inference-dispatcher", daemon=True)
+        self._dispatcher.start()
+
+    def _start_worker(self, worker_id: int, context) -> _Worker:
+        parent_conn, child_conn = context.Pipe()
+        process = context.Process(
+            target=_worker_main,
+            args=(worker_id, child_conn, self.torch_threads),
+            name=f"inference-worker-{worker_id}",
+            daemon=True
+        )
+        process.start()
+        child_conn.close()
+        return _Worker(worker_id, process, parent_conn)
+
+    def submit(self, name: str, args: list) -> Any:
+        """Queue one whitelisted call for the workers and block until its result arrives."""
+        _resolve(name)
+        job = _Job(name, args, time.monotonic() + self.job_timeout)
+        with self._lock:
+            job_id = next(self._job_ids)
+            self._jobs[job_id] = job
+            self._backlog.append(job_id)
+        self._wake()
+
+        # The dispatcher ends every job by its deadline; this only guards against the dispatcher itself dying
+        if not job.done.wait(self.job_timeout + 5 * self.WATCH_INTERVAL):
+            with self._lock:
+                self._jobs.pop(job_id, None)
+            raise TimeoutError(f"Job inferensi tidak selesai dalam {self.job_timeout} detik")
+        if job.status == "timeout":
+            raise TimeoutError(job.payload)
+        if job.status == "error":
+            raise RuntimeError(job.payload)
+        return job.payload
+
+    def _wake(self) -> None:
+        os.write(self._wakeup_w, b"\0")
+
+    def _finish(self, job_id: int, status: str, payload: Any) -> None:
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+        if job is not None:
+            job.status, job.payload = status, payload
+            job.done.set()
+
+    def _dispatch_loop(self) -> None:
+        """Single owner of the worker pipes: collect results, replace dead workers, enforce deadlines, assign jobs."""
+        while not self._stopping:
+            by_handle = {}
+            for worker in self._workers:
+                by_handle[worker.conn] = worker
+                by_handle[worker.process.sentinel] = worker
+            ready = wait([self._wakeup_r, *by_handle], timeout=self.WATCH_INTERVAL)
+            if self._wakeup_r in ready:
+                os.read(self._wakeup_r, 4096)
+
+            for handle in ready:
+                worker = by_handle.get(handle)
+                if worker is not None and handle is worker.conn:
+                    self._receive(worker)
+            for worker_id, worker in enumerate(self._workers):
+                if not worker.process.is_alive():
+                    self._replace(worker_id, worker)
+            self._expire()
+            self._assign()
+
+        for worker in self._workers:
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass  # Already gone
+
+    def _receive(self, worker: _Worker) -> None:
+        try:
+            message = worker.conn.recv()
+        except (EOFError, OSError):
+            return  # Died mid-reply; handled as a dead worker
+        if message[0] == "ready":
+            worker.started = True
+            worker.ready = bool(message[1])
+            worker.job_id = None
+            return
+        job_id, status, payload = message
+        if status == "ok":
+            worker.completed += 1
+        else:
+            worker.failed += 1
+        worker.job_id = None
+        self._finish(job_id, status, payload)
+
+    def _replace(self, worker_id: int, worker: _Worker) -> None:
+        """Start a new worker in the slot of a dead one; its job is requeued once, then failed."""
+        logger.error(
+            f"Worker inferensi {worker_id} (pid {worker.process.pid}) berhenti, "
+            f"exitcode {worker.process.exitcode}; dijalankan ulang"
+        )
+        worker.conn.close()
+        job_id = worker.job_id
+        if job_id is not None:
+            with self._lock:
+                job = self._jobs.get(job_id)
+                retry = job is not None and job.attempts < self.MAX_ATTEMPTS
+                if retry:
+                    self._backlog.appendleft(job_id)
+            if job is not None and not retry:
+                self._finish(job_id, "error", f"Worker inferensi berhenti (exitcode {worker.process.exitcode})")
+        replacement = self._start_worker(worker_id, self._spawn_context)
+        # Counters belong to the slot, so /health keeps the history of replaced workers
+        replacement.completed, replacement.failed = worker.completed, worker.failed
+        self._workers[worker_id] = replacement
+        self.restarts += 1
+
+    def _expire(self) -> None:
+        """Fail jobs past their deadline; a worker still running one is killed (and replaced)."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items() if job.deadline <= now]
+            for job_id in expired:
+                if job_id in self._backlog:
+                    self._backlog.remove(job_id)
+        for job_id in expired:
+            for worker in self._workers:
+                if worker.job_id == job_id and worker.process.is_alive():
+                    logger.error(f"Job inferensi melewati {self.job_timeout} detik, worker {worker.worker_id} dihentikan")
+                    # Nothing else reads or writes this worker's pipe
+                    worker.process.kill()
+                    worker.job_id = None
+            self._finish(job_id, "timeout", f"Job inferensi tidak selesai dalam {self.job_timeout} detik")
+
+    def _assign(self) -> None:
+        for worker in self._workers:
+            if not worker.started or worker.job_id is not None or not worker.process.is_alive():
+                continue
+            with self._lock:
+                job = None
+                while self._backlog and job is None:
+                    job_id = self._backlog.popleft()
+                    job = self._jobs.get(job_id)
+                if job is None:
+                    return
+                job.attempts += 1
+            # Ownership is recorded before the job leaves the parent
+            worker.job_id = job_id
+            try:
+                worker.conn.send((job_id, job.name, job.args))
+            except OSError:
+                pass  # Worker is dying; the next pass requeues the job
+
+    def serve_forever(self) -> None:
+        """Accept client connections; each one gets a handler thread."""
+        if os.path.exists(self.address):
+            os.unlink(self.address)  # Stale socket from a previous run; the Listener removes its own
+        # Owner-only from the moment the socket file exists, not after a chmod
+        previous_umask = os.umask(0o177)
+        try:
+            listener = Listener(self.address, family="AF_UNIX", authkey=self.authkey)
+        finally:
+            os.umask(previous_umask)
+        logger.info(f"Pool inferensi mendengarkan di {self.address}")
+        try:
+            while True:
+                try:
+                    conn = listener.accept()
+                except Exception as e:
+                    # Failed authentication or a client that hung up mid-handshake
+                    logger.warning(f"Koneksi klien inferensi ditolak: {str(e)}")
+                    continue
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+        finally:
+            listener.close()
+
+    def _handle(self, conn) -> None:
+        try:
+            while True:
+                try:
+                    message = _recv_json(conn)
+                    kind = message["type"]
+                except (ValueError, TypeError, KeyError) as e:
+                    _send_json(conn, ["error", f"Pesan tidak valid: {str(e)}"])
+                    continue
+                if kind == "call":
+                    try:
+                        _send_json(conn, ["ok", self.submit(message["func"], list(message["args"]))])
+                    except Exception as e:
+                        _send_json(conn, ["error", str(e)])
+                elif kind == "stats":
+                    _send_json(conn, ["ok", self.stats()])
+                else:
+                    _send_json(conn, ["error", f"Pesan tidak dikenal: {kind}"])
+        except (EOFError, OSError):
+            pass  # Client closed the connection
+        finally:
+            conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-worker memory and throughput, plus the backlog of queued jobs."""
+        workers = []
+        for worker in list(self._workers):
+            workers.append({
+                "worker_id": worker.worker_id,
+                "pid": worker.process.pid,
+                "alive": worker.process.is_alive(),
+                "ready": worker.ready,
+                "busy": worker.job_id is not None,
+                "completed": worker.completed,
+                "failed": worker.failed,
+                **_read_memory_kb(worker.process.pid)
+            })
+        return {
+            "address": self.address,
+            "ready": bool(workers) and all(w["ready"] for w in workers if w["alive"]),
+            "queue_depth": len(self._backlog),
+            "in_flight": len(self._jobs),
+            "restarts": self.restarts,
+            "uptime_seconds": round(time.time() - self._started_at, 1),
+            "parent": {"pid": os.getpid(), **_read_memory_kb(os.getpid())},
+            "workers": workers
+        }
+
+    def shutdown(self) -> None:
+        self._stopping = True
+        self._wake()
+        if self._dispatcher is not None:
+            # The dispatcher owns the pipes and sends each worker its stop message
+            self._dispatcher.join(timeout=5)
+        for worker in self._workers:
+            worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.process.terminate()
+
+
+class RemoteInferenceClient:
+    """
+    API-process side: sends calls to the worker pool. Connections are pooled
+    and each carries one request at a time, so concurrency is bounded by the
+    caller (the inference executor's thread count).
+    """
+
+    def __init__(self, address: str, authkey: Optional[bytes] = None, timeout: float = 120.0):
+        self.address = address
+        self.authkey = _require_authkey(authkey)
+        self.timeout = timeout
+        self._idle: list = []
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return Client(self.address, family="AF_UNIX", authkey=self.authkey)
+
+    def _release(self, conn) -> None:
+        with self._lock:
+            self._idle.append(conn)
+
+    def _request(self, message: Dict[str, Any], timeout: float) -> Any:
+        conn = self._acquire()
+        try:
+            _send_json(conn, message)
+            if not conn.poll(timeout):
+                raise TimeoutError(f"Pool inferensi tidak menjawab dalam {timeout} detik")
+            status, payload = _recv_json(conn)
+        except BaseException:
+            # The connection may hold a late reply; never reuse it
+            conn.close()
+            raise
+        self._release(conn)
+        if status == "error":
+            raise RuntimeError(f"Inferensi jarak jauh gagal: {payload}")
+        return payload
+
+    def call(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run ``func(*args)`` on a pool worker; func must be in REMOTE_FUNCTIONS and args JSON data."""
+        return self._request({"type": "call", "func": remote_name(func), "args": list(args)}, self.timeout)
+
+    def server_stats(self, timeout: float = 2.0) -> Dict[str, Any]:
+        return self._request({"type": "stats"}, timeout)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
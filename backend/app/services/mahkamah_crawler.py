@@ -4,9 +4,18 @@ Handles Indonesian legal database with Bahasa Indonesia case types and severity.
 """
 
 import asyncio
-from typing import List, Dict, Any, Optional
+import importlib.util
+import math
+import re
+import time
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
-from app.config import MAHKAMAH_CRAWL_DELAY
+from urllib.parse import urlencode
+from app.config import MAHKAMAH_FETCH_MODE, MAHKAMAH_MAX_PAGES, MAHKAMAH_MAX_CASES, MAHKAMAH_SEARCH_DEADLINE
+from app.services.browser_pool import browser_pool
+from app.services.case_parser import SEVERITY_MAP, determine_case_type, parse_results_page, parse_search_page
+from app.services.host_scheduler import host_scheduler
+from app.services.http_client import http_client
 from app.utils.logger import logger
 from app.utils.exceptions import CrawlerError
 
@@ -14,12 +23,17 @@ class MahkamahCrawlerError(CrawlerError):
     """Exception khusus untuk kesalahan pengikisan Mahkamah Agung."""
     pass
 
-try:
-    from crawl4ai import AsyncWebCrawler
-    CRAWL4AI_AVAILABLE = True
-except ImportError:
-    CRAWL4AI_AVAILABLE = False
-    logger.warning("Crawl4AI not available, falling back to requests")
+# Only check that crawl4ai is installed; it (and its browser stack) is
+# imported on first crawl instead of at application startup
+CRAWL4AI_AVAILABLE = importlib.util.find_spec("crawl4ai") is not None
+if not CRAWL4AI_AVAILABLE:
+    logger.warning("Crawl4AI not available, using plain HTTP fetches only")
+
+# A <div> whose class list contains "entry-c": the search page already has results
+RESULT_CONTAINER_RE = re.compile(r'<div[^>]*\bclass\s*=\s*["\'][^"\']*\bentry-c\b', re.IGNORECASE)
+
+# Which fetcher produced each search page, and how often HTTP had to escalate
+crawl_metrics = {"http": 0, "browser": 0, "escalated": 0}
 
 
 class MahkamahAgungCrawler:
@@ -27,23 +41,21 @@ class MahkamahAgungCrawler:
     
     BASE_URL = "https://putusan3.mahkamahagung.go.id"
     SEARCH_URL = f"{BASE_URL}/search.html"
-    
-    # Severity mapping to Bahasa Indonesia
-    SEVERITY_MAP = {
-        "pidana": "tinggi",      # Criminal - high severity
-        "perdata": "sedang",      # Civil - medium severity
-        "tata usaha negara": "sedang",  # Administrative - medium severity
-        "tata": "sedang",         # Administrative - medium severity
-        "niaga": "tinggi",        # Commercial - high severity
-        "pajak": "sedang",        # Tax - medium severity
-        "pidana umum": "tinggi",  # General criminal - high severity
-        "pidana khusus": "tinggi", # Special criminal - high severity
+    HEADERS = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
     }
     
+    SEVERITY_MAP = SEVERITY_MAP
+    
     def __init__(self):
         self.timeout = 15  # Reduced timeout to fail faster
         self.page_timeout = 20000  # 20 seconds for page load (in milliseconds)
         self.use_crawl4ai = CRAWL4AI_AVAILABLE
+        self.fetch_mode = MAHKAMAH_FETCH_MODE
+        self.max_pages = max(1, MAHKAMAH_MAX_PAGES)
+        self.max_cases = max(1, MAHKAMAH_MAX_CASES)
+        self.deadline = MAHKAMAH_SEARCH_DEADLINE
+        self.last_fetcher: Optional[str] = None  # "http" or "browser", whichever served the last page
     
     async def search_company(self, company_name: str) -> Dict[str, Any]:
         """
@@ -53,28 +65,25 @@ class MahkamahAgungCrawler:
         Returns:
             {
               "company_name": str,
-              "cases_found": int,
+              "cases_found": int (total from the result header when available),
               "cases": [{case_data}],
+              "pages_crawled": int,
               "max_severity": str (tinggi, sedang, rendah, tidak ada),
               "timestamp": str
             }
         """
-        cases = []
-        
         try:
-            if self.use_crawl4ai:
-                cases = await self._search_with_crawl4ai(company_name)
-            else:
-                logger.warning("Crawl4AI not available, using fallback method")
-                cases = await self._search_fallback(company_name)
+            cases, total, pages = await self._search(company_name)
             
             severities = [c.get('severity', 'rendah') for c in cases]
             max_severity = self._get_max_severity(severities)
             
             return {
                 "company_name": company_name,
-                "cases_found": len(cases),
-                "cases": cases[:10],  # Limit to 10 cases
+                # The header counts every match, the collected cases stop at the cap
+                "cases_found": max(total, len(cases)) if total is not None else len(cases),
+                "cases": cases,
+                "pages_crawled": pages,
                 "max_severity": max_severity,
                 "timestamp": datetime.now().isoformat(),
                 "source": "mahkamah_agung"
@@ -92,280 +101,248 @@ class MahkamahAgungCrawler:
                 "source": "mahkamah_agung"
             }
     
-    async def _search_with_crawl4ai(self, company_name: str) -> List[Dict]:
-        """Search using Crawl4AI for better JavaScript handling."""
-        cases = []
-        
+    async def _search(self, company_name: str) -> Tuple[List[Dict], Optional[int], int]:
+        """
+        Crawl the result pages: page 1 first (it tells the page size and the
+        total), then pages 2..N concurrently under the host politeness limit.
+        Returns (cases, announced total or None, pages used).
+
+        Crawling stops at an empty page (or one with nothing new), at
+        MAHKAMAH_MAX_CASES cases, at MAHKAMAH_MAX_PAGES pages or at the
+        MAHKAMAH_SEARCH_DEADLINE, whichever comes first.
+        """
+        deadline = time.monotonic() + self.deadline
+        mode = self.fetch_mode if self.use_crawl4ai else "http"
+        html = await self._fetch(self._search_url(company_name, 1), mode)
+        cases, total = parse_results_page(html, self.BASE_URL, limit=self.max_cases)
+
+        last_page = self._last_page(len(cases), total)
+        if last_page < 2:
+            return cases, total, 1
+
+        # Later pages go straight to whichever fetcher served page 1
+        if mode in ("auto", "race") and self.last_fetcher == "browser":
+            mode = "browser"
+        elif mode == "race":
+            mode = "auto"
+        pages = await self._fetch_pages(company_name, range(2, last_page + 1), mode, deadline, len(cases))
+
+        seen = {self._case_key(case) for case in cases}
+        used = 1
+        for page in range(2, last_page + 1):
+            page_cases = pages.get(page)
+            if page_cases is None:
+                continue  # Failed or cut off by the deadline
+            new = [case for case in page_cases if self._case_key(case) not in seen]
+            if not new:
+                # Past the last page (or the page parameter was ignored)
+                break
+            seen.update(self._case_key(case) for case in new)
+            cases.extend(new)
+            used += 1
+            if len(cases) >= self.max_cases:
+                break
+        return cases[:self.max_cases], total, used
+
+    def _last_page(self, page_size: int, total: Optional[int]) -> int:
+        """Highest page worth fetching, from the first page's size and the announced total."""
+        if page_size == 0 or page_size >= self.max_cases:
+            return 1
+        last_page = min(self.max_pages, math.ceil(self.max_cases / page_size))
+        if total is not None:
+            last_page = min(last_page, math.ceil(total / page_size))
+        return last_page
+
+    async def _fetch_pages(
+        self,
+        company_name: str,
+        page_numbers: range,
+        mode: str,
+        deadline: float,
+        first_page_cases: int
+    ) -> Dict[int, List[Dict]]:
+        """
+        Fetch and parse pages concurrently. Pages after an empty one, or after
+        the case cap is reached in page order, are cancelled; so is everything
+        still pending at the deadline.
+        """
+        tasks = {
+            asyncio.ensure_future(self._fetch_page_cases(company_name, page, mode)): page
+            for page in page_numbers
+        }
+        results: Dict[int, List[Dict]] = {}
+        stop_after = page_numbers[-1]
+        pending = set(tasks)
         try:
-            async with AsyncWebCrawler(verbose=False) as crawler:
-                # Construct search URL with query parameters
-                search_params = {
-                    "jenis_doc": "putusan",
-                    "q": company_name,
-                    "p": 1
-                }
-                
-                # Build URL with query string
-                query_string = "&".join([f"{k}={v}" for k, v in search_params.items()])
-                search_url = f"{self.SEARCH_URL}?{query_string}"
-                
-                logger.info(f"Crawling: {search_url}")
-                
-                result = await asyncio.wait_for(
-                    crawler.arun(
-                        url=search_url,
-                        wait_for="css:div.entry-c",
-                        page_timeout=self.page_timeout,
-                        bypass_cache=True
-                    ),
-                    timeout=self.timeout  # 15 seconds total timeout
-                )
-                
-                if not result.success:
-                    logger.warning(f"Crawl4AI crawl failed: {result.error_message}")
-                    return cases
-                
-                # Parse the cleaned HTML or markdown
-                from bs4 import BeautifulSoup
-                soup = BeautifulSoup(result.html, 'html.parser')
-                
-                # Find case containers - they are in div.entry-c
-                case_elements = soup.find_all('div', class_='entry-c')
-                
-                # If not found, try alternative selectors
-                if not case_elements:
-                    case_elements = (
-                        soup.find_all('div', class_='putusan-item') or
-                        soup.find_all('div', class_='case-item') or
-                        soup.find_all('div', class_=lambda x: x and 'entry' in str(x).lower()) or
-                        []
-                    )
-                
-                logger.info(f"Found {len(case_elements)} potential case elements")
-                
-                for element in case_elements[:10]:  # Limit to 10 cases
-                    case_data = self._parse_case_element(element)
-                    if case_data:
-                        cases.append(case_data)
-                    await asyncio.sleep(MAHKAMAH_CRAWL_DELAY)  # Rate limiting
-                
-        except asyncio.TimeoutError:
-            logger.warning(f"Crawl4AI timeout untuk {company_name}, menggunakan fallback")
-            return await self._search_fallback(company_name)
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(f"Batas waktu pencarian tercapai, {len(pending)} halaman dilewati")
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    page = tasks[task]
+                    if task.exception() is not None:
+                        logger.warning(f"Halaman {page} gagal diambil: {str(task.exception())}")
+                        continue
+                    results[page] = task.result()
+                    if not results[page]:
+                        stop_after = min(stop_after, page - 1)
+
+                # Cases collected from the pages completed so far, in page order
+                collected = first_page_cases
+                for page in page_numbers:
+                    if page > stop_after or page not in results:
+                        break
+                    collected += len(results[page])
+                    if collected >= self.max_cases:
+                        stop_after = page
+                        break
+
+                for task in list(pending):
+                    if tasks[task] > stop_after:
+                        task.cancel()
+                        pending.discard(task)
+        finally:
+            for task in pending:
+                task.cancel()
+        return results
+
+    async def _fetch_page_cases(self, company_name: str, page: int, mode: str) -> List[Dict]:
+        html = await self._fetch(self._search_url(company_name, page), mode)
+        return parse_search_page(html, self.BASE_URL, limit=self.max_cases)
+
+    def _search_url(self, company_name: str, page: int) -> str:
+        return f"{self.SEARCH_URL}?{urlencode({'jenis_doc': 'putusan', 'q': company_name, 'p': page})}"
+
+    @staticmethod
+    def _case_key(case: Dict) -> tuple:
+        return case.get("source_url"), case.get("case_number"), case.get("case_title")
+
+    async def _fetch(self, search_url: str, mode: str) -> str:
+        """
+        Fetch one results page according to MAHKAMAH_FETCH_MODE.
+
+        - "auto": plain HTTP first, escalating to the browser only when the
+          page has no result containers (e.g. rendered client-side)
+        - "race": HTTP and browser at once, first page with results wins
+        - "browser": browser first, plain HTTP if it fails
+        - "http": plain HTTP only
+        """
+        logger.info(f"Crawling: {search_url}")
+        if mode == "race":
+            return await self._fetch_race(search_url)
+        if mode == "browser":
+            return await self._fetch_with_fallback(self._fetch_browser, self._fetch_http, search_url)
+        if mode == "http":
+            return await self._fetch_http(search_url)
+        return await self._fetch_auto(search_url)
+
+    async def _fetch_auto(self, search_url: str) -> str:
+        try:
+            html = await self._fetch_http(search_url)
         except Exception as e:
-            logger.warning(f"Crawl4AI error: {str(e)}, menggunakan fallback")
-            # Try fallback instead of failing completely
-            try:
-                return await self._search_fallback(company_name)
-            except Exception as e2:
-                logger.error(f"Fallback juga gagal: {str(e2)}")
-                # Return empty results instead of raising error
-                return []
-        
-        return cases
-    
-    async def _search_fallback(self, company_name: str) -> List[Dict]:
-        """Fallback search method using requests (if Crawl4AI unavailable)."""
-        import requests
-        from bs4 import BeautifulSoup
-        
-        cases = []
-        
+            logger.warning(f"Fetch HTTP gagal: {str(e)}, beralih ke browser")
+            crawl_metrics["escalated"] += 1
+            return await self._fetch_browser(search_url)
+        if self._has_results(html):
+            return html
+
+        logger.info("Halaman tanpa hasil pada fetch HTTP, beralih ke browser")
+        crawl_metrics["escalated"] += 1
         try:
-            search_url = self.SEARCH_URL
-            params = {
-                "jenis_doc": "putusan",
-                "q": company_name,
-                "p": 1
-            }
-            
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            }
-            
-            response = requests.get(search_url, params=params, headers=headers, timeout=self.timeout)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            case_elements = (
-                soup.find_all('div', class_='putusan-item') or
-                soup.find_all('div', class_='case-item') or
-                soup.select('table tbody tr') or
-                []
-            )
-            
-            for element in case_elements[:10]:
-                case_data = self._parse_case_element(element)
-                if case_data:
-                    cases.append(case_data)
-                await asyncio.sleep(MAHKAMAH_CRAWL_DELAY)
-                
+            return await self._fetch_browser(search_url)
         except Exception as e:
-            logger.error(f"Fallback search error: {str(e)}")
-            raise MahkamahCrawlerError(f"Kesalahan pencarian fallback: {str(e)}")
-        
-        return cases
-    
-    def _parse_case_element(self, element) -> Optional[Dict]:
-        """Parse individual case from HTML. Handles Indonesian date formats."""
+            # The plain page is still a valid (possibly empty) answer
+            logger.warning(f"Crawl4AI error: {str(e)}, memakai hasil fetch HTTP")
+            return html
+
+    async def _fetch_with_fallback(self, first, second, search_url: str) -> str:
         try:
-            # Structure: div.entry-c contains:
-            # 1. Breadcrumb navigation (div.small with links)
-            # 2. Date info (div.small with Register/Putus/Upload)
-            # 3. Case number link (strong > a)
-            # 4. Case title/description (div after case number)
-            # 5. Summary (list > blockquote)
-            
-            # 1. Find case number - it's in a strong > a link with "Putusan MAHKAMAH AGUNG Nomor" pattern
-            case_number = "Tidak diketahui"
-            source_url = ""
-            
-            # Look for strong element containing a link to putusan detail page
-            all_strong = element.find_all('strong')
-            for strong_elem in all_strong:
-                case_num_a = strong_elem.find('a', href=lambda x: x and 'direktori/putusan' in x.lower())
-                if case_num_a:
-                    case_number = case_num_a.get_text(strip=True)
-                    source_url = case_num_a.get('href', '')
-                    if source_url and not source_url.startswith('http'):
-                        source_url = f"{self.BASE_URL}{source_url}"
-                    break
-            
-            # Fallback: look for any link with "Putusan" and "Nomor" in text
-            if case_number == "Tidak diketahui":
-                putusan_links = element.find_all('a', href=lambda x: x and 'putusan' in x.lower())
-                for link in putusan_links:
-                    link_text = link.get_text(strip=True)
-                    if 'Putusan' in link_text and 'Nomor' in link_text:
-                        case_number = link_text
-                        source_url = link.get('href', '')
-                        if source_url and not source_url.startswith('http'):
-                            source_url = f"{self.BASE_URL}{source_url}"
-                        break
-            
-            # 2. Find date information - in div.small with strong tags
-            case_date = "Tidak diketahui"
-            date_divs = element.find_all('div', class_='small')
-            for date_div in date_divs:
-                # Look for div containing date information (has "Register", "Putus", "Upload")
-                date_text = date_div.get_text(separator=' ', strip=True)
-                if 'Putus' in date_text or 'Register' in date_text:
-                    # Extract date pattern DD-MM-YYYY after "Putus :"
-                    import re
-                    # Look for date after "Putus :"
-                    putus_match = re.search(r'Putus\s*:\s*(\d{2}-\d{2}-\d{4})', date_text)
-                    if putus_match:
-                        case_date = putus_match.group(1)
-                        break
-                    # Fallback: find any date pattern
-                    date_match = re.search(r'(\d{2}-\d{2}-\d{4})', date_text)
-                    if date_match:
-                        case_date = date_match.group(1)
-                        break
-            
-            # 3. Find case title/description - it's in a div after the case number link
-            case_title = "Tidak diketahui"
-            
-            # Find the div that comes after the strong case number link
-            # Look for div that contains "Tanggal" (date) pattern
-            all_divs = element.find_all('div')
-            for div in all_divs:
-                div_text = div.get_text(strip=True)
-                # Look for div with "Tanggal" pattern (case description)
-                if 'Tanggal' in div_text and len(div_text) > 20:
-                    # Remove mark tags (highlighted search terms) first
-                    for mark in div.find_all('mark'):
-                        mark.unwrap()
-                    
-                    # Get cleaned text
-                    case_title = div.get_text(separator=' ', strip=True)
-                    
-                    # Clean up: remove metadata like view counts, download counts, status
-                    import re
-                    # Remove patterns like "132 — 68 — Berkekuatan Hukum Tetap" or "90 — 0 — Berkekuatan Hukum Tetap"
-                    case_title = re.sub(r'\s*\d+\s*—\s*\d+\s*—\s*Berkekuatan.*$', '', case_title, flags=re.IGNORECASE).strip()
-                    # Remove trailing dashes and extra spaces
-                    case_title = re.sub(r'\s*—\s*$', '', case_title).strip()
-                    # Remove multiple spaces
-                    case_title = re.sub(r'\s+', ' ', case_title).strip()
-                    break
-            
-            # If no title found, try to extract from case number
-            if case_title == "Tidak diketahui" and case_number != "Tidak diketahui":
-                case_title = case_number
-            
-            case_type = self._determine_case_type(case_title)
-            
-            # 4. Find verdict summary - in blockquote elements
-            verdict_summary = ""
-            blockquotes = element.find_all('blockquote')
-            if blockquotes:
-                # Combine all blockquote text
-                summary_parts = []
-                for bq in blockquotes[:3]:  # Limit to first 3 blockquotes
-                    text = bq.get_text(separator=' ', strip=True)
-                    if text and len(text) > 20:  # Only include substantial text
-                        summary_parts.append(text)
-                
-                if summary_parts:
-                    verdict_summary = ' '.join(summary_parts)
-                    # Limit to 500 characters
-                    if len(verdict_summary) > 500:
-                        verdict_summary = verdict_summary[:500] + "..."
-            
-            # If no summary from blockquotes, try to get from element text
-            if not verdict_summary:
-                all_text = element.get_text(separator=' ', strip=True)
-                # Remove case number and title from text
-                if case_number in all_text:
-                    all_text = all_text.replace(case_number, '', 1)
-                if case_title in all_text:
-                    all_text = all_text.replace(case_title, '', 1)
-                # Get a reasonable chunk
-                if len(all_text) > 100:
-                    verdict_summary = all_text[:300].strip()
-                else:
-                    verdict_summary = "Tidak ada ringkasan"
-            
-            severity = self.SEVERITY_MAP.get(case_type.lower(), "sedang")
-            
-            return {
-                "case_number": case_number,
-                "case_date": case_date,
-                "case_title": case_title,
-                "case_type": case_type,
-                "verdict_summary": verdict_summary,
-                "severity": severity,
-                "source_url": source_url
-            }
+            return await first(search_url)
         except Exception as e:
-            logger.warning(f"Error parsing case element: {str(e)}")
-            import traceback
-            logger.debug(traceback.format_exc())
-            return None
-    
+            logger.warning(f"{first.__name__} gagal: {str(e)}, menggunakan fallback")
+            return await second(search_url)
+
+    async def _fetch_race(self, search_url: str) -> str:
+        """Run both fetchers; the first page with results wins and the other is cancelled."""
+        tasks = {
+            asyncio.ensure_future(self._fetch_http(search_url)),
+            asyncio.ensure_future(self._fetch_browser(search_url))
+        }
+        pending = set(tasks)
+        fallback_html: Optional[str] = None
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    html = task.result()
+                    if self._has_results(html):
+                        return html
+                    fallback_html = fallback_html or html
+        finally:
+            for task in pending:
+                task.cancel()
+        if fallback_html is not None:
+            return fallback_html
+        raise error
+
+    async def _fetch_http(self, search_url: str) -> str:
+        """Fetch the page with the shared async HTTP client (no JavaScript)."""
+        try:
+            # Politeness applies to the request itself, shared with every other search
+            await asyncio.wait_for(host_scheduler.wait(search_url), timeout=self.timeout)
+            response = await http_client.get().get(
+                search_url,
+                headers=self.HEADERS,
+                timeout=self.timeout,
+                follow_redirects=True
+            )
+            response.raise_for_status()
+        except Exception as e:
+            raise MahkamahCrawlerError(f"Kesalahan fetch HTTP: {type(e).__name__}: {str(e)}")
+        crawl_metrics["http"] += 1
+        self.last_fetcher = "http"
+        return response.text
+
+    async def _fetch_browser(self, search_url: str) -> str:
+        """Render the page with Crawl4AI on a page borrowed from the shared browser."""
+        if not self.use_crawl4ai:
+            raise MahkamahCrawlerError("Crawl4AI tidak tersedia")
+        # Waiting for a free page counts against the same timeout as the crawl
+        async with browser_pool.session(timeout=self.timeout) as page:
+            result = await asyncio.wait_for(
+                self._crawl_page(page, search_url),
+                timeout=self.timeout  # 15 seconds total timeout, including the politeness wait
+            )
+        if not result.success:
+            raise MahkamahCrawlerError(f"Crawl4AI crawl failed: {result.error_message}")
+        crawl_metrics["browser"] += 1
+        self.last_fetcher = "browser"
+        return result.html
+
+    async def _crawl_page(self, page, search_url: str):
+        """Fetch one page through the browser once the host scheduler admits the request."""
+        await host_scheduler.wait(search_url)
+        return await page.arun(
+            url=search_url,
+            wait_for="css:div.entry-c",
+            page_timeout=self.page_timeout,
+            bypass_cache=True
+        )
+
+    @staticmethod
+    def _has_results(html: str) -> bool:
+        """Cheap check for result containers, without parsing the page."""
+        return bool(html) and RESULT_CONTAINER_RE.search(html) is not None
+
     def _determine_case_type(self, title: str) -> str:
-        """
-        Classify case type from title.
-        Returns Indonesian case types: pidana, perdata, tata usaha negara, niaga
-        """
-        if not title:
-            return "perdata"
-            
-        title_lower = title.lower()
-        
-        if any(word in title_lower for word in ['pidana', 'criminal', 'penal', 'kriminal', '/pid']):
-            if 'khusus' in title_lower or '/pid.sus' in title_lower:
-                return "pidana khusus"
-            return "pidana"
-        elif any(word in title_lower for word in ['niaga', 'commercial', 'dagang', 'perdagangan', '/pdt.sus']):
-            return "niaga"
-        elif any(word in title_lower for word in ['tata usaha negara', 'administrative', 'administrasi', 'tata usaha', '/tun']):
-            return "tata usaha negara"
-        elif any(word in title_lower for word in ['pajak', 'tax', '/pjk']):
-            return "pajak"
-        else:
-            return "perdata"
+        """Classify case type from title (pidana, perdata, tata usaha negara, niaga, pajak)."""
+        return determine_case_type(title)
     
     def _get_max_severity(self, severities: List[str]) -> str:
         """
@@ -0,0 +1,207 @@
+"""
+Process-wide sentiment model registry.
+Loads the inference backend and the lexicon scorer (VADER or the Indonesian
+lexicon) once per process and shares them between all SentimentAnalysisService
+instances.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+from app.config import (
+    NLTK_DATA_DIR,
+    TORCH_DEVICE,
+    SENTIMENT_MODEL,
+    SENTIMENT_MODEL_FALLBACKS,
+    SENTIMENT_MODEL_STORE,
+    SENTIMENT_OFFLINE,
+    SENTIMENT_BACKEND,
+    SENTIMENT_LEXICON,
+    SENTIMENT_ONNX_DIR,
+    SENTIMENT_ONNX_QUANTIZED,
+    INFERENCE_TORCH_THREADS,
+    SENTIMENT_MAX_TOKENS,
+    SENTIMENT_TIERED_MODE,
+    SENTIMENT_TIER_LOW,
+    SENTIMENT_TIER_HIGH,
+)
+from app.services.indonesian_lexicon import IndonesianLexiconScorer
+from app.services.model_store import model_store
+from app.services.sentiment_backends import OnnxBackend, TorchPipelineBackend
+from app.utils.logger import logger
+
+# Tried in order; each one from the local model store first, then the hub
+MODEL_CANDIDATES = [SENTIMENT_MODEL] + [
+    name.strip() for name in SENTIMENT_MODEL_FALLBACKS.split(",") if name.strip()
+]
+
+WARMUP_TEXT = "Perusahaan ini menunjukkan kinerja keuangan yang baik tahun ini."
+
+
+class SentimentModelRegistry:
+    """Thread-safe, load-once holder for the sentiment models."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._backend = None
+        self._lexicon = None
+        self.model_name: Optional[str] = None
+        self.backend_name: Optional[str] = None
+        # Hub id and revision of the loaded model ("hub": unpinned, "local": outside the store)
+        self.model_ref: Optional[str] = None
+        self.model_revision: Optional[str] = None
+        # Identity reported by results from the inference pool (process and remote modes)
+        self.served_model_id: Optional[str] = None
+        self.ready = False
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+
+    def get_backend(self):
+        """Return the shared inference backend, loading it on first use."""
+        if self._backend is None:
+            # Double-checked locking: concurrent first requests wait for a
+            # single load instead of each loading their own copy.
+            with self._lock:
+                if self._backend is None:
+                    self._backend = self._load_backend()
+        return self._backend
+
+    def get_lexicon(self):
+        """
+        Return the shared lexicon scorer selected by SENTIMENT_LEXICON. Both
+        options expose VADER's ``polarity_scores``; the Indonesian automaton is
+        compiled here, once per process.
+        """
+        if self._lexicon is None:
+            with self._lock:
+                if self._lexicon is None:
+                    if SENTIMENT_LEXICON == "indonesian":
+                        self._lexicon = IndonesianLexiconScorer()
+                    else:
+                        self._lexicon = self._load_vader()
+        return self._lexicon
+
+    @staticmethod
+    def _load_vader():
+        """VADER from the bundled NLTK data directory; nltk is only imported here."""
+        import nltk
+        from nltk.sentiment import SentimentIntensityAnalyzer
+
+        if NLTK_DATA_DIR not in nltk.data.path:
+            nltk.data.path.insert(0, NLTK_DATA_DIR)
+        try:
+            return SentimentIntensityAnalyzer()
+        except LookupError as e:
+            raise RuntimeError(
+                f"vader_lexicon tidak ditemukan di {NLTK_DATA_DIR}; jalankan "
+                f"'python -m nltk.downloader vader_lexicon -d {NLTK_DATA_DIR}'"
+            ) from e
+
+    def _load_backend(self):
+        started = time.perf_counter()
+        backend = None
+        if SENTIMENT_OFFLINE:
+            # Never let transformers/huggingface_hub reach for the network
+            os.environ.setdefault("HF_HUB_OFFLINE", "1")
+            os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+        if SENTIMENT_BACKEND == "onnx":
+            stored_dir = model_store.resolve(MODEL_CANDIDATES[0], "onnx")
+            onnx_dir = stored_dir or SENTIMENT_ONNX_DIR
+            try:
+                logger.info(f"Memuat model sentimen ONNX dari {onnx_dir}")
+                backend = OnnxBackend(
+                    onnx_dir,
+                    quantized=SENTIMENT_ONNX_QUANTIZED,
+                    num_threads=INFERENCE_TORCH_THREADS
+                )
+                if stored_dir:
+                    self.model_ref = MODEL_CANDIDATES[0]
+                    self.model_revision = model_store.revision(MODEL_CANDIDATES[0], "onnx") or "local"
+                else:
+                    self.model_ref, self.model_revision = onnx_dir, "local"
+            except Exception as e:
+                logger.warning(f"Gagal memuat backend ONNX, kembali ke PyTorch: {str(e)}")
+
+        if backend is None:
+            backend = self._load_torch_backend()
+
+        self.model_name = backend.model_name
+        self.backend_name = backend.name
+        self.load_seconds = round(time.perf_counter() - started, 2)
+        logger.info(f"Model sentimen {self.model_name} ({self.backend_name}) dimuat dalam {self.load_seconds} detik")
+        return backend
+
+    def _load_torch_backend(self) -> TorchPipelineBackend:
+        device = -1 if TORCH_DEVICE == "cpu" else 0  # CPU mode for on-premise
+        last_error: Optional[Exception] = None
+
+        for model_name in MODEL_CANDIDATES:
+            model_path = model_store.resolve(model_name, "torch")
+            if model_path is None and SENTIMENT_OFFLINE:
+                # Skip instantly instead of waiting for a hub lookup to fail
+                logger.warning(f"Model {model_name} tidak ada di {SENTIMENT_MODEL_STORE}, dilewati (offline)")
+                continue
+            try:
+                logger.info(f"Memuat model sentimen: {model_name} ({model_path or 'hub'})")
+                backend = TorchPipelineBackend(model_name, device=device, model_path=model_path)
+                self.model_ref = model_name
+                self.model_revision = (model_store.revision(model_name, "torch") or "local") if model_path else "hub"
+                return backend
+            except Exception as e:
+                last_error = e
+                logger.warning(f"Gagal memuat model {model_name}: {str(e)}")
+
+        self.error = str(last_error) if last_error else f"tidak ada model di {SENTIMENT_MODEL_STORE}"
+        raise RuntimeError(f"Tidak ada model sentimen yang dapat dimuat: {self.error}")
+
+    def model_id(self) -> Optional[str]:
+        """
+        Identity of the model that is actually scoring, used in cache keys:
+        loaded model and revision, backend variant and scoring settings. A
+        fallback model gets its own identity, so its scores are never served
+        as the primary model's. Without a backend in this process (process
+        and remote modes), the identity last reported by the inference pool;
+        None while it is still unknown.
+        """
+        backend = self._backend
+        if backend is None:
+            return self.served_model_id
+        if backend.name == "onnx":
+            variant = "onnx-int8" if backend.quantized else "onnx-fp32"
+        else:
+            variant = backend.name
+        model_id = f"{variant}:{self.model_ref}@{self.model_revision}:max{SENTIMENT_MAX_TOKENS}:{SENTIMENT_LEXICON}"
+        if SENTIMENT_TIERED_MODE:
+            model_id += f":tiered{SENTIMENT_TIER_LOW}-{SENTIMENT_TIER_HIGH}"
+        return model_id
+
+    def warm_up(self) -> None:
+        """Load both models and run one dummy inference so the first request is fast."""
+        try:
+            self.get_lexicon().polarity_scores(WARMUP_TEXT)
+            self.get_backend().predict([WARMUP_TEXT])
+            self.ready = True
+            self.error = None
+            logger.info("Model sentimen siap (warm-up selesai)")
+        except Exception as e:
+            self.error = str(e)
+            logger.error(f"Warm-up model sentimen gagal: {str(e)}")
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Readiness information for the health endpoint: "ready" once warm-up
+        succeeded, "loaded" once both models are in memory.
+        """
+        return {
+            "ready": self.ready,
+            "loaded": self._backend is not None and self._lexicon is not None,
+            "model": self.model_name,
+            "backend": self.backend_name,
+            "load_seconds": self.load_seconds,
+            "error": self.error
+        }
+
+
+model_registry = SentimentModelRegistry()
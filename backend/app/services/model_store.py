@@ -0,0 +1,141 @@
+"""
+Local model artifact store.
+Sentiment models are pre-baked into a directory (at image build, with
+scripts/pull_models.py) and described by a manifest, so the registry loads
+them straight from disk instead of resolving hub names at runtime.
+
+Layout:
+    <root>/manifest.json
+    <root>/<org>--<name>/torch/   safetensors weights + tokenizer + config
+    <root>/<org>--<name>/onnx/    model.onnx / model.int8.onnx + tokenizer + config
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+from app.config import SENTIMENT_MODEL_STORE
+from app.utils.logger import logger
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+FORMATS = ("torch", "onnx")
+
+
+def directory_checksum(path: str) -> str:
+    """sha256 over every file in the directory (relative name + content), in sorted order."""
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for filename in sorted(files):
+            file_path = os.path.join(root, filename)
+            digest.update(os.path.relpath(file_path, path).encode("utf-8") + b"\x00")
+            with open(file_path, "rb") as f:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(block)
+    return digest.hexdigest()
+
+
+class ModelStore:
+    """Reads and writes the manifest of pre-baked model artifacts."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+        self._manifest: Optional[Dict] = None
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.root, MANIFEST_FILE)
+
+    def _load_manifest(self) -> Dict:
+        if self._manifest is None:
+            try:
+                with open(self.manifest_path, encoding="utf-8") as f:
+                    self._manifest = json.load(f)
+            except FileNotFoundError:
+                self._manifest = {"version": MANIFEST_VERSION, "models": []}
+        return self._manifest
+
+    def _save_manifest(self) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._load_manifest(), f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def entries(self) -> List[Dict]:
+        return list(self._load_manifest()["models"])
+
+    def resolve(self, model_id: str, fmt: str = "torch") -> Optional[str]:
+        """Absolute path of a stored artifact, or None. Only touches the manifest and the directory."""
+        for entry in self._load_manifest()["models"]:
+            if entry["model_id"] == model_id and entry["format"] == fmt:
+                path = os.path.join(self.root, entry["path"])
+                if os.path.isdir(path):
+                    return os.path.abspath(path)
+                logger.warning(f"Artefak model {model_id} ({fmt}) ada di manifest tetapi tidak ada di disk: {path}")
+        return None
+
+    def revision(self, model_id: str, fmt: str = "torch") -> Optional[str]:
+        """Pinned hub revision of a stored artifact, or None if it is not in the manifest."""
+        for entry in self._load_manifest()["models"]:
+            if entry["model_id"] == model_id and entry["format"] == fmt:
+                return entry.get("revision")
+        return None
+
+    def verify(self, model_id: str, fmt: str = "torch") -> bool:
+        """Recompute the checksum of a stored artifact and compare it with the manifest."""
+        for entry in self._load_manifest()["models"]:
+            if entry["model_id"] == model_id and entry["format"] == fmt:
+                path = os.path.join(self.root, entry["path"])
+                return os.path.isdir(path) and directory_checksum(path) == entry["checksum"]
+        return False
+
+    def pull(self, model_id: str, fmt: str = "torch", revision: Optional[str] = None, quantize: bool = True) -> Dict:
+        """
+        Download ``model_id`` at ``revision`` (default: main) and store it in
+        ``fmt``. Torch artifacts are re-saved as safetensors so they load via
+        mmap; ONNX artifacts go through export_onnx_model.
+        """
+        from huggingface_hub import HfApi
+
+        if fmt not in FORMATS:
+            raise ValueError(f"Format model tidak dikenal: {fmt}")
+
+        resolved_revision = HfApi().model_info(model_id, revision=revision).sha
+        relative_path = os.path.join(model_id.replace("/", "--"), fmt)
+        path = os.path.join(self.root, relative_path)
+        os.makedirs(path, exist_ok=True)
+        logger.info(f"Menyimpan {model_id}@{resolved_revision[:12]} ({fmt}) ke {path}")
+
+        if fmt == "onnx":
+            from app.services.sentiment_backends import export_onnx_model
+            export_onnx_model(model_id, path, quantize=quantize, revision=resolved_revision)
+        else:
+            from transformers import AutoModelForSequenceClassification, AutoTokenizer
+            tokenizer = AutoTokenizer.from_pretrained(model_id, revision=resolved_revision)
+            model = AutoModelForSequenceClassification.from_pretrained(model_id, revision=resolved_revision)
+            tokenizer.save_pretrained(path)
+            model.save_pretrained(path, safe_serialization=True)
+
+        entry = {
+            "model_id": model_id,
+            "revision": resolved_revision,
+            "format": fmt,
+            "quantized": quantize if fmt == "onnx" else False,
+            "path": relative_path,
+            "checksum": directory_checksum(path),
+            "created_at": datetime.now().isoformat()
+        }
+        with self._lock:
+            models = self._load_manifest()["models"]
+            models[:] = [m for m in models if not (m["model_id"] == model_id and m["format"] == fmt)]
+            models.append(entry)
+            self._save_manifest()
+        return entry
+
+
+model_store = ModelStore(SENTIMENT_MODEL_STORE)
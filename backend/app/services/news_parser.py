@@ -0,0 +1,178 @@
+"""
+Parser for free-text Perplexity news answers.
+Patterns are compiled once; lines are tokenized in a single pass and
+paragraphs are split at most once, lazily, for the fallback strategies.
+Output is identical to the original regex heuristics.
+"""
+
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+ITEM_RE = re.compile(r'^(?:\d+[.)]|[-•*])\s+(.+)')  # "1. ", "2) ", "- ", "• ", "* "
+URL_RE = re.compile(r'http[s]?://[^\s)]+')
+
+# (trigger character, pattern, replacement), applied in order
+_MARKDOWN_RULES = (
+    ('*', re.compile(r'\*\*(.+?)\*\*'), r'\1'),  # **bold**
+    ('_', re.compile(r'__(.+?)__'), r'\1'),  # __bold__
+    ('*', re.compile(r'\*(.+?)\*'), r'\1'),  # *italic*
+    ('_', re.compile(r'_(.+?)_'), r'\1'),  # _italic_
+    ('[', re.compile(r'\[([^\]]+)\]\([^)]+\)'), r'\1'),  # [text](url)
+    ('#', re.compile(r'^#+\s+', re.MULTILINE), ''),  # # Header
+    ('`', re.compile(r'`([^`]+)`'), r'\1'),  # `code`
+    ('`', re.compile(r'```[\s\S]*?```'), ''),  # ```block```
+)
+
+NO_SUMMARY = "Ringkasan artikel tidak tersedia."
+
+
+def strip_markdown(text: str) -> str:
+    """Remove markdown emphasis, links, headers and code, then collapse whitespace."""
+    if not text:
+        return text
+    for trigger, pattern, replacement in _MARKDOWN_RULES:
+        # Every rule needs its trigger character, so most lines skip the regex
+        if trigger in text:
+            text = pattern.sub(replacement, text)
+    return " ".join(text.split())
+
+
+def complete_article(article: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill in missing article fields (in place)."""
+    if 'source_url' not in article:
+        article['source_url'] = ''
+    if 'summary' not in article or not article['summary']:
+        article['summary'] = article.get('title', 'Tidak ada ringkasan')
+    if 'title' not in article or not article['title']:
+        article['title'] = 'Tidak ada judul'
+    return article
+
+
+class NewsLineParser:
+    """
+    Line-at-a-time extraction of numbered or bulleted articles. Used for the
+    full parse and for streamed answers, so both emit the same articles.
+    """
+
+    def __init__(self, strip: Callable[[str], str] = strip_markdown):
+        self._strip = strip
+        self.current: Dict[str, Any] = {}
+        self._title_lower = ""
+        self._title_words: frozenset = frozenset()
+
+    def feed(self, line: str) -> Optional[Dict[str, Any]]:
+        """Consume one line. Returns the previous article when this line completes it."""
+        line = line.strip()
+        if not line:
+            # Blank line separates articles
+            return self._take()
+
+        item = ITEM_RE.match(line)
+        if item:
+            finished = self._take()
+            title = self._strip(item.group(1).strip())
+            self.current['title'] = title
+            self._title_lower = title.lower()
+            self._title_words = frozenset(self._title_lower.split())
+            return finished
+
+        if 'http' in line:
+            url = URL_RE.search(line)
+            if url:
+                self.current['source_url'] = url.group(0)
+                line = URL_RE.sub('', line).strip()
+
+        if not self.current.get('title'):
+            return None
+
+        line_lower = line.lower()
+        # Lines that mostly repeat the title (> 80% of their words) are skipped
+        if line_lower and self._title_lower:
+            words_in_line = set(line_lower.split())
+            if words_in_line and len(words_in_line & self._title_words) / len(words_in_line) > 0.8:
+                return None
+
+        summary = self.current.get('summary')
+        if summary is None:
+            self.current['summary'] = line
+        elif line and line not in summary and line_lower != self._title_lower:
+            self.current['summary'] = summary + ' ' + line
+        return None
+
+    def finish(self) -> Optional[Dict[str, Any]]:
+        """End of content: returns the last article, if any."""
+        return self._take()
+
+    def _take(self) -> Optional[Dict[str, Any]]:
+        if self.current and self.current.get('title'):
+            finished, self.current = self.current, {}
+            return finished
+        return None
+
+
+def _paragraph_article(para: str) -> Dict[str, Any]:
+    """Article from a paragraph without list markup: first line is the title."""
+    url = URL_RE.search(para) if 'http' in para else None
+    para_clean = URL_RE.sub('', para).strip() if url else para.strip()
+    lines = para_clean.split('\n')
+    title = strip_markdown(lines[0].strip()[:100])
+
+    if len(lines) > 1:
+        summary = ' '.join(lines[1:])
+    else:
+        summary = para_clean
+        if title.lower() in summary.lower():
+            summary = summary.replace(title, '', 1).strip()
+    summary = strip_markdown(summary)
+
+    if not summary or summary.lower() == title.lower() or len(summary) < 20:
+        summary = NO_SUMMARY
+    return {"title": title, "summary": summary[:300], "source_url": url.group(0) if url else ''}
+
+
+def parse_news_articles(content: str, sources: List[Any], limit: int) -> List[Dict[str, Any]]:
+    """
+    Extract up to ``limit`` articles from a free-text news answer.
+
+    1. Numbered or bulleted items, one line pass.
+    2. If fewer than ``limit``: one article per paragraph (new titles only).
+    3. If still nothing: one article per source URL.
+    """
+    articles: List[Dict[str, Any]] = []
+    line_parser = NewsLineParser()
+    for line in content.split('\n'):
+        article = line_parser.feed(line)
+        if article:
+            articles.append(article)
+    article = line_parser.finish()
+    if article:
+        articles.append(article)
+
+    paragraphs = None
+    if not articles or len(articles) < limit:
+        paragraphs = [p.strip() for p in content.split('\n\n') if p.strip()]
+        seen_titles = {a['title'] for a in articles}
+        for para in paragraphs[:limit]:
+            article = _paragraph_article(para)
+            if article['title'] not in seen_titles:
+                seen_titles.add(article['title'])
+                articles.append(article)
+
+    if not articles and sources:
+        if paragraphs is None:
+            paragraphs = [p.strip() for p in content.split('\n\n') if p.strip()]
+        for i, source in enumerate(sources[:limit]):
+            chunk = paragraphs[i] if i < len(paragraphs) else content[:200]
+            chunk_lines = chunk.split('\n')
+            title = strip_markdown(chunk_lines[0].strip()[:100])
+            summary = ' '.join(chunk_lines[1:]) if len(chunk_lines) > 1 else chunk
+            articles.append({
+                "title": title if title else f"Berita {i+1}",
+                "summary": summary[:300] + "..." if len(summary) > 300 else summary,
+                "source_url": source if isinstance(source, str) else source.get('url', '') if isinstance(source, dict) else ''
+            })
+
+    articles = articles[:limit]
+    for article in articles:
+        complete_article(article)
+    return articles
@@ -0,0 +1,193 @@
+"""
+Persistent TTL cache for Perplexity responses with stale-while-revalidate.
+Fresh entries are served directly; stale ones are served immediately while a
+background task refreshes them; entries past the stale window are refetched.
+"""
+
+import asyncio
+import json
+import re
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+from app.config import (
+    PERPLEXITY_CACHE_ENABLED,
+    PERPLEXITY_CACHE_COMPANY_TTL,
+    PERPLEXITY_CACHE_NEWS_TTL,
+    PERPLEXITY_CACHE_STALE_FACTOR,
+)
+from app.database import SessionLocal
+from app.models.perplexity_cache import PerplexityCacheEntry
+from app.utils.exceptions import PerplexityUnavailableError
+from app.utils.logger import logger
+
+# Legal-form tokens that do not change which company is meant
+_LEGAL_FORMS = {"pt", "cv", "ud", "tbk", "persero"}
+_NON_WORD = re.compile(r"[^\w\s]")
+
+
+def normalize_company_name(name: str) -> str:
+    """'PT. Bank Mandiri (Persero) Tbk' -> 'bank mandiri'."""
+    words = _NON_WORD.sub(" ", name.lower()).split()
+    core = [w for w in words if w not in _LEGAL_FORMS]
+    return " ".join(core or words)
+
+
+class PerplexityResponseCache:
+    """SQLite-backed response cache with per-query-type TTLs and single-flight fetches."""
+
+    def __init__(
+        self,
+        ttls: Dict[str, float],
+        stale_factor: float = 4.0,
+        session_factory=SessionLocal
+    ):
+        self.ttls = ttls
+        self.stale_factor = max(1.0, stale_factor)
+        self._session_factory = session_factory
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._refreshes: Set[asyncio.Task] = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refresh_failures = 0
+
+    @staticmethod
+    def make_key(query_type: str, company_name: str, **params: Any) -> str:
+        suffix = "".join(f":{name}={value}" for name, value in sorted(params.items()))
+        return f"{query_type}:{normalize_company_name(company_name)}{suffix}"
+
+    async def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return {"response", "age_seconds"} for a stored entry, whatever its age."""
+        entry = await asyncio.to_thread(self._load, key)
+        if entry is None:
+            return None
+        response_json, fetched_at = entry
+        return {
+            "response": json.loads(response_json),
+            "age_seconds": (datetime.utcnow() - fetched_at).total_seconds()
+        }
+
+    async def get_or_fetch(
+        self,
+        query_type: str,
+        company_name: str,
+        fetch: Callable[[], Awaitable[Dict[str, Any]]],
+        refresh: Optional[Callable[[], Awaitable[Dict[str, Any]]]] = None,
+        **params: Any
+    ) -> Dict[str, Any]:
+        """
+        Serve ``query_type`` for ``company_name`` from the cache, calling
+        ``fetch`` on a miss and refreshing in the background when stale
+        (with ``refresh`` when given, else ``fetch``: a background refresh
+        has no caller waiting on per-request side effects).
+        The result carries a "cache" entry: {"status": hit|stale|miss|expired,
+        "age_seconds"}; "expired" entries are only served while Perplexity is
+        unavailable (quota exhausted or circuit open).
+        """
+        key = self.make_key(query_type, company_name, **params)
+        ttl = self.ttls[query_type]
+        cached = await self.lookup(key)
+
+        if cached is not None and cached["age_seconds"] < ttl:
+            self.hits += 1
+            return self._annotate(cached["response"], "hit", cached["age_seconds"])
+
+        if cached is not None and cached["age_seconds"] < ttl * self.stale_factor:
+            self.stale_hits += 1
+            if key not in self._inflight:
+                task = self._start_fetch(key, query_type, company_name, refresh or fetch)
+                self._refreshes.add(task)
+                task.add_done_callback(self._finish_refresh)
+            return self._annotate(cached["response"], "stale", cached["age_seconds"])
+
+        self.misses += 1
+        # Concurrent misses for the same key share one upstream call
+        task = self._inflight.get(key) or self._start_fetch(key, query_type, company_name, fetch)
+        try:
+            response = await asyncio.shield(task)
+        except PerplexityUnavailableError as e:
+            if cached is None:
+                raise
+            # Out of quota or circuit open: an expired answer beats no answer
+            self.stale_hits += 1
+            logger.warning(f"{str(e)}; menyajikan cache kedaluwarsa untuk {key}")
+            return self._annotate(cached["response"], "expired", cached["age_seconds"])
+        return self._annotate(response, "miss", 0.0)
+
+    def _start_fetch(self, key: str, query_type: str, company_name: str, fetch) -> asyncio.Task:
+        async def run():
+            try:
+                response = await fetch()
+                await asyncio.to_thread(self._store, key, query_type, company_name, response)
+                return response
+            finally:
+                self._inflight.pop(key, None)
+
+        task = asyncio.get_running_loop().create_task(run())
+        self._inflight[key] = task
+        return task
+
+    def _finish_refresh(self, task: asyncio.Task) -> None:
+        self._refreshes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.refresh_failures += 1
+            logger.warning(f"Gagal memperbarui cache Perplexity di latar belakang: {str(task.exception())}")
+
+    @staticmethod
+    def _annotate(response: Dict[str, Any], status: str, age_seconds: float) -> Dict[str, Any]:
+        return {**response, "cache": {"status": status, "age_seconds": round(age_seconds, 1)}}
+
+    def _load(self, key: str):
+        db = self._session_factory()
+        try:
+            row = db.get(PerplexityCacheEntry, key)
+            return (row.response_json, row.fetched_at) if row is not None else None
+        except Exception as e:
+            # The cache must never fail an analysis
+            logger.warning(f"Gagal membaca cache Perplexity: {str(e)}")
+            return None
+        finally:
+            db.close()
+
+    def _store(self, key: str, query_type: str, company_name: str, response: Dict[str, Any]) -> None:
+        response = {k: v for k, v in response.items() if k != "cache"}
+        db = self._session_factory()
+        try:
+            db.merge(PerplexityCacheEntry(
+                cache_key=key,
+                query_type=query_type,
+                company_name=normalize_company_name(company_name),
+                response_json=json.dumps(response, ensure_ascii=False),
+                fetched_at=datetime.utcnow()
+            ))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Gagal menyimpan cache Perplexity: {str(e)}")
+        finally:
+            db.close()
+
+    async def close(self) -> None:
+        """Cancel background refreshes (called on application shutdown)."""
+        for task in list(self._refreshes):
+            task.cancel()
+        self._refreshes.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 3) if lookups else 0.0,
+            "refreshing": len(self._refreshes),
+            "refresh_failures": self.refresh_failures,
+            "ttl_seconds": self.ttls
+        }
+
+
+perplexity_cache: Optional[PerplexityResponseCache] = PerplexityResponseCache(
+    # Combined profile + news replies expire with their news part
+    ttls={"company": PERPLEXITY_CACHE_COMPANY_TTL, "news": PERPLEXITY_CACHE_NEWS_TTL, "combined": PERPLEXITY_CACHE_NEWS_TTL},
+    stale_factor=PERPLEXITY_CACHE_STALE_FACTOR
+) if PERPLEXITY_CACHE_ENABLED else None
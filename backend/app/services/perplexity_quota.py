@@ -0,0 +1,167 @@
+"""
+Quota manager for Perplexity API calls.
+Combines a daily budget persisted in SQLite, a per-second token bucket and a
+bounded wait queue. Callers that cannot be served soon are rejected at once
+with PerplexityQuotaExceededError instead of waiting on an upstream timeout.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, Dict
+from app.config import (
+    PERPLEXITY_MAX_REQUESTS_PER_DAY,
+    PERPLEXITY_RATE_PER_SECOND,
+    PERPLEXITY_BURST,
+    PERPLEXITY_MAX_WAITERS,
+    PERPLEXITY_MAX_QUEUE_WAIT,
+)
+from app.database import SessionLocal
+from app.models.perplexity_usage import PerplexityUsage
+from app.utils.exceptions import PerplexityQuotaExceededError
+from app.utils.logger import logger
+from app.utils.rate_limit import TokenBucket
+
+
+def _utc_day() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+class PerplexityQuotaManager:
+    """Admission control in front of every Perplexity request."""
+
+    def __init__(
+        self,
+        max_per_day: int = 100,
+        rate_per_second: float = 1.0,
+        burst: float = 2.0,
+        max_waiters: int = 20,
+        max_wait: float = 10.0,
+        session_factory=SessionLocal
+    ):
+        self.max_per_day = max_per_day  # <= 0 disables the daily budget
+        self.max_waiters = max_waiters
+        self.max_wait = max_wait
+        self._bucket = TokenBucket(rate_per_second, burst) if rate_per_second > 0 else None
+        self._session_factory = session_factory
+        self._lock = asyncio.Lock()
+        self._waiting = 0
+        # Last known count, so an exhausted budget is rejected without a DB round trip
+        self._day = _utc_day()
+        self._used = 0
+        self._loaded = False
+        self.rejected_budget = 0
+        self.rejected_queue = 0
+
+    async def acquire(self) -> None:
+        """Admit one request or raise PerplexityQuotaExceededError."""
+        day = _utc_day()
+        if day != self._day:
+            self._day, self._used, self._loaded = day, 0, False
+        if not self._loaded:
+            self._used = await asyncio.to_thread(self._load_count, day)
+            self._loaded = True
+        if self._budget_exhausted():
+            self._reject_budget()
+
+        if self._waiting >= self.max_waiters:
+            self.rejected_queue += 1
+            raise PerplexityQuotaExceededError(
+                f"Antrean permintaan Perplexity penuh ({self.max_waiters} menunggu)"
+            )
+
+        self._waiting += 1
+        try:
+            if self._bucket is not None and not await self._bucket.acquire(max_wait=self.max_wait):
+                self.rejected_queue += 1
+                raise PerplexityQuotaExceededError(
+                    f"Batas laju Perplexity tercapai, antrean lebih dari {self.max_wait:g} detik"
+                )
+            if self.max_per_day > 0:
+                # Serialized per process; the conditional UPDATE keeps it exact across processes
+                async with self._lock:
+                    reserved, used = await asyncio.to_thread(self._reserve, day)
+                self._used = used
+                if not reserved:
+                    self._reject_budget()
+        finally:
+            self._waiting -= 1
+
+    def _budget_exhausted(self) -> bool:
+        return self.max_per_day > 0 and self._used >= self.max_per_day
+
+    def _reject_budget(self) -> None:
+        self.rejected_budget += 1
+        raise PerplexityQuotaExceededError(
+            f"Kuota harian Perplexity habis ({self.max_per_day} permintaan per hari)"
+        )
+
+    def _load_count(self, day: str) -> int:
+        db = self._session_factory()
+        try:
+            row = db.get(PerplexityUsage, day)
+            return row.request_count if row is not None else 0
+        except Exception as e:
+            logger.warning(f"Gagal membaca pemakaian kuota Perplexity: {str(e)}")
+            return self._used
+        finally:
+            db.close()
+
+    def _reserve(self, day: str):
+        """Count one request against ``day``. Returns (reserved, count after)."""
+        db = self._session_factory()
+        now = datetime.now(timezone.utc)
+        try:
+            for _ in range(2):
+                updated = db.query(PerplexityUsage).filter(
+                    PerplexityUsage.day == day,
+                    PerplexityUsage.request_count < self.max_per_day
+                ).update(
+                    {
+                        PerplexityUsage.request_count: PerplexityUsage.request_count + 1,
+                        PerplexityUsage.updated_at: now
+                    },
+                    synchronize_session=False
+                )
+                if updated:
+                    db.commit()
+                    return True, db.get(PerplexityUsage, day).request_count
+                if db.get(PerplexityUsage, day) is not None:
+                    db.rollback()
+                    return False, self.max_per_day
+                try:
+                    db.add(PerplexityUsage(day=day, request_count=1, updated_at=now))
+                    db.commit()
+                    return True, 1
+                except Exception:
+                    # Another process created today's row first; retry the UPDATE
+                    db.rollback()
+            return False, self.max_per_day
+        except Exception as e:
+            # Never block analyses on a broken usage table; count in memory instead
+            db.rollback()
+            logger.warning(f"Gagal mencatat pemakaian kuota Perplexity: {str(e)}")
+            reserved = self._used < self.max_per_day
+            return reserved, self._used + reserved
+        finally:
+            db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "day": self._day,
+            "used": self._used if self._loaded else None,
+            "limit": self.max_per_day if self.max_per_day > 0 else None,
+            "remaining": max(0, self.max_per_day - self._used) if self._loaded and self.max_per_day > 0 else None,
+            "waiting": self._waiting,
+            "rate_per_second": self._bucket.rate if self._bucket is not None else None,
+            "rejected_budget": self.rejected_budget,
+            "rejected_queue": self.rejected_queue
+        }
+
+
+perplexity_quota = PerplexityQuotaManager(
+    max_per_day=PERPLEXITY_MAX_REQUESTS_PER_DAY,
+    rate_per_second=PERPLEXITY_RATE_PER_SECOND,
+    burst=PERPLEXITY_BURST,
+    max_waiters=PERPLEXITY_MAX_WAITERS,
+    max_wait=PERPLEXITY_MAX_QUEUE_WAIT
+)
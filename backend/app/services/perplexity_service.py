@@ -3,26 +3,149 @@ Perplexity API service for company information retrieval.
 Optimized for Indonesian companies with Bahasa Indonesia queries.
 """
 
-import os
+import json
 import re
-from typing import Dict, Any
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import httpx
-from app.config import PERPLEXITY_API_KEY
+from app.config import (
+    PERPLEXITY_API_KEY,
+    PERPLEXITY_STREAM_NEWS,
+    PERPLEXITY_RETRY_ATTEMPTS,
+    PERPLEXITY_RETRY_BASE_DELAY,
+    PERPLEXITY_RETRY_MAX_DELAY,
+    PERPLEXITY_RETRY_BUDGET,
+    PERPLEXITY_HEDGE_ENABLED,
+    PERPLEXITY_HEDGE_MIN_DELAY,
+    PERPLEXITY_BREAKER_FAILURES,
+    PERPLEXITY_BREAKER_RESET,
+)
+from app.services.http_client import http_client
+from app.services.news_parser import NewsLineParser, complete_article, parse_news_articles, strip_markdown
+from app.services.perplexity_cache import perplexity_cache
+from app.services.perplexity_quota import perplexity_quota
+from app.services.resilience import CircuitBreaker, ResilientCaller
+from app.utils.exceptions import PerplexityQuotaExceededError, PerplexityUnavailableError
+from app.utils.logger import logger
+
+
+# Retries, hedging and circuit breaker shared by every PerplexityService instance
+perplexity_upstream = ResilientCaller(
+    "Perplexity",
+    max_attempts=PERPLEXITY_RETRY_ATTEMPTS,
+    base_delay=PERPLEXITY_RETRY_BASE_DELAY,
+    max_delay=PERPLEXITY_RETRY_MAX_DELAY,
+    retry_budget=PERPLEXITY_RETRY_BUDGET,
+    hedge=PERPLEXITY_HEDGE_ENABLED,
+    hedge_min_delay=PERPLEXITY_HEDGE_MIN_DELAY,
+    breaker=CircuitBreaker(PERPLEXITY_BREAKER_FAILURES, PERPLEXITY_BREAKER_RESET),
+    ignore=(PerplexityQuotaExceededError,),
+    # Every upstream request (retries and hedges too) is admitted by the quota first
+    admit=perplexity_quota.acquire
+)
 
 
 class PerplexityService:
-    """Service for querying Perplexity API with Indonesian company focus."""
+    """
+    Service for querying Perplexity API with Indonesian company focus.
+    Instances are cheap: requests go through the process-wide pooled client.
+    """
     
     BASE_URL = "https://api.perplexity.ai"
     MODEL = "sonar"  # Online model for current info
     
-    def __init__(self):
+    # Structured output for the combined profile + news query
+    COMBINED_SCHEMA = {
+        "type": "object",
+        "properties": {
+            "profile": {"type": "string"},
+            "articles": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "title": {"type": "string"},
+                        "summary": {"type": "string"},
+                        "url": {"type": "string"},
+                        "date": {"type": ["string", "null"]}
+                    },
+                    "required": ["title", "summary", "url"]
+                }
+            }
+        },
+        "required": ["profile", "articles"]
+    }
+    
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
         self.api_key = PERPLEXITY_API_KEY
         if not self.api_key:
             raise ValueError("PERPLEXITY_API_KEY required")
+        self._client = client
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared keep-alive client (or the one injected in the constructor)."""
+        return self._client or http_client.get()
     
     async def search_company(self, company_name: str) -> Dict[str, Any]:
+        """
+        Company information, served from the response cache when available.
+        See ``_fetch_company`` for the result shape; cached results add a
+        "cache" entry ({"status": hit|stale|miss|expired, "age_seconds"}).
+        """
+        if perplexity_cache is None:
+            return await self._fetch_company(company_name)
+        return await perplexity_cache.get_or_fetch(
+            "company", company_name, lambda: self._fetch_company(company_name)
+        )
+    
+    async def search_latest_news(
+        self,
+        company_name: str,
+        limit: int = 10,
+        on_article: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Latest news about a company, served from the response cache when available.
+        See ``_fetch_latest_news`` for the result shape.
+        
+        With PERPLEXITY_STREAM_NEWS and ``on_article``, an upstream fetch is
+        streamed and ``on_article`` is called with each article as soon as it
+        is complete (in result order); cached results and background refreshes
+        do not call it.
+        """
+        refresh = lambda: self._fetch_latest_news(company_name, limit)
+        if PERPLEXITY_STREAM_NEWS and on_article is not None:
+            fetch = lambda: self._fetch_latest_news_stream(company_name, limit, on_article)
+        else:
+            fetch = refresh
+        if perplexity_cache is None:
+            return await fetch()
+        # Stale entries are refreshed in the background without streaming:
+        # nobody is waiting on those articles, so they must not be early-scored
+        result = await perplexity_cache.get_or_fetch("news", company_name, fetch, refresh=refresh, limit=limit)
+        # The cache key is normalized; echo the name as the caller wrote it
+        return {**result, "company_name": company_name}
+    
+    async def search_company_and_news(self, company_name: str, limit: int = 10) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Company information and latest news from one structured call.
+        Returns (company result, news result) in the shapes of
+        ``search_company`` and ``search_latest_news``.
+        """
+        if perplexity_cache is None:
+            combined = await self._fetch_company_and_news(company_name, limit)
+        else:
+            combined = await perplexity_cache.get_or_fetch(
+                "combined", company_name, lambda: self._fetch_company_and_news(company_name, limit), limit=limit
+            )
+        company = dict(combined["company"])
+        news = {**combined["news"], "company_name": company_name}
+        if "cache" in combined:
+            company["cache"] = news["cache"] = combined["cache"]
+        return company, news
+    
+    async def _fetch_company(self, company_name: str) -> Dict[str, Any]:
         """
         Search Perplexity API for company information.
         Query optimized for Indonesian companies with Bahasa Indonesia.
@@ -47,51 +170,8 @@ class PerplexityService:
         """
         
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    f"{self.BASE_URL}/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": self.MODEL,
-                        "messages": [{"role": "user", "content": query}],
-                        "max_tokens": 2000,
-                        "temperature": 0.2
-                    }
-                )
-            
-            response.raise_for_status()
-            result = response.json()
-            
-            content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
-            
-            # Extract all possible sources from Perplexity response
-            sources = []
-            
-            # Get citations (list of URLs)
-            citations = result.get("citations", [])
-            if citations:
-                sources.extend([url if isinstance(url, str) else url.get('url', '') if isinstance(url, dict) else '' for url in citations])
-            
-            # Get search_results (may contain more detailed info)
-            search_results = result.get("search_results", [])
-            if search_results:
-                for result_item in search_results:
-                    if isinstance(result_item, dict):
-                        url = result_item.get('url', '')
-                        if url and url not in sources:
-                            sources.append(url)
-                    elif isinstance(result_item, str) and result_item not in sources:
-                        sources.append(result_item)
-            
-            # Also extract URLs from the content itself (in case citations are missing)
-            url_pattern = r'http[s]?://[^\s\)]+'
-            content_urls = re.findall(url_pattern, content)
-            for url in content_urls:
-                if url not in sources:
-                    sources.append(url)
+            result, content = await self._chat_completion(query, max_tokens=2000)
+            sources = self._extract_sources(result, content)
             
             return {
                 "raw_response": result,
@@ -100,12 +180,14 @@ class PerplexityService:
                 "query": company_name,
                 "timestamp": datetime.now().isoformat()
             }
+        except PerplexityUnavailableError:
+            raise
         except httpx.HTTPStatusError as e:
             raise Exception(f"Error API Perplexity: {e.response.status_code} - {str(e)}")
         except Exception as e:
             raise Exception(f"Error API Perplexity: {str(e)}")
     
-    async def search_latest_news(self, company_name: str, limit: int = 10) -> Dict[str, Any]:
+    async def _fetch_latest_news(self, company_name: str, limit: int = 10) -> Dict[str, Any]:
         """
         Search for latest news articles about a company using Perplexity API.
         
@@ -128,59 +210,11 @@ class PerplexityService:
               "timestamp": str
             }
         """
-        query = f"""
-        Cari 10 berita terbaru tentang "{company_name}" Indonesia.
-        Berikan judul, ringkasan singkat, dan URL sumber untuk setiap berita.
-        Fokus pada berita yang relevan dengan penilaian kredit dan reputasi perusahaan.
-        Format: Judul | Ringkasan | URL
-        """
+        query = self._news_query(company_name)
         
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    f"{self.BASE_URL}/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": self.MODEL,
-                        "messages": [{"role": "user", "content": query}],
-                        "max_tokens": 4000,
-                        "temperature": 0.2
-                    }
-                )
-            
-            response.raise_for_status()
-            result = response.json()
-            
-            content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
-            
-            # Extract all possible sources from Perplexity response
-            sources = []
-            
-            # Get citations (list of URLs)
-            citations = result.get("citations", [])
-            if citations:
-                sources.extend([url if isinstance(url, str) else url.get('url', '') if isinstance(url, dict) else '' for url in citations])
-            
-            # Get search_results (may contain more detailed info)
-            search_results = result.get("search_results", [])
-            if search_results:
-                for result_item in search_results:
-                    if isinstance(result_item, dict):
-                        url = result_item.get('url', '')
-                        if url and url not in sources:
-                            sources.append(url)
-                    elif isinstance(result_item, str) and result_item not in sources:
-                        sources.append(result_item)
-            
-            # Also extract URLs from the content itself
-            url_pattern = r'http[s]?://[^\s\)]+'
-            content_urls = re.findall(url_pattern, content)
-            for url in content_urls:
-                if url not in sources:
-                    sources.append(url)
+            result, content = await self._chat_completion(query, max_tokens=4000)
+            sources = self._extract_sources(result, content)
             
             # Parse news articles from the response
             news_articles = self._parse_news_articles(content, sources, limit)
@@ -193,195 +227,299 @@ class PerplexityService:
                 "raw_response": content,
                 "sources": sources  # Include all sources found
             }
+        except PerplexityUnavailableError:
+            raise
         except httpx.HTTPStatusError as e:
             raise Exception(f"Error API Perplexity: {e.response.status_code} - {str(e)}")
         except Exception as e:
             raise Exception(f"Error API Perplexity: {str(e)}")
     
-    def _parse_news_articles(self, content: str, sources: list, limit: int) -> list:
+    async def _fetch_latest_news_stream(
+        self,
+        company_name: str,
+        limit: int,
+        on_article: Callable[[Dict[str, Any]], None]
+    ) -> Dict[str, Any]:
         """
-        Parse news articles from Perplexity response.
-        Attempts to extract structured news data from the text response.
-        Handles various response formats from Perplexity.
+        Streaming variant of ``_fetch_latest_news`` with the same result.
+        Completed lines are fed to the line parser while the answer is still
+        being generated; the final list comes from the full parse, and articles
+        not emitted during the stream are emitted after it.
         """
-        articles = []
+        line_parser = NewsLineParser()
+        emitted: List[Dict[str, Any]] = []
         
-        # Strategy 1: Try to split by numbered list or bullet points
-        lines = content.split('\n')
-        current_article = {}
+        def emit(article: Optional[Dict[str, Any]]) -> None:
+            # Articles past ``limit`` are cut by the full parse; don't score them
+            if article is not None and len(emitted) < limit:
+                article = complete_article(dict(article))
+                emitted.append(article)
+                on_article(article)
         
-        for line in lines:
-            line = line.strip()
-            if not line:
-                # Empty line might indicate article separator
-                if current_article and current_article.get('title'):
-                    articles.append(current_article)
-                    current_article = {}
-                continue
-            
-            # Check if line starts with a number (1., 2., etc.) or bullet
-            numbered_match = re.match(r'^(\d+)[\.\)]\s+(.+)', line)
-            bullet_match = re.match(r'^[-•*]\s+(.+)', line)
-            
-            if numbered_match or bullet_match:
-                # Save previous article if exists
-                if current_article and current_article.get('title'):
-                    articles.append(current_article)
-                    current_article = {}
-                
-                # Extract title
-                if numbered_match:
-                    title = numbered_match.group(2)
-                else:
-                    title = bullet_match.group(1)
-                
-                # Strip markdown formatting from title
-                title = self._strip_markdown(title.strip())
-                current_article['title'] = title
-                continue
+        try:
+            result, content = await self._chat_completion_stream(
+                self._news_query(company_name),
+                max_tokens=4000,
+                on_line=lambda line: emit(line_parser.feed(line))
+            )
+            emit(line_parser.finish())
+            sources = self._extract_sources(result, content)
+            news_articles = self._parse_news_articles(content, sources, limit)
             
-            # Check for URL pattern (might be on same line or separate)
-            url_match = re.search(r'http[s]?://[^\s\)]+', line)
-            if url_match:
-                current_article['source_url'] = url_match.group(0)
-                # Remove URL from line for summary
-                line = re.sub(r'http[s]?://[^\s\)]+', '', line).strip()
+            if news_articles[:len(emitted)] != emitted:
+                logger.warning(f"Hasil parsing stream berita {company_name} berbeda dari parsing penuh")
+            for article in news_articles[len(emitted):]:
+                on_article(article)
             
-            # If we have a title, accumulate summary text
-            if current_article.get('title'):
-                # Skip if line is too similar to title (avoid duplication)
-                title_lower = current_article['title'].lower()
-                line_lower = line.lower()
-                
-                # Skip if line is very similar to title (more than 80% match)
-                if line_lower and title_lower:
-                    words_in_title = set(title_lower.split())
-                    words_in_line = set(line_lower.split())
-                    if len(words_in_line) > 0:
-                        similarity = len(words_in_title.intersection(words_in_line)) / len(words_in_line)
-                        if similarity > 0.8:
-                            continue  # Skip this line as it's too similar to title
-                
-                if 'summary' not in current_article:
-                    current_article['summary'] = line
-                else:
-                    # Add to summary if not duplicate and not too similar to title
-                    if line and line not in current_article['summary'] and line_lower != title_lower:
-                        current_article['summary'] += ' ' + line
+            return {
+                "company_name": company_name,
+                "news_articles": news_articles,
+                "total_found": len(news_articles),
+                "timestamp": datetime.now().isoformat(),
+                "raw_response": content,
+                "sources": sources
+            }
+        except PerplexityUnavailableError:
+            raise
+        except httpx.HTTPStatusError as e:
+            raise Exception(f"Error API Perplexity: {e.response.status_code} - {str(e)}")
+        except Exception as e:
+            raise Exception(f"Error API Perplexity: {str(e)}")
+    
+    async def _fetch_company_and_news(self, company_name: str, limit: int = 10) -> Dict[str, Any]:
+        """
+        Ask for the company profile and the latest news in one JSON-schema call.
+        The reply is decoded strictly; the regex news parser is only used when
+        the model did not return valid JSON.
         
-        # Add last article
-        if current_article and current_article.get('title'):
-            articles.append(current_article)
+        Returns:
+            {"company": <search_company result>, "news": <search_latest_news result>}
+        """
+        query = f"""
+        Cari informasi tentang "{company_name}" Indonesia untuk penilaian kredit.
+        1. profile: latar belakang, berita, reputasi, operasi, kontroversi.
+        2. articles: {limit} berita terbaru yang relevan dengan penilaian kredit dan
+           reputasi perusahaan, masing-masing dengan judul, ringkasan singkat, URL
+           sumber, dan tanggal (jika ada).
+        Jawab dalam Bahasa Indonesia sebagai JSON sesuai skema.
+        """
         
-        # Strategy 2: If parsing failed, try to split by paragraphs and use sources
-        if not articles or len(articles) < limit:
-            # Split content into paragraphs
-            paragraphs = [p.strip() for p in content.split('\n\n') if p.strip()]
+        try:
+            result, content = await self._chat_completion(
+                query,
+                max_tokens=5000,
+                response_format={"type": "json_schema", "json_schema": {"schema": self.COMBINED_SCHEMA}}
+            )
+            sources = self._extract_sources(result, content)
+            timestamp = datetime.now().isoformat()
             
-            # Match paragraphs with sources
-            for i, para in enumerate(paragraphs[:limit]):
-                if not para:
-                    continue
-                
-                # Extract URL from paragraph if exists
-                url_match = re.search(r'http[s]?://[^\s\)]+', para)
-                source_url = url_match.group(0) if url_match else ''
-                
-                # Remove URL from paragraph
-                para_clean = re.sub(r'http[s]?://[^\s\)]+', '', para).strip()
-                
-                # Extract title (first sentence or first line)
-                lines_in_para = para_clean.split('\n')
-                title = lines_in_para[0].strip()[:100]  # Limit title length
-                
-                # Strip markdown from title
-                title = self._strip_markdown(title)
-                
-                # Get summary from remaining lines, but ensure it's different from title
-                if len(lines_in_para) > 1:
-                    summary = ' '.join(lines_in_para[1:])
-                else:
-                    # If only one line, try to extract a summary by removing title-like parts
-                    summary = para_clean
-                    # Remove title if it appears in summary
-                    if title.lower() in summary.lower():
-                        summary = summary.replace(title, '', 1).strip()
-                
-                # Strip markdown from summary too
-                summary = self._strip_markdown(summary)
-                
-                # If summary is too similar to title or empty, create a generic summary
-                if not summary or summary.lower() == title.lower() or len(summary) < 20:
-                    summary = "Ringkasan artikel tidak tersedia."
-                
-                # If we don't have this article yet, add it
-                if not any(a.get('title', '') == title for a in articles):
-                    articles.append({
-                        "title": title,
-                        "summary": summary[:300] if len(summary) > 300 else summary,
-                        "source_url": source_url
-                    })
-        
-        # Strategy 3: If still no articles, create from sources
-        if not articles and sources:
-            # Split content into chunks
-            content_chunks = [c.strip() for c in content.split('\n\n') if c.strip()]
-            for i, source in enumerate(sources[:limit]):
-                chunk = content_chunks[i] if i < len(content_chunks) else content[:200]
-                # Try to extract a better title from chunk
-                chunk_lines = chunk.split('\n')
-                title = self._strip_markdown(chunk_lines[0].strip()[:100]) if chunk_lines else f"Berita {i+1}"
-                summary = ' '.join(chunk_lines[1:]) if len(chunk_lines) > 1 else chunk
-                articles.append({
-                    "title": title if title else f"Berita {i+1}",
-                    "summary": summary[:300] + "..." if len(summary) > 300 else summary,
-                    "source_url": source if isinstance(source, str) else source.get('url', '') if isinstance(source, dict) else ''
-                })
-        
-        # Limit results
-        articles = articles[:limit]
+            parsed = self._parse_combined(content, limit)
+            if parsed is not None:
+                profile_text, news_articles = parsed
+                parse_mode = "json"
+            else:
+                profile_text = content
+                news_articles = self._parse_news_articles(content, sources, limit)
+                parse_mode = "fallback"
+            
+            return {
+                "company": {
+                    "raw_response": result,
+                    "extracted_text": profile_text,
+                    "sources": sources,
+                    "query": company_name,
+                    "timestamp": timestamp
+                },
+                "news": {
+                    "company_name": company_name,
+                    "news_articles": news_articles,
+                    "total_found": len(news_articles),
+                    "timestamp": timestamp,
+                    "raw_response": content,
+                    "sources": sources,
+                    "parse_mode": parse_mode
+                }
+            }
+        except PerplexityUnavailableError:
+            raise
+        except httpx.HTTPStatusError as e:
+            raise Exception(f"Error API Perplexity: {e.response.status_code} - {str(e)}")
+        except Exception as e:
+            raise Exception(f"Error API Perplexity: {str(e)}")
+    
+    @staticmethod
+    def _news_query(company_name: str) -> str:
+        return f"""
+        Cari 10 berita terbaru tentang "{company_name}" Indonesia.
+        Berikan judul, ringkasan singkat, dan URL sumber untuk setiap berita.
+        Fokus pada berita yang relevan dengan penilaian kredit dan reputasi perusahaan.
+        Format: Judul | Ringkasan | URL
+        """
+    
+    def _request(self, query: str, max_tokens: int, **options: Any) -> Dict[str, Any]:
+        """Keyword arguments for one chat-completions request."""
+        return {
+            "url": f"{self.BASE_URL}/chat/completions",
+            "headers": {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            },
+            "json": {
+                "model": self.MODEL,
+                "messages": [{"role": "user", "content": query}],
+                "max_tokens": max_tokens,
+                "temperature": 0.2,
+                **options
+            }
+        }
+    
+    async def _chat_completion(
+        self,
+        query: str,
+        max_tokens: int,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Dict[str, Any], str]:
+        """POST one chat completion on the pooled client. Returns (raw result, message content)."""
+        options = {"response_format": response_format} if response_format is not None else {}
         
-        # Ensure all articles have required fields
-        for article in articles:
-            if 'source_url' not in article:
-                article['source_url'] = ''
-            if 'summary' not in article or not article['summary']:
-                article['summary'] = article.get('title', 'Tidak ada ringkasan')
-            if 'title' not in article or not article['title']:
-                article['title'] = 'Tidak ada judul'
+        async def attempt() -> Dict[str, Any]:
+            response = await self.client.post(**self._request(query, max_tokens, **options))
+            response.raise_for_status()
+            return response.json()
         
-        return articles
+        result = await perplexity_upstream.call(attempt)
+        content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
+        return result, content
     
-    def _strip_markdown(self, text: str) -> str:
+    async def _chat_completion_stream(
+        self,
+        query: str,
+        max_tokens: int,
+        on_line: Callable[[str], None]
+    ) -> Tuple[Dict[str, Any], str]:
         """
-        Strip markdown formatting from text.
-        Removes **bold**, *italic*, __bold__, _italic_, and other markdown syntax.
+        Streamed chat completion (server-sent events). ``on_line`` receives
+        each complete line of the answer as it arrives. Returns the same
+        (raw result, message content) as ``_chat_completion``.
         """
-        if not text:
-            return text
+        delivered = False
         
-        # Remove markdown bold (**text** or __text__)
-        text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)
-        text = re.sub(r'__(.+?)__', r'\1', text)
+        async def attempt() -> Tuple[Dict[str, Any], List[str], str]:
+            nonlocal delivered
+            parts: List[str] = []
+            pending = ""
+            result: Dict[str, Any] = {}
+            try:
+                async with self.client.stream("POST", **self._request(query, max_tokens, stream=True)) as response:
+                    response.raise_for_status()
+                    async for event in response.aiter_lines():
+                        if not event.startswith("data:"):
+                            continue
+                        data = event[len("data:"):].strip()
+                        if data == "[DONE]":
+                            break
+                        chunk = json.loads(data)
+                        # Citations and search results ride along on the chunks; keep the latest
+                        result.update({k: v for k, v in chunk.items() if k != "choices"})
+                        delta = (chunk.get("choices") or [{}])[0].get("delta", {}).get("content") or ""
+                        if not delta:
+                            continue
+                        parts.append(delta)
+                        *lines, pending = (pending + delta).split("\n")
+                        for line in lines:
+                            delivered = True
+                            on_line(line)
+            except (httpx.HTTPError, ValueError) as e:
+                if delivered:
+                    # Lines already went to the caller; a retry would repeat them
+                    raise Exception(f"Stream terputus: {str(e)}") from e
+                raise
+            return result, parts, pending
         
-        # Remove markdown italic (*text* or _text_)
-        text = re.sub(r'\*(.+?)\*', r'\1', text)
-        text = re.sub(r'_(.+?)_', r'\1', text)
+        # Not hedged: two streams would feed the same parser
+        result, parts, pending = await perplexity_upstream.call(attempt, hedge=False)
+        if pending:
+            on_line(pending)
+        content = "".join(parts)
+        result["choices"] = [{"index": 0, "message": {"role": "assistant", "content": content}}]
+        return result, content
+    
+    def _extract_sources(self, result: Dict[str, Any], content: str) -> List[str]:
+        """Extract all possible sources from a Perplexity response."""
+        sources = []
         
-        # Remove markdown links [text](url)
-        text = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', text)
+        # Get citations (list of URLs)
+        citations = result.get("citations", [])
+        if citations:
+            sources.extend([url if isinstance(url, str) else url.get('url', '') if isinstance(url, dict) else '' for url in citations])
         
-        # Remove markdown headers (# Header)
-        text = re.sub(r'^#+\s+', '', text, flags=re.MULTILINE)
+        # Get search_results (may contain more detailed info)
+        search_results = result.get("search_results", [])
+        if search_results:
+            for result_item in search_results:
+                if isinstance(result_item, dict):
+                    url = result_item.get('url', '')
+                    if url and url not in sources:
+                        sources.append(url)
+                elif isinstance(result_item, str) and result_item not in sources:
+                    sources.append(result_item)
         
-        # Remove markdown code blocks
-        text = re.sub(r'`([^`]+)`', r'\1', text)
-        text = re.sub(r'```[\s\S]*?```', '', text)
+        # Also extract URLs from the content itself (in case citations are missing)
+        url_pattern = r'http[s]?://[^\s\)]+'
+        content_urls = re.findall(url_pattern, content)
+        for url in content_urls:
+            if url not in sources:
+                sources.append(url)
         
-        # Clean up extra spaces
-        text = re.sub(r'\s+', ' ', text).strip()
+        return sources
+    
+    def _parse_combined(self, content: str, limit: int) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Strictly decode a COMBINED_SCHEMA reply into (profile text, articles).
+        Returns None when the content is not valid JSON of that shape.
+        """
+        try:
+            data = json.loads(content)
+        except ValueError:
+            return None
+        if not isinstance(data, dict) or not isinstance(data.get("profile"), str) or not isinstance(data.get("articles"), list):
+            return None
         
-        return text
+        articles = []
+        for item in data["articles"]:
+            if not isinstance(item, dict) or not isinstance(item.get("title"), str):
+                continue
+            title = self._strip_markdown(item["title"])
+            if not title:
+                continue
+            summary = item.get("summary") if isinstance(item.get("summary"), str) else ""
+            url = item.get("url") if isinstance(item.get("url"), str) else ""
+            date = item.get("date") if isinstance(item.get("date"), str) and item.get("date") else None
+            articles.append({
+                "title": title,
+                "summary": self._strip_markdown(summary) or title,
+                "source_url": url.strip(),
+                "date": date
+            })
+            if len(articles) >= limit:
+                break
+        return data["profile"], articles
+    
+    def _parse_news_articles(self, content: str, sources: list, limit: int) -> list:
+        """
+        Parse news articles from Perplexity response.
+        Attempts to extract structured news data from the text response
+        (see ``news_parser.parse_news_articles``).
+        """
+        return parse_news_articles(content, sources, limit)
+    
+    def _strip_markdown(self, text: str) -> str:
+        """Strip markdown formatting from text."""
+        return strip_markdown(text)
+    
+    def article_sentiment_text(self, article: Dict[str, Any]) -> str:
+        """Text scored for a news article: cleaned title and summary."""
+        return self.extract_sentiment_text(f"{article.get('title', '')} {article.get('summary', '')}")
     
     def extract_sentiment_text(self, raw_text: str) -> str:
         """
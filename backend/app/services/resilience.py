@@ -0,0 +1,290 @@
+"""
+Resilience layer for upstream HTTP calls.
+Retries transient failures with jittered exponential backoff (honouring
+Retry-After), optionally hedges slow requests with a duplicate fired after the
+observed p95 latency, and trips a circuit breaker while upstream is unhealthy.
+"""
+
+import asyncio
+import random
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+import httpx
+from app.utils.exceptions import PerplexityUnavailableError
+from app.utils.logger import logger
+
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After as seconds (delta-seconds or HTTP-date), None if absent or invalid."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def classify_http_error(error: BaseException) -> Tuple[bool, Optional[float]]:
+    """(retryable, Retry-After seconds) for an error raised by an httpx call."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        if status in RETRYABLE_STATUS:
+            return True, parse_retry_after(error.response.headers.get("Retry-After"))
+        return False, None
+    # Timeouts, connection resets, protocol errors
+    return isinstance(error, httpx.TransportError), None
+
+
+class LatencyTracker:
+    """Sliding window of successful call latencies."""
+
+    def __init__(self, window: int = 200):
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class CircuitBreaker:
+    """
+    closed → open after ``failure_threshold`` consecutive failures;
+    open → half-open after ``reset_timeout`` seconds, admitting one probe;
+    the probe's outcome closes or re-opens the circuit. A probe that ends
+    without an outcome (cancelled, or an ignored error) must be released.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._probing = False
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = "half_open"
+            self._probing = False
+        if self.state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self._probing = False
+
+    def release(self) -> None:
+        """Free the half-open probe slot without judging upstream health."""
+        if self.state == "half_open":
+            self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.times_opened += 1
+                logger.warning(f"Circuit breaker terbuka setelah {self.failures} kegagalan beruntun")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+            self._probing = False
+
+    def retry_in(self) -> float:
+        return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at)) if self.state == "open" else 0.0
+
+
+class ResilientCaller:
+    """
+    Wraps calls to one upstream. ``call(func)`` awaits ``func()`` (a fresh
+    coroutine per attempt) under the breaker, retry and hedging policies.
+    Errors that are not transient propagate unchanged after the first attempt.
+
+    ``admit`` (e.g. a quota) is awaited before every request, retries and
+    hedges included, once the breaker has let the request through: a
+    short-circuited call consumes no quota, and a rejection by ``admit``
+    releases the half-open probe slot.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        retry_budget: float = 75.0,
+        hedge: bool = False,
+        hedge_min_delay: float = 2.0,
+        hedge_min_samples: int = 20,
+        breaker: Optional[CircuitBreaker] = None,
+        classify: Callable[[BaseException], Tuple[bool, Optional[float]]] = classify_http_error,
+        ignore: Tuple[type, ...] = (),
+        admit: Optional[Callable[[], Awaitable[Any]]] = None
+    ):
+        self.name = name
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_budget = retry_budget
+        self.hedge = hedge
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_min_samples = hedge_min_samples
+        self.breaker = breaker or CircuitBreaker()
+        self.classify = classify
+        self.ignore = ignore  # Errors that say nothing about upstream health (e.g. our own quota)
+        self.admit = admit
+        self.latency = LatencyTracker()
+        self.metrics = {
+            "calls": 0,
+            "attempts": 0,
+            "retries": 0,
+            "failures": 0,
+            "short_circuited": 0,
+            "hedges_fired": 0,
+            "hedges_won": 0
+        }
+
+    async def call(self, func: Callable[[], Awaitable[Any]], hedge: Optional[bool] = None) -> Any:
+        self.metrics["calls"] += 1
+        hedge = self.hedge if hedge is None else hedge
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                self.metrics["short_circuited"] += 1
+                raise PerplexityUnavailableError(
+                    f"{self.name} sedang tidak sehat, dicoba lagi dalam {self.breaker.retry_in():.0f} detik"
+                )
+            if self.admit is not None:
+                try:
+                    await self.admit()
+                except BaseException:
+                    # Nothing went upstream: a claimed half-open probe slot is given back
+                    self.breaker.release()
+                    raise
+            attempt += 1
+            try:
+                return await (self._hedged(func) if hedge else self._attempt(func))
+            except asyncio.CancelledError:
+                raise
+            except self.ignore:
+                raise
+            except Exception as e:
+                retryable, retry_after = self.classify(e)
+                delay = self._backoff(attempt, retry_after)
+                elapsed = time.monotonic() - started
+                if not retryable or attempt >= self.max_attempts or delay is None or elapsed + delay > self.retry_budget:
+                    self.metrics["failures"] += 1
+                    raise
+                self.metrics["retries"] += 1
+                logger.warning(
+                    f"{self.name}: percobaan {attempt} gagal ({type(e).__name__}: {str(e)}), "
+                    f"mencoba lagi dalam {delay:.1f} detik"
+                )
+                await asyncio.sleep(delay)
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> Optional[float]:
+        """Full-jitter exponential backoff; Retry-After is a floor. None: not worth waiting."""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        if retry_after is not None:
+            if retry_after > self.max_delay:
+                return None
+            delay = max(delay, retry_after)
+        return delay
+
+    async def _attempt(self, func: Callable[[], Awaitable[Any]]) -> Any:
+        self.metrics["attempts"] += 1
+        started = time.monotonic()
+        try:
+            result = await func()
+        except (asyncio.CancelledError, *self.ignore):
+            # No verdict on upstream health, but a half-open probe must not stay claimed
+            self.breaker.release()
+            raise
+        except Exception as e:
+            # A rejected request (4xx) says nothing about upstream health
+            if self.classify(e)[0] or not isinstance(e, httpx.HTTPStatusError):
+                self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        self.latency.record(time.monotonic() - started)
+        return result
+
+    def hedge_delay(self) -> Optional[float]:
+        """p95 of recent latencies (floored), or None until enough samples exist."""
+        if len(self.latency) < self.hedge_min_samples:
+            return None
+        return max(self.hedge_min_delay, self.latency.percentile(0.95))
+
+    async def _hedged(self, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run one attempt; if it outlives the p95 delay, race a duplicate against it."""
+        delay = self.hedge_delay()
+        primary = asyncio.ensure_future(self._attempt(func))
+        if delay is None:
+            return await primary
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+
+        if self.admit is not None:
+            try:
+                await self.admit()
+            except asyncio.CancelledError:
+                primary.cancel()
+                raise
+            except Exception as e:
+                # No budget for a duplicate request: keep waiting on the first one
+                logger.debug(f"{self.name}: hedge dibatalkan: {str(e)}")
+                return await primary
+        self.metrics["hedges_fired"] += 1
+        hedge = asyncio.ensure_future(self._attempt(func))
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.metrics["hedges_won"] += 1
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        p50 = self.latency.percentile(0.5)
+        p95 = self.latency.percentile(0.95)
+        return {
+            **self.metrics,
+            "circuit": self.breaker.state,
+            "circuit_opened": self.breaker.times_opened,
+            "latency_p50": round(p50, 3) if p50 is not None else None,
+            "latency_p95": round(p95, 3) if p95 is not None else None,
+            "hedge_enabled": self.hedge
+        }
@@ -0,0 +1,152 @@
+"""
+Inference backends for the sentiment transformer.
+Both backends return pipeline-style predictions ({"label", "score"}) with the
+model's own id2label names, so _transform_label_to_score keeps working as-is.
+"""
+
+import os
+from typing import Dict, List, Optional
+from app.utils.logger import logger
+
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_QUANTIZED_MODEL_FILE = "model.int8.onnx"
+
+
+class TorchPipelineBackend:
+    """Full-precision PyTorch model served through transformers.pipeline."""
+
+    name = "torch"
+
+    def __init__(self, model_name: Optional[str], device: int = -1, model_path: Optional[str] = None):
+        from transformers import pipeline
+
+        if model_path:
+            # Pre-baked artifact: safetensors are memory-mapped, nothing is resolved on the hub
+            self._pipeline = pipeline(
+                "sentiment-analysis",
+                model=model_path,
+                tokenizer=model_path,
+                device=device,
+                model_kwargs={"low_cpu_mem_usage": True, "use_safetensors": True, "local_files_only": True}
+            )
+        elif model_name:
+            self._pipeline = pipeline("sentiment-analysis", model=model_name, device=device)
+        else:
+            self._pipeline = pipeline("sentiment-analysis", device=device)
+        self.model_name = model_name or self._pipeline.model.name_or_path
+        self.tokenizer = self._pipeline.tokenizer
+
+    def predict(self, texts: List[str], batch_size: int = 32) -> List[Dict]:
+        if not texts:
+            return []
+        # Chunks are token-bounded already; truncation is only a safety net
+        return self._pipeline(texts, batch_size=min(len(texts), batch_size), truncation=True)
+
+
+class OnnxBackend:
+    """
+    ONNX Runtime backend for a model exported with export_onnx_model.
+    Optionally serves the int8 dynamically-quantized variant.
+    """
+
+    name = "onnx"
+
+    def __init__(self, model_dir: str, quantized: bool = True, num_threads: int = 0):
+        import numpy as np
+        import onnxruntime as ort
+        from transformers import AutoConfig, AutoTokenizer
+
+        filename = ONNX_QUANTIZED_MODEL_FILE if quantized else ONNX_MODEL_FILE
+        model_path = os.path.join(model_dir, filename)
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"Model ONNX tidak ditemukan: {model_path}")
+
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self._session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self._input_names = {i.name for i in self._session.get_inputs()}
+        self._np = np
+
+        config = AutoConfig.from_pretrained(model_dir)
+        self.id2label = {int(k): v for k, v in config.id2label.items()}
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.model_name = f"{config.name_or_path or model_dir} ({filename})"
+        self.quantized = quantized
+
+    def predict(self, texts: List[str], batch_size: int = 32) -> List[Dict]:
+        np = self._np
+        predictions: List[Dict] = []
+        for start in range(0, len(texts), batch_size):
+            chunk = texts[start:start + batch_size]
+            encoded = self.tokenizer(
+                chunk,
+                padding=True,
+                truncation=True,
+                max_length=min(self.tokenizer.model_max_length, 512),
+                return_tensors="np"
+            )
+            feeds = {name: value.astype(np.int64) for name, value in encoded.items() if name in self._input_names}
+            logits = self._session.run(None, feeds)[0]
+
+            # Same post-processing as the text-classification pipeline: softmax, top-1
+            shifted = logits - logits.max(axis=-1, keepdims=True)
+            probs = np.exp(shifted)
+            probs /= probs.sum(axis=-1, keepdims=True)
+            for row in probs:
+                index = int(row.argmax())
+                predictions.append({"label": self.id2label[index], "score": float(row[index])})
+        return predictions
+
+
+def export_onnx_model(
+    model_name: str,
+    output_dir: str,
+    quantize: bool = True,
+    opset: int = 14,
+    revision: Optional[str] = None
+) -> Dict[str, str]:
+    """
+    Export a Hugging Face sequence-classification model to ONNX and optionally
+    dynamic-quantize it to int8. Tokenizer and config are saved alongside so
+    OnnxBackend can load the directory without network access.
+    """
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    os.makedirs(output_dir, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name, revision=revision)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name, revision=revision)
+    model.eval()
+
+    sample = tokenizer(["Perusahaan mencatat laba bersih yang meningkat."], return_tensors="pt")
+    # Positional order must follow the model's forward() signature
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["logits"] = {0: "batch"}
+
+    fp32_path = os.path.join(output_dir, ONNX_MODEL_FILE)
+    logger.info(f"Mengekspor {model_name} ke {fp32_path}")
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in input_names),
+            fp32_path,
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset
+        )
+    tokenizer.save_pretrained(output_dir)
+    model.config.save_pretrained(output_dir)
+    paths = {"fp32": fp32_path}
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        int8_path = os.path.join(output_dir, ONNX_QUANTIZED_MODEL_FILE)
+        logger.info(f"Kuantisasi dinamis int8 ke {int8_path}")
+        quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+        paths["int8"] = int8_path
+
+    return paths
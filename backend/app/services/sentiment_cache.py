@@ -0,0 +1,143 @@
+"""
+Content-addressed sentiment result cache.
+Two tiers: an in-process LRU and a persistent SQLite table, keyed by a hash of
+the normalized text plus the model id and cache version.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+from app.config import (
+    SENTIMENT_CACHE_ENABLED,
+    SENTIMENT_CACHE_MAX_ENTRIES,
+    SENTIMENT_CACHE_PERSISTENT,
+    SENTIMENT_CACHE_VERSION,
+)
+from app.database import SessionLocal
+from app.models.sentiment_cache import SentimentCacheEntry
+from app.utils.logger import logger
+
+
+def normalize_text(text: str) -> str:
+    """Whitespace-normalize text already cleaned by extract_sentiment_text."""
+    return " ".join(text.split())
+
+
+class SentimentResultCache:
+    """Thread-safe LRU in front of an optional SQLite tier, with hit/miss counters."""
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        persistent: bool = True,
+        version: str = "1",
+        session_factory=SessionLocal
+    ):
+        self.max_entries = max(1, max_entries)
+        self.persistent = persistent
+        self.version = version
+        self._session_factory = session_factory
+        self._memory: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    def make_key(self, text: str, model_id: str) -> str:
+        payload = f"{model_id}\x00{self.version}\x00{normalize_text(text)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict]:
+        """Look up keys in memory, then the missing ones in SQLite with one query."""
+        found: Dict[str, Dict] = {}
+        missing = []
+        with self._lock:
+            for key in keys:
+                result = self._memory.get(key)
+                if result is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = result
+                    self.memory_hits += 1
+                else:
+                    missing.append(key)
+
+        if missing and self.persistent:
+            loaded = self._load(missing)
+            for key, result in loaded.items():
+                found[key] = result
+                self._remember(key, result)
+            with self._lock:
+                self.db_hits += len(loaded)
+
+        with self._lock:
+            self.misses += sum(1 for key in missing if key not in found)
+        return found
+
+    def put_many(self, results: Dict[str, Dict], model_id: str) -> None:
+        """Store freshly computed results in both tiers."""
+        for key, result in results.items():
+            self._remember(key, result)
+        if results and self.persistent:
+            self._store(results, model_id)
+
+    def _remember(self, key: str, result: Dict) -> None:
+        with self._lock:
+            self._memory[key] = result
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _load(self, keys: list) -> Dict[str, Dict]:
+        db = self._session_factory()
+        try:
+            rows = db.query(SentimentCacheEntry).filter(SentimentCacheEntry.cache_key.in_(keys)).all()
+            return {row.cache_key: json.loads(row.result_json) for row in rows}
+        except Exception as e:
+            # The cache must never fail an analysis
+            logger.warning(f"Gagal membaca cache sentimen: {str(e)}")
+            return {}
+        finally:
+            db.close()
+
+    def _store(self, results: Dict[str, Dict], model_id: str) -> None:
+        db = self._session_factory()
+        try:
+            for key, result in results.items():
+                db.merge(SentimentCacheEntry(
+                    cache_key=key,
+                    model_id=model_id,
+                    result_json=json.dumps(result, ensure_ascii=False)
+                ))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Gagal menyimpan cache sentimen: {str(e)}")
+        finally:
+            db.close()
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._memory.clear()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters for monitoring."""
+        lookups = self.memory_hits + self.db_hits + self.misses
+        return {
+            "memory_entries": len(self._memory),
+            "max_entries": self.max_entries,
+            "memory_hits": self.memory_hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.db_hits) / lookups, 3) if lookups else 0.0,
+            "persistent": self.persistent,
+            "version": self.version
+        }
+
+
+sentiment_cache: Optional[SentimentResultCache] = SentimentResultCache(
+    max_entries=SENTIMENT_CACHE_MAX_ENTRIES,
+    persistent=SENTIMENT_CACHE_PERSISTENT,
+    version=SENTIMENT_CACHE_VERSION
+) if SENTIMENT_CACHE_ENABLED else None
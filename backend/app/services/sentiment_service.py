@@ -1,71 +1,53 @@
 """
-Sentiment analysis service using VADER and Transformers.
+Sentiment analysis service using a lexicon scorer (VADER or the Indonesian
+lexicon) and Transformers (PyTorch or ONNX Runtime).
 Optimized for Indonesian text processing with Bahasa Indonesia labels.
 """
 
-import nltk
-from nltk.sentiment import SentimentIntensityAnalyzer
-from transformers import pipeline
-import numpy as np
-from typing import Dict, List, Optional
-from app.config import TORCH_DEVICE
-from app.utils.logger import logger
-
-# Download NLTK data (will be cached)
-try:
-    nltk.download('vader_lexicon', quiet=True)
-except:
-    pass  # Already downloaded
+import asyncio
+import statistics
+from typing import Dict, List, Optional, Tuple
+from app.config import (
+    SENTIMENT_BATCH_MAX_SIZE,
+    SENTIMENT_BATCH_MAX_WAIT_MS,
+    SENTIMENT_MAX_TOKENS,
+    SENTIMENT_TIERED_MODE,
+    SENTIMENT_TIER_LOW,
+    SENTIMENT_TIER_HIGH,
+)
+from app.services.inference_executor import inference_executor
+from app.services.inference_queue import BatchInferenceQueue
+from app.services.model_registry import SentimentModelRegistry, model_registry
+from app.services.sentiment_cache import sentiment_cache
+from app.services.text_chunker import TokenChunker
 
 
 class SentimentAnalysisService:
-    """Service for sentiment analysis with Indonesian language support."""
-    
-    def __init__(self):
-        self.vader = SentimentIntensityAnalyzer()
-        self._transformer = None  # Lazy loading
-    
-    def _get_transformer(self):
-        """Lazy load transformer model only when needed."""
-        if self._transformer is None:
-            # Multilingual model specifically supports Indonesian language
-            # Using a valid multilingual sentiment model
-            try:
-                logger.info("Loading sentiment analysis model (first time, may take a moment)...")
-                self._transformer = pipeline(
-                    "sentiment-analysis",
-                    model="nlptown/bert-base-multilingual-uncased-sentiment",
-                    device=-1 if TORCH_DEVICE == "cpu" else 0  # CPU mode for on-premise
-                )
-                logger.info("Sentiment model loaded successfully")
-            except Exception as e:
-                # Fallback to a simpler model if the above fails
-                logger.warning(f"Failed to load primary model, using fallback: {str(e)}")
-                try:
-                    self._transformer = pipeline(
-                        "sentiment-analysis",
-                        model="cardiffnlp/twitter-xlm-roberta-base-sentiment",
-                        device=-1 if TORCH_DEVICE == "cpu" else 0
-                    )
-                    logger.info("Fallback sentiment model loaded successfully")
-                except Exception as e2:
-                    logger.error(f"Failed to load fallback model: {str(e2)}")
-                    # Use default model as last resort
-                    self._transformer = pipeline(
-                        "sentiment-analysis",
-                        device=-1 if TORCH_DEVICE == "cpu" else 0
-                    )
-        return self._transformer
+    """
+    Service for sentiment analysis with Indonesian language support.
+    Instances are cheap: models live in the process-wide registry.
+    """
+    
+    def __init__(self, registry: Optional[SentimentModelRegistry] = None):
+        self.registry = registry or model_registry
+        # Texts scored ahead of analyze_texts, e.g. articles arriving from a stream
+        self._early_scores: Dict[str, asyncio.Task] = {}
+    
+    @property
+    def lexicon(self):
+        """Shared lexicon scorer: VADER or the Indonesian lexicon, per SENTIMENT_LEXICON."""
+        return self.registry.get_lexicon()
     
     @property
-    def transformer(self):
-        """Property to access transformer with lazy loading."""
-        return self._get_transformer()
+    def backend(self):
+        """Shared inference backend, torch or ONNX (loaded once per process)."""
+        return self.registry.get_backend()
     
     def analyze_text(self, text: str) -> Dict:
         """
-        Analyze sentiment of text using VADER + Transformers.
-        Optimized for Indonesian text patterns.
+        Analyze sentiment of text using the lexicon scorer + Transformers.
+        Optimized for Indonesian text patterns. ``vader_scores`` keeps its name
+        for API compatibility and holds whichever lexicon is configured.
         
         Returns:
             {
@@ -74,56 +56,251 @@ class SentimentAnalysisService:
               "consensus_score": float (0-1),
               "sentiment_label": str (POSITIF, NETRAL, NEGATIF),
               "confidence": float,
-              "text_length": int
+              "text_length": int,
+              "tier": str (lexicon, transformer),
+              "model_id": str (model that scored the text)
             }
         """
-        if not text or len(text.strip()) < 10:
+        if not self._is_valid(text):
             return {"error": "Text terlalu pendek"}
+        return self._score_cached([text])[0]
+    
+    def _score_cached(self, texts: List[str]) -> List[Dict]:
+        """score_texts behind the result cache (synchronous path)."""
+        if sentiment_cache is None:
+            return self.score_texts(texts)
+        keys, found = self._cache_lookup(texts, sentiment_cache.get_many)
+        pending = self._pending(texts, keys, found)
+        fresh = dict(zip(pending.keys(), self.score_texts(list(pending.values()))))
+        self._cache_store(pending, fresh)
+        found.update(fresh)
+        return [found[key] for key in keys]
+    
+    def _cache_lookup(self, texts: List[str], get_many) -> Tuple[List[str], Dict[str, Dict]]:
+        model_id = self.registry.model_id()
+        keys = [sentiment_cache.make_key(text, model_id or "") for text in texts]
+        # Until some result names the model that is scoring, nothing is served from the cache
+        return keys, get_many(keys) if model_id is not None else {}
+    
+    def _cache_store(self, pending: Dict[str, str], fresh: Dict[str, Dict]) -> None:
+        """Store fresh results keyed by the model that produced each of them."""
+        by_model: Dict[str, Dict[str, Dict]] = {}
+        for key, result in fresh.items():
+            model_id = result.get("model_id")
+            if model_id is not None:
+                by_model.setdefault(model_id, {})[sentiment_cache.make_key(pending[key], model_id)] = result
+        for model_id, results in by_model.items():
+            self.registry.served_model_id = model_id
+            sentiment_cache.put_many(results, model_id)
+    
+    @staticmethod
+    def _pending(texts: List[str], keys: List[str], found: Dict[str, Dict]) -> Dict[str, str]:
+        """Cache misses, de-duplicated by key (same text scored once)."""
+        pending: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in pending:
+                pending[key] = text
+        return pending
+    
+    def score_texts(self, texts: List[str]) -> List[Dict]:
+        """
+        Score already-validated texts with a single batched transformer call.
+        This is the unit of work executed by the micro-batching queue.
+        
+        In tiered mode the lexicon pass decides texts whose score lies outside
+        the uncertain band on its own; only the rest reach the transformer.
+        """
+        if not texts:
+            return []
+        
+        lexicon_scores = [self.lexicon.polarity_scores(text) for text in texts]
+        if SENTIMENT_TIERED_MODE:
+            escalated = [i for i, scores in enumerate(lexicon_scores) if self._is_uncertain(scores)]
+        else:
+            escalated = list(range(len(texts)))
         
-        # VADER analysis (works with English, multilingual model handles Indonesian better)
-        vader_scores = self.vader.polarity_scores(text)
+        transformer_scores = dict(zip(escalated, self._transformer_scores([texts[i] for i in escalated])))
+        results = [
+            self._build_result(text, lexicon_scores[i], transformer_scores[i])
+            if i in transformer_scores else self._build_lexicon_result(text, lexicon_scores[i])
+            for i, text in enumerate(texts)
+        ]
+        # The model that actually loaded (possibly a fallback) keys the cache entry
+        model_id = self.registry.model_id()
+        for result in results:
+            result["model_id"] = model_id
+        return results
+    
+    @staticmethod
+    def _is_uncertain(lexicon_scores: Dict) -> bool:
+        """Whether the lexicon score falls inside the band that needs the transformer."""
+        normalized = (lexicon_scores['compound'] + 1) / 2
+        return SENTIMENT_TIER_LOW < normalized < SENTIMENT_TIER_HIGH
+    
+    def _transformer_scores(self, texts: List[str]) -> List[Dict]:
+        """
+        Long texts are split into token-bounded windows at sentence
+        boundaries; every window of every text goes through the model in the
+        same batch and window scores are averaged weighted by token count.
+        """
+        if not texts:
+            return []
+        
+        backend = self.backend
+        chunker = TokenChunker(backend.tokenizer, max_tokens=SENTIMENT_MAX_TOKENS)
+        chunked = chunker.chunk_many(texts)
         
         # Transformer analysis (handles Indonesian text)
-        # Limit to 512 tokens for transformer model
-        transformer_result = self.transformer(text[:512])[0]
-        transformer_label = transformer_result['label']
-        transformer_score = self._transform_label_to_score(transformer_label)
-        transformer_confidence = transformer_result['score']
+        predictions = iter(backend.predict(
+            [chunk for chunks in chunked for chunk, _ in chunks],
+            batch_size=SENTIMENT_BATCH_MAX_SIZE
+        ))
+        return [self._aggregate_chunks(chunks, [next(predictions) for _ in chunks]) for chunks in chunked]
+    
+    def _aggregate_chunks(self, chunks: List[Tuple[str, int]], predictions: List[Dict]) -> Dict:
+        """Token-length weighted average of per-window transformer scores."""
+        weights = [max(1, tokens) for _, tokens in chunks]
+        total = sum(weights)
+        score = sum(w * self._transform_label_to_score(p['label']) for w, p in zip(weights, predictions)) / total
+        confidence = sum(w * p['score'] for w, p in zip(weights, predictions)) / total
+        
+        # Report the label carrying the most tokens
+        label_weights: Dict[str, int] = {}
+        for w, p in zip(weights, predictions):
+            label_weights[p['label']] = label_weights.get(p['label'], 0) + w
+        label = max(label_weights, key=label_weights.get)
+        
+        return {
+            "label": label,
+            "score": round(score, 4),
+            "confidence": confidence,
+            "chunks": len(chunks)
+        }
+    
+    def _build_result(self, text: str, vader_scores: Dict, transformer_scores: Dict) -> Dict:
+        """Combine VADER and (aggregated) transformer output into the consensus result."""
+        transformer_score = transformer_scores['score']
+        transformer_confidence = transformer_scores['confidence']
         
         # Consensus (average of both)
         vader_normalized = (vader_scores['compound'] + 1) / 2
         consensus_score = (vader_normalized + transformer_score) / 2
         
-        # Determine sentiment label in Bahasa Indonesia
-        if consensus_score >= 0.6:
-            sentiment_label = "POSITIF"
-        elif consensus_score <= 0.4:
-            sentiment_label = "NEGATIF"
-        else:
-            sentiment_label = "NETRAL"
-        
         return {
-            "vader_scores": {
-                "compound": vader_scores['compound'],
-                "positive": vader_scores['pos'],
-                "negative": vader_scores['neg'],
-                "neutral": vader_scores['neu']
-            },
-            "transformer_scores": {
-                "label": transformer_label,
-                "score": transformer_score,
-                "confidence": transformer_confidence
-            },
+            "vader_scores": self._format_vader(vader_scores),
+            "transformer_scores": transformer_scores,
             "consensus_score": round(consensus_score, 3),
-            "sentiment_label": sentiment_label,
+            "sentiment_label": self._label_for(consensus_score),
             "confidence": min(transformer_confidence, abs(vader_scores['compound'])),
-            "text_length": len(text.split())
+            "text_length": len(text.split()),
+            "tier": "transformer"
         }
     
+    def _build_lexicon_result(self, text: str, vader_scores: Dict) -> Dict:
+        """Result decided by the lexicon pass alone (tiered mode, clear-cut text)."""
+        vader_normalized = (vader_scores['compound'] + 1) / 2
+        return {
+            "vader_scores": self._format_vader(vader_scores),
+            "transformer_scores": None,
+            "consensus_score": round(vader_normalized, 3),
+            "sentiment_label": self._label_for(vader_normalized),
+            "confidence": abs(vader_scores['compound']),
+            "text_length": len(text.split()),
+            "tier": "lexicon"
+        }
+    
+    @staticmethod
+    def _format_vader(vader_scores: Dict) -> Dict:
+        return {
+            "compound": vader_scores['compound'],
+            "positive": vader_scores['pos'],
+            "negative": vader_scores['neg'],
+            "neutral": vader_scores['neu']
+        }
+    
+    @staticmethod
+    def _label_for(score: float) -> str:
+        """Determine sentiment label in Bahasa Indonesia."""
+        if score >= 0.6:
+            return "POSITIF"
+        elif score <= 0.4:
+            return "NEGATIF"
+        return "NETRAL"
+    
     def analyze_batch(self, texts: List[str]) -> Dict:
         """Analyze multiple texts and return aggregated statistics."""
-        results = [self.analyze_text(text) for text in texts]
-        
+        valid_texts = [text for text in texts if self._is_valid(text)]
+        scored = iter(self._score_cached(valid_texts))
+        results = [next(scored) if self._is_valid(text) else {"error": "Text terlalu pendek"} for text in texts]
+        return self._aggregate(texts, results)
+    
+    async def analyze_texts(self, texts: List[str]) -> List[Dict]:
+        """
+        Analyze texts through the shared micro-batching queue.
+        Texts from concurrent requests are scored together in one padded batch.
+        Returns one result per input text, in order.
+        """
+        valid_texts = [text for text in texts if self._is_valid(text)]
+        early = {text: self._early_scores.pop(text) for text in valid_texts if text in self._early_scores}
+        try:
+            scored = iter(await self._score_cached_async([text for text in valid_texts if text not in early]))
+            early_results = {text: await self._early_result(task) for text, task in early.items()}
+        finally:
+            # Claimed early scores are not left running when this call fails or is cancelled
+            for task in early.values():
+                task.cancel()
+        return [
+            early_results[text] if text in early_results
+            else next(scored) if self._is_valid(text)
+            else {"error": "Text terlalu pendek"}
+            for text in texts
+        ]
+    
+    def score_early(self, text: str) -> None:
+        """
+        Start scoring ``text`` now; a later analyze_texts call including it
+        awaits this result instead of queueing the text again.
+        """
+        if not self._is_valid(text) or text in self._early_scores:
+            return
+        task = asyncio.get_running_loop().create_task(self._score_cached_async([text]))
+        # Texts that are never collected must not log "exception was never retrieved"
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._early_scores[text] = task
+    
+    @staticmethod
+    async def _early_result(task: asyncio.Task) -> Dict:
+        """Result of an early-score task; a failure only costs that one text."""
+        try:
+            return (await task)[0]
+        except Exception as e:
+            return {"error": f"Gagal menganalisis sentimen: {str(e)}"}
+    
+    def discard_early_scores(self) -> None:
+        """Cancel early scores nobody claimed (search failed, or the article was filtered out)."""
+        tasks, self._early_scores = self._early_scores, {}
+        for task in tasks.values():
+            task.cancel()
+    
+    async def _score_cached_async(self, texts: List[str]) -> List[Dict]:
+        """Queue only cache misses; SQLite access runs in a worker thread."""
+        if sentiment_cache is None or not texts:
+            return await inference_queue.submit_many(texts)
+        keys, found = await asyncio.to_thread(self._cache_lookup, texts, sentiment_cache.get_many)
+        pending = self._pending(texts, keys, found)
+        if pending:
+            fresh = dict(zip(pending.keys(), await inference_queue.submit_many(list(pending.values()))))
+            await asyncio.to_thread(self._cache_store, pending, fresh)
+            found.update(fresh)
+        return [found[key] for key in keys]
+    
+    async def analyze_batch_async(self, texts: List[str]) -> Dict:
+        """Async counterpart of analyze_batch using the micro-batching queue."""
+        results = await self.analyze_texts(texts)
+        return self._aggregate(texts, results)
+    
+    def _aggregate(self, texts: List[str], results: List[Dict]) -> Dict:
+        """Aggregate per-text results into batch statistics."""
         valid_scores = [r['consensus_score'] for r in results if 'consensus_score' in r]
         
         if not valid_scores:
@@ -132,8 +309,8 @@ class SentimentAnalysisService:
         return {
             "total_texts": len(texts),
             "valid_analyses": len(valid_scores),
-            "average_score": round(np.mean(valid_scores), 3),
-            "std_dev": round(np.std(valid_scores), 3),
+            "average_score": round(statistics.fmean(valid_scores), 3),
+            "std_dev": round(statistics.pstdev(valid_scores), 3),
             "min_score": min(valid_scores),
             "max_score": max(valid_scores),
             "positive_count": sum(1 for s in valid_scores if s >= 0.6),
@@ -142,6 +319,10 @@ class SentimentAnalysisService:
             "details": results
         }
     
+    @staticmethod
+    def _is_valid(text: str) -> bool:
+        return bool(text) and len(text.strip()) >= 10
+    
     def _transform_label_to_score(self, label: str) -> float:
         """Convert transformer label (1-5) to score (0-1)."""
         mapping = {
@@ -161,3 +342,16 @@ class SentimentAnalysisService:
         }
         return mapping.get(label, 0.5)
 
+
+def score_texts(texts: List[str]) -> List[Dict]:
+    """Module-level (picklable) batch function run on the inference executor."""
+    return SentimentAnalysisService().score_texts(texts)
+
+
+# Shared by every request in this process so concurrent texts batch together
+inference_queue = BatchInferenceQueue(
+    score_texts,
+    max_batch_size=SENTIMENT_BATCH_MAX_SIZE,
+    max_wait_ms=SENTIMENT_BATCH_MAX_WAIT_MS,
+    executor=inference_executor
+)
@@ -0,0 +1,138 @@
+"""
+Stage-graph executor for analysis pipelines.
+Runs independent stages concurrently, each with its own timeout and fallback.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+from app.utils.logger import logger
+
+# Sentinel: a stage without a fallback is required and fails the whole run
+REQUIRED = object()
+
+
+class Stage:
+    """A single named step of an analysis pipeline."""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[..., Awaitable[Any]],
+        depends_on: Iterable[str] = (),
+        timeout: Optional[float] = None,
+        fallback: Any = REQUIRED
+    ):
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+        self.timeout = timeout
+        self.fallback = fallback
+
+    @property
+    def required(self) -> bool:
+        return self.fallback is REQUIRED
+
+    def fallback_value(self, error: BaseException) -> Any:
+        """Fallback may be a plain value or a callable receiving the error."""
+        if callable(self.fallback):
+            return self.fallback(error)
+        return self.fallback
+
+
+class StageExecutor:
+    """
+    Executes a DAG of stages.
+
+    Each stage function is awaited with the results of its dependencies as
+    keyword arguments. Stages without dependencies between them run
+    concurrently, so total latency is roughly the slowest path through the
+    graph instead of the sum of all stages.
+
+    A stage that fails or times out yields its fallback value (dependents then
+    receive that value). A required stage (no fallback) cancels the remaining
+    stages and re-raises its error.
+    """
+
+    def __init__(self, name: str = "pipeline"):
+        self.name = name
+        self._stages: Dict[str, Stage] = {}
+        self.report: Dict[str, Dict[str, Any]] = {}
+
+    def add_stage(
+        self,
+        name: str,
+        func: Callable[..., Awaitable[Any]],
+        depends_on: Iterable[str] = (),
+        timeout: Optional[float] = None,
+        fallback: Any = REQUIRED
+    ) -> "StageExecutor":
+        """
+        Register a stage. Dependencies must be registered first, which keeps
+        the graph acyclic by construction.
+        """
+        if name in self._stages:
+            raise ValueError(f"Stage '{name}' sudah terdaftar")
+        depends_on = tuple(depends_on)
+        for dep in depends_on:
+            if dep not in self._stages:
+                raise ValueError(f"Stage '{name}' bergantung pada stage yang belum terdaftar: '{dep}'")
+        self._stages[name] = Stage(name, func, depends_on, timeout, fallback)
+        return self
+
+    async def run(self) -> Dict[str, Any]:
+        """Run all stages and return a mapping of stage name to result."""
+        self.report = {}
+        tasks: Dict[str, asyncio.Task] = {}
+
+        # Tasks only start running at the first await below, so every
+        # dependency task exists before any stage looks it up.
+        for name, stage in self._stages.items():
+            tasks[name] = asyncio.create_task(self._run_stage(stage, tasks))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+
+        return {name: task.result() for name, task in tasks.items()}
+
+    async def _run_stage(self, stage: Stage, tasks: Dict[str, asyncio.Task]) -> Any:
+        inputs = {}
+        for dep in stage.depends_on:
+            inputs[dep] = await tasks[dep]
+
+        started = time.perf_counter()
+        try:
+            if stage.timeout is not None:
+                result = await asyncio.wait_for(stage.func(**inputs), timeout=stage.timeout)
+            else:
+                result = await stage.func(**inputs)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            duration = time.perf_counter() - started
+            is_timeout = isinstance(e, asyncio.TimeoutError)
+            # Errors may name their own status (e.g. "kuota_habis")
+            status = "timeout" if is_timeout else getattr(e, "stage_status", "gagal")
+            self.report[stage.name] = {
+                "status": status,
+                "duration": round(duration, 3),
+                "error": str(e) or type(e).__name__
+            }
+            if stage.required:
+                logger.error(f"[{self.name}] Stage '{stage.name}' gagal: {str(e)}")
+                raise
+            if is_timeout:
+                logger.warning(f"[{self.name}] Stage '{stage.name}' timeout setelah {stage.timeout} detik, memakai fallback")
+            else:
+                logger.warning(f"[{self.name}] Stage '{stage.name}' gagal, memakai fallback: {str(e)}")
+            return stage.fallback_value(e)
+
+        duration = time.perf_counter() - started
+        self.report[stage.name] = {"status": "sukses", "duration": round(duration, 3)}
+        logger.debug(f"[{self.name}] Stage '{stage.name}' selesai dalam {duration:.2f} detik")
+        return result
@@ -0,0 +1,73 @@
+"""
+Token-aware text chunking for the sentiment transformer.
+Splits long texts into token-bounded windows at sentence boundaries so the
+whole document is scored instead of only its first 512 characters.
+"""
+
+import re
+from typing import List, Tuple
+
+# Sentence ends at . ! ? (optionally followed by quotes/brackets) or at a line break
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])["\')\]]*\s+|\n+')
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences; abbreviations may over-split, which packing absorbs."""
+    return [s.strip() for s in SENTENCE_BOUNDARY.split(text) if s and s.strip()]
+
+
+class TokenChunker:
+    """Packs sentences into windows of at most ``max_tokens`` model tokens."""
+
+    def __init__(self, tokenizer, max_tokens: int = 512):
+        self.tokenizer = tokenizer
+        model_limit = getattr(tokenizer, "model_max_length", max_tokens) or max_tokens
+        # Leave room for the special tokens ([CLS]/[SEP] or <s>/</s>)
+        self.window = max(8, min(max_tokens, model_limit) - tokenizer.num_special_tokens_to_add(pair=False))
+
+    def _count(self, texts: List[str]) -> List[int]:
+        encoded = self.tokenizer(texts, add_special_tokens=False)["input_ids"]
+        return [len(ids) for ids in encoded]
+
+    def chunk_many(self, texts: List[str]) -> List[List[Tuple[str, int]]]:
+        """
+        Chunk several texts. Returns, per text, a list of (chunk_text, token_count).
+        Texts that already fit are returned whole after a single batched count.
+        """
+        counts = self._count(texts) if texts else []
+        return [
+            [(text, count)] if count <= self.window else self._chunk_long(text)
+            for text, count in zip(texts, counts)
+        ]
+
+    def _chunk_long(self, text: str) -> List[Tuple[str, int]]:
+        sentences = split_sentences(text)
+        counts = self._count(sentences)
+
+        chunks: List[Tuple[str, int]] = []
+        current: List[str] = []
+        current_tokens = 0
+        for sentence, count in zip(sentences, counts):
+            if count > self.window:
+                # A single sentence over the window: flush, then hard-split by tokens
+                if current:
+                    chunks.append((" ".join(current), current_tokens))
+                    current, current_tokens = [], 0
+                chunks.extend(self._split_by_tokens(sentence))
+                continue
+            if current and current_tokens + count > self.window:
+                chunks.append((" ".join(current), current_tokens))
+                current, current_tokens = [], 0
+            current.append(sentence)
+            current_tokens += count
+
+        if current:
+            chunks.append((" ".join(current), current_tokens))
+        return chunks
+
+    def _split_by_tokens(self, sentence: str) -> List[Tuple[str, int]]:
+        ids = self.tokenizer(sentence, add_special_tokens=False)["input_ids"]
+        return [
+            (self.tokenizer.decode(ids[i:i + self.window]), len(ids[i:i + self.window]))
+            for i in range(0, len(ids), self.window)
+        ]
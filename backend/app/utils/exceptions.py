@@ -33,3 +33,13 @@ class DatabaseError(Exception):
     """Gagal mengakses database."""
     pass
 
+
+
+class PerplexityUnavailableError(PerplexityAPIError):
+    """Perplexity sementara tidak dapat dipanggil (circuit breaker terbuka)."""
+    stage_status = "tidak_tersedia"  # Reported by StageExecutor instead of "gagal"
+
+
+class PerplexityQuotaExceededError(PerplexityUnavailableError):
+    """Kuota atau antrean permintaan Perplexity habis."""
+    stage_status = "kuota_habis"
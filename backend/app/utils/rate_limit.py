@@ -0,0 +1,51 @@
+"""
+Async token bucket for pacing outbound requests.
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    ``rate`` tokens per second, up to ``capacity`` banked for bursts.
+    Waiters are served in arrival order: each one reserves the next token and
+    sleeps until it is due, so pacing stays exact under contention.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0:
+            raise ValueError("rate harus lebih besar dari 0")
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self) -> float:
+        """Seconds until a token would be available for a new caller."""
+        self._refill()
+        return max(0.0, (1.0 - self._tokens) / self.rate)
+
+    async def acquire(self, max_wait: Optional[float] = None) -> bool:
+        """
+        Take one token, sleeping until it is due. Returns False without
+        reserving anything when the wait would exceed ``max_wait`` seconds.
+        """
+        wait = self.delay()
+        if max_wait is not None and wait > max_wait:
+            return False
+        # Reserve now (tokens may go negative) so later callers queue behind us
+        self._tokens -= 1.0
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self._tokens += 1.0
+                raise
+        return True
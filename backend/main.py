@@ -6,8 +6,16 @@ API Analisis Sentimen untuk Penilaian Kredit
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import logging
+import asyncio
+from app.config import SENTIMENT_WARMUP_ON_STARTUP, MAHKAMAH_BROWSER_PREWARM
 from app.database import init_db
 from app.api.v1 import company, health, news
+from app.services.browser_pool import browser_pool
+from app.services.http_client import http_client
+from app.services.inference_executor import inference_executor
+from app.services.mahkamah_crawler import CRAWL4AI_AVAILABLE
+from app.services.perplexity_cache import perplexity_cache
+from app.services.sentiment_service import inference_queue
 from app.utils.logger import logger
 
 app = FastAPI(
@@ -33,12 +41,34 @@ app.add_middleware(
 # Initialize database on startup
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup."""
+    """Initialize database, open the shared HTTP client and warm up the sentiment model on startup."""
     try:
         init_db()
         logger.info("Database initialized successfully")
     except Exception as e:
         logger.error(f"Gagal menginisialisasi database: {str(e)}")
+    
+    http_client.start()
+    
+    # The crawler browser otherwise starts on the first legal search
+    if MAHKAMAH_BROWSER_PREWARM and CRAWL4AI_AVAILABLE:
+        asyncio.create_task(browser_pool.warm_up())
+    
+    # Load the model on the inference workers so /health answers while it
+    # warms up; readiness is reported by /health/ready.
+    if SENTIMENT_WARMUP_ON_STARTUP:
+        inference_executor.start_warm_up()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background inference workers and cache refreshes, then close the browser and pooled HTTP connections."""
+    await inference_queue.close()
+    inference_executor.shutdown()
+    if perplexity_cache is not None:
+        await perplexity_cache.close()
+    await browser_pool.close()
+    await http_client.aclose()
 
 # Routes
 app.include_router(company.router)
@@ -0,0 +1,297 @@
+"""
+Benchmark parser halaman hasil pencarian Mahkamah Agung: parser lxml
+(app/services/case_parser) vs salinan beku parser BeautifulSoup lama, pada
+halaman contoh di fixtures/mahkamah_search_pages.json.
+
+Memeriksa keluaran identik (case_number, case_date, case_type, severity, dan
+field lainnya) untuk setiap halaman serta variasi acak yang menyusun ulang
+blok hasil dari korpus, lalu mengukur throughput.
+
+Contoh penggunaan: python scripts/benchmark_case_parser.py --repeats 100
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.case_parser import parse_search_page
+
+CORPUS_PATH = Path(__file__).resolve().parent / "fixtures" / "mahkamah_search_pages.json"
+BASE_URL = "https://putusan3.mahkamahagung.go.id"
+ENTRY_RE = re.compile(r'<div class="entry-c">.*?\n  </div>\n</div>', re.DOTALL)
+
+
+class LegacyCaseParser:
+    """Frozen copy of the MahkamahAgungCrawler BeautifulSoup parser before the lxml rewrite."""
+
+    BASE_URL = BASE_URL
+
+    SEVERITY_MAP = {
+        "pidana": "tinggi",      # Criminal - high severity
+        "perdata": "sedang",      # Civil - medium severity
+        "tata usaha negara": "sedang",  # Administrative - medium severity
+        "tata": "sedang",         # Administrative - medium severity
+        "niaga": "tinggi",        # Commercial - high severity
+        "pajak": "sedang",        # Tax - medium severity
+        "pidana umum": "tinggi",  # General criminal - high severity
+        "pidana khusus": "tinggi", # Special criminal - high severity
+    }
+
+    def _parse_search_page(self, html: str) -> List[Dict]:
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(html, 'html.parser')
+
+        # Find case containers - they are in div.entry-c
+        case_elements = soup.find_all('div', class_='entry-c')
+
+        # If not found, try alternative selectors
+        if not case_elements:
+            case_elements = (
+                soup.find_all('div', class_='putusan-item') or
+                soup.find_all('div', class_='case-item') or
+                soup.find_all('div', class_=lambda x: x and 'entry' in str(x).lower()) or
+                []
+            )
+
+        cases = []
+        for element in case_elements[:10]:  # Limit to 10 cases
+            case_data = self._parse_case_element(element)
+            if case_data:
+                cases.append(case_data)
+        return cases
+    
+    def _parse_case_element(self, element) -> Optional[Dict]:
+        """Parse individual case from HTML. Handles Indonesian date formats."""
+        try:
+            # Structure: div.entry-c contains:
+            # 1. Breadcrumb navigation (div.small with links)
+            # 2. Date info (div.small with Register/Putus/Upload)
+            # 3. Case number link (strong > a)
+            # 4. Case title/description (div after case number)
+            # 5. Summary (list > blockquote)
+            
+            # 1. Find case number - it's in a strong > a link with "Putusan MAHKAMAH AGUNG Nomor" pattern
+            case_number = "Tidak diketahui"
+            source_url = ""
+            
+            # Look for strong element containing a link to putusan detail page
+            all_strong = element.find_all('strong')
+            for strong_elem in all_strong:
+                case_num_a = strong_elem.find('a', href=lambda x: x and 'direktori/putusan' in x.lower())
+                if case_num_a:
+                    case_number = case_num_a.get_text(strip=True)
+                    source_url = case_num_a.get('href', '')
+                    if source_url and not source_url.startswith('http'):
+                        source_url = f"{self.BASE_URL}{source_url}"
+                    break
+            
+            # Fallback: look for any link with "Putusan" and "Nomor" in text
+            if case_number == "Tidak diketahui":
+                putusan_links = element.find_all('a', href=lambda x: x and 'putusan' in x.lower())
+                for link in putusan_links:
+                    link_text = link.get_text(strip=True)
+                    if 'Putusan' in link_text and 'Nomor' in link_text:
+                        case_number = link_text
+                        source_url = link.get('href', '')
+                        if source_url and not source_url.startswith('http'):
+                            source_url = f"{self.BASE_URL}{source_url}"
+                        break
+            
+            # 2. Find date information - in div.small with strong tags
+            case_date = "Tidak diketahui"
+            date_divs = element.find_all('div', class_='small')
+            for date_div in date_divs:
+                # Look for div containing date information (has "Register", "Putus", "Upload")
+                date_text = date_div.get_text(separator=' ', strip=True)
+                if 'Putus' in date_text or 'Register' in date_text:
+                    # Extract date pattern DD-MM-YYYY after "Putus :"
+                    import re
+                    # Look for date after "Putus :"
+                    putus_match = re.search(r'Putus\s*:\s*(\d{2}-\d{2}-\d{4})', date_text)
+                    if putus_match:
+                        case_date = putus_match.group(1)
+                        break
+                    # Fallback: find any date pattern
+                    date_match = re.search(r'(\d{2}-\d{2}-\d{4})', date_text)
+                    if date_match:
+                        case_date = date_match.group(1)
+                        break
+            
+            # 3. Find case title/description - it's in a div after the case number link
+            case_title = "Tidak diketahui"
+            
+            # Find the div that comes after the strong case number link
+            # Look for div that contains "Tanggal" (date) pattern
+            all_divs = element.find_all('div')
+            for div in all_divs:
+                div_text = div.get_text(strip=True)
+                # Look for div with "Tanggal" pattern (case description)
+                if 'Tanggal' in div_text and len(div_text) > 20:
+                    # Remove mark tags (highlighted search terms) first
+                    for mark in div.find_all('mark'):
+                        mark.unwrap()
+                    
+                    # Get cleaned text
+                    case_title = div.get_text(separator=' ', strip=True)
+                    
+                    # Clean up: remove metadata like view counts, download counts, status
+                    import re
+                    # Remove patterns like "132 — 68 — Berkekuatan Hukum Tetap" or "90 — 0 — Berkekuatan Hukum Tetap"
+                    case_title = re.sub(r'\s*\d+\s*—\s*\d+\s*—\s*Berkekuatan.*$', '', case_title, flags=re.IGNORECASE).strip()
+                    # Remove trailing dashes and extra spaces
+                    case_title = re.sub(r'\s*—\s*$', '', case_title).strip()
+                    # Remove multiple spaces
+                    case_title = re.sub(r'\s+', ' ', case_title).strip()
+                    break
+            
+            # If no title found, try to extract from case number
+            if case_title == "Tidak diketahui" and case_number != "Tidak diketahui":
+                case_title = case_number
+            
+            case_type = self._determine_case_type(case_title)
+            
+            # 4. Find verdict summary - in blockquote elements
+            verdict_summary = ""
+            blockquotes = element.find_all('blockquote')
+            if blockquotes:
+                # Combine all blockquote text
+                summary_parts = []
+                for bq in blockquotes[:3]:  # Limit to first 3 blockquotes
+                    text = bq.get_text(separator=' ', strip=True)
+                    if text and len(text) > 20:  # Only include substantial text
+                        summary_parts.append(text)
+                
+                if summary_parts:
+                    verdict_summary = ' '.join(summary_parts)
+                    # Limit to 500 characters
+                    if len(verdict_summary) > 500:
+                        verdict_summary = verdict_summary[:500] + "..."
+            
+            # If no summary from blockquotes, try to get from element text
+            if not verdict_summary:
+                all_text = element.get_text(separator=' ', strip=True)
+                # Remove case number and title from text
+                if case_number in all_text:
+                    all_text = all_text.replace(case_number, '', 1)
+                if case_title in all_text:
+                    all_text = all_text.replace(case_title, '', 1)
+                # Get a reasonable chunk
+                if len(all_text) > 100:
+                    verdict_summary = all_text[:300].strip()
+                else:
+                    verdict_summary = "Tidak ada ringkasan"
+            
+            severity = self.SEVERITY_MAP.get(case_type.lower(), "sedang")
+            
+            return {
+                "case_number": case_number,
+                "case_date": case_date,
+                "case_title": case_title,
+                "case_type": case_type,
+                "verdict_summary": verdict_summary,
+                "severity": severity,
+                "source_url": source_url
+            }
+        except Exception:
+            return None
+    
+    def _determine_case_type(self, title: str) -> str:
+        """
+        Classify case type from title.
+        Returns Indonesian case types: pidana, perdata, tata usaha negara, niaga
+        """
+        if not title:
+            return "perdata"
+            
+        title_lower = title.lower()
+        
+        if any(word in title_lower for word in ['pidana', 'criminal', 'penal', 'kriminal', '/pid']):
+            if 'khusus' in title_lower or '/pid.sus' in title_lower:
+                return "pidana khusus"
+            return "pidana"
+        elif any(word in title_lower for word in ['niaga', 'commercial', 'dagang', 'perdagangan', '/pdt.sus']):
+            return "niaga"
+        elif any(word in title_lower for word in ['tata usaha negara', 'administrative', 'administrasi', 'tata usaha', '/tun']):
+            return "tata usaha negara"
+        elif any(word in title_lower for word in ['pajak', 'tax', '/pjk']):
+            return "pajak"
+        else:
+            return "perdata"
+
+
+def load_corpus(path: Path = CORPUS_PATH):
+    """Read [{"name", "html"}] recorded search pages."""
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def variants(corpus, count: int, seed: int = 17):
+    """Pages rebuilt from a random selection of corpus result blocks, to exercise parser edge cases."""
+    rng = random.Random(seed)
+    blocks = [block for item in corpus for block in ENTRY_RE.findall(item["html"])]
+    template = corpus[0]["html"]
+    start = template.index('<div id="posts" class="small-thumbs">') + len('<div id="posts" class="small-thumbs">')
+    end = template.index('<ul class="pagination">')
+    for i in range(count):
+        picked = rng.sample(blocks, min(len(blocks), rng.randint(0, 14)))
+        if rng.random() < 0.3:
+            # Drop highlight markup the way a different query would
+            picked = [block.replace("<mark>", "").replace("</mark>", "") for block in picked]
+        body = "\n".join(picked)
+        yield {"name": f"variant-{i}", "html": template[:start] + body + "\n</div>\n" + template[end:]}
+
+
+def check_parity(cases, legacy: LegacyCaseParser) -> int:
+    mismatches = 0
+    for case in cases:
+        expected = legacy._parse_search_page(case["html"])
+        actual = parse_search_page(case["html"], BASE_URL)
+        if expected != actual:
+            mismatches += 1
+            print(f"❌ {case['name']} berbeda")
+            for old, new in zip(expected, actual):
+                for key in old:
+                    if old[key] != new.get(key):
+                        print(f"   {key}: {old[key]!r} != {new.get(key)!r}")
+            if len(expected) != len(actual):
+                print(f"   jumlah kasus: {len(expected)} != {len(actual)}")
+    return mismatches
+
+
+def throughput(parse, corpus, repeats: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeats):
+        for item in corpus:
+            parse(item["html"])
+    return repeats * len(corpus) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parser hasil pencarian Mahkamah Agung")
+    parser.add_argument("--repeats", type=int, default=50, help="Jumlah pengulangan korpus untuk throughput")
+    parser.add_argument("--variants", type=int, default=300, help="Jumlah variasi acak untuk uji paritas")
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    legacy = LegacyCaseParser()
+
+    cases = corpus + list(variants(corpus, args.variants))
+    mismatches = check_parity(cases, legacy)
+    print(f"Paritas: {len(cases) - mismatches}/{len(cases)} halaman identik")
+
+    old_rate = throughput(legacy._parse_search_page, corpus, args.repeats)
+    new_rate = throughput(lambda html: parse_search_page(html, BASE_URL), corpus, args.repeats)
+    print(f"Parser lama : {old_rate:10,.0f} halaman/detik")
+    print(f"Parser baru : {new_rate:10,.0f} halaman/detik ({new_rate / old_rate:.2f}x)")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
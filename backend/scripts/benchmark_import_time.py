@@ -0,0 +1,96 @@
+"""
+Regresi waktu import backend: gagal (exit 1) jika `import main` melebihi
+anggaran waktu, atau jika modul berat (torch, transformers, nltk, crawl4ai,
+...) ikut ter-import saat startup.
+
+Contoh penggunaan: python scripts/benchmark_import_time.py --budget 1.5
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Must only be imported on first use or by the background warm-up
+HEAVY_MODULES = ["torch", "transformers", "nltk", "crawl4ai", "onnxruntime", "numpy", "playwright"]
+
+PROBE = f"""
+import json, sys, time
+started = time.perf_counter()
+import main
+elapsed = time.perf_counter() - started
+print(json.dumps({{
+    "seconds": elapsed,
+    "heavy": [m for m in {HEAVY_MODULES!r} if m in sys.modules]
+}}))
+"""
+
+
+def measure_once() -> dict:
+    """Import main in a fresh interpreter so nothing is cached in-process."""
+    completed = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True
+    )
+    if completed.returncode != 0:
+        print(f"❌ import main gagal:\n{completed.stderr.strip()}")
+        sys.exit(1)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(limit: int = 10) -> list:
+    """Top cumulative import times from -X importtime (microseconds)."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time:  self [us] | cumulative | imported package"
+        fields = line[len("import time:"):].split("|")
+        rows.append((int(fields[1]), fields[2].strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark waktu import backend")
+    parser.add_argument("--budget", type=float, default=1.5, help="Batas median waktu import (detik)")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    runs = [measure_once() for _ in range(args.repeats)]
+    median = statistics.median(run["seconds"] for run in runs)
+    heavy = sorted({module for run in runs for module in run["heavy"]})
+
+    print("=" * 60)
+    print(f"Median waktu import main: {median:.3f} detik (anggaran {args.budget:.3f} detik)")
+    print("Pengulangan: " + ", ".join(f"{run['seconds']:.3f}" for run in runs))
+    print("Import terlama (kumulatif):")
+    for cumulative, name in slowest_imports():
+        print(f"  {cumulative / 1e6:>8.3f} s  {name}")
+    print("=" * 60)
+
+    failures = []
+    if median > args.budget:
+        failures.append(f"waktu import {median:.3f} detik melebihi anggaran {args.budget:.3f} detik")
+    if heavy:
+        failures.append(f"modul berat ter-import saat startup: {', '.join(heavy)}")
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        sys.exit(1)
+    print("✅ Waktu import dalam anggaran")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark throughput dan akurasi leksikon Indonesia vs VADER pada korpus tetap.
+Setiap teks dinormalisasi seperti consensus_score ((compound + 1) / 2) lalu
+dibandingkan dengan label korpus.
+
+Contoh penggunaan: python scripts/benchmark_lexicon.py --repeats 200
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.indonesian_lexicon import IndonesianLexiconScorer
+from app.services.model_registry import SentimentModelRegistry
+
+CORPUS_PATH = Path(__file__).resolve().parent / "fixtures" / "sentiment_corpus.tsv"
+
+
+def load_corpus(path: Path = CORPUS_PATH):
+    """Read (label, text) pairs from the TSV corpus."""
+    rows = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+        label, text = line.split("\t", 1)
+        rows.append((label, text))
+    return rows
+
+
+def score_to_label(score: float) -> str:
+    """Same thresholds as the consensus label."""
+    if score >= 0.6:
+        return "POSITIF"
+    if score <= 0.4:
+        return "NEGATIF"
+    return "NETRAL"
+
+
+def benchmark(scorer, texts, repeats: int):
+    scores = [scorer.polarity_scores(text) for text in texts]  # warm-up
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for text in texts:
+            scorer.polarity_scores(text)
+        timings.append(time.perf_counter() - started)
+    return scores, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark leksikon sentimen")
+    parser.add_argument("--repeats", type=int, default=100)
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    gold = [label for label, _ in corpus]
+    texts = [text for _, text in corpus]
+
+    started = time.perf_counter()
+    scorers = [("indonesian", IndonesianLexiconScorer())]
+    print(f"Automaton leksikon Indonesia dikompilasi dalam {(time.perf_counter() - started) * 1000:.1f} ms")
+    try:
+        scorers.append(("vader", SentimentModelRegistry._load_vader()))
+    except Exception as e:
+        print(f"⚠️  vader dilewati: {e}")
+
+    print("=" * 60)
+    print(f"{'Leksikon':<12}{'teks/detik':>14}{'µs/teks':>12}{'Akurasi':>10}{'Netral':>10}")
+    print("=" * 60)
+    for name, scorer in scorers:
+        scores, timings = benchmark(scorer, texts, args.repeats)
+        labels = [score_to_label((s["compound"] + 1) / 2) for s in scores]
+        accuracy = sum(label == g for label, g in zip(labels, gold)) / len(gold)
+        neutral = labels.count("NETRAL") / len(labels)
+        per_text = statistics.median(timings) / len(texts)
+        print(f"{name:<12}{1 / per_text:>14,.0f}{per_text * 1e6:>12.1f}{accuracy:>10.1%}{neutral:>10.1%}")
+    print("=" * 60)
+    print(f"Korpus: {len(texts)} teks, {args.repeats} pengulangan")
+
+
+if __name__ == "__main__":
+    main()
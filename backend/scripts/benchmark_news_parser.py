@@ -0,0 +1,274 @@
+"""
+Benchmark parser berita Perplexity: parser satu-lintasan (app/services/news_parser)
+vs salinan beku parser regex lama, pada korpus contoh respons di
+fixtures/perplexity_news_responses.json.
+
+Memeriksa keluaran identik untuk setiap respons dan beberapa nilai limit
+(termasuk variasi acak dari baris korpus), lalu mengukur throughput.
+
+Contoh penggunaan: python scripts/benchmark_news_parser.py --repeats 300
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.news_parser import parse_news_articles
+
+CORPUS_PATH = Path(__file__).resolve().parent / "fixtures" / "perplexity_news_responses.json"
+LIMITS = (1, 3, 5, 10, 20)
+
+
+class LegacyNewsParser:
+    """Frozen copy of PerplexityService._parse_news_articles before the rewrite."""
+    
+    def _parse_news_articles(self, content: str, sources: list, limit: int) -> list:
+        """
+        Parse news articles from Perplexity response.
+        Attempts to extract structured news data from the text response.
+        Handles various response formats from Perplexity.
+        """
+        articles = []
+        
+        # Strategy 1: Try to split by numbered list or bullet points
+        lines = content.split('\n')
+        current_article = {}
+        
+        for line in lines:
+            line = line.strip()
+            if not line:
+                # Empty line might indicate article separator
+                if current_article and current_article.get('title'):
+                    articles.append(current_article)
+                    current_article = {}
+                continue
+            
+            # Check if line starts with a number (1., 2., etc.) or bullet
+            numbered_match = re.match(r'^(\d+)[\.\)]\s+(.+)', line)
+            bullet_match = re.match(r'^[-•*]\s+(.+)', line)
+            
+            if numbered_match or bullet_match:
+                # Save previous article if exists
+                if current_article and current_article.get('title'):
+                    articles.append(current_article)
+                    current_article = {}
+                
+                # Extract title
+                if numbered_match:
+                    title = numbered_match.group(2)
+                else:
+                    title = bullet_match.group(1)
+                
+                # Strip markdown formatting from title
+                title = self._strip_markdown(title.strip())
+                current_article['title'] = title
+                continue
+            
+            # Check for URL pattern (might be on same line or separate)
+            url_match = re.search(r'http[s]?://[^\s\)]+', line)
+            if url_match:
+                current_article['source_url'] = url_match.group(0)
+                # Remove URL from line for summary
+                line = re.sub(r'http[s]?://[^\s\)]+', '', line).strip()
+            
+            # If we have a title, accumulate summary text
+            if current_article.get('title'):
+                # Skip if line is too similar to title (avoid duplication)
+                title_lower = current_article['title'].lower()
+                line_lower = line.lower()
+                
+                # Skip if line is very similar to title (more than 80% match)
+                if line_lower and title_lower:
+                    words_in_title = set(title_lower.split())
+                    words_in_line = set(line_lower.split())
+                    if len(words_in_line) > 0:
+                        similarity = len(words_in_title.intersection(words_in_line)) / len(words_in_line)
+                        if similarity > 0.8:
+                            continue  # Skip this line as it's too similar to title
+                
+                if 'summary' not in current_article:
+                    current_article['summary'] = line
+                else:
+                    # Add to summary if not duplicate and not too similar to title
+                    if line and line not in current_article['summary'] and line_lower != title_lower:
+                        current_article['summary'] += ' ' + line
+        
+        # Add last article
+        if current_article and current_article.get('title'):
+            articles.append(current_article)
+        
+        # Strategy 2: If parsing failed, try to split by paragraphs and use sources
+        if not articles or len(articles) < limit:
+            # Split content into paragraphs
+            paragraphs = [p.strip() for p in content.split('\n\n') if p.strip()]
+            
+            # Match paragraphs with sources
+            for i, para in enumerate(paragraphs[:limit]):
+                if not para:
+                    continue
+                
+                # Extract URL from paragraph if exists
+                url_match = re.search(r'http[s]?://[^\s\)]+', para)
+                source_url = url_match.group(0) if url_match else ''
+                
+                # Remove URL from paragraph
+                para_clean = re.sub(r'http[s]?://[^\s\)]+', '', para).strip()
+                
+                # Extract title (first sentence or first line)
+                lines_in_para = para_clean.split('\n')
+                title = lines_in_para[0].strip()[:100]  # Limit title length
+                
+                # Strip markdown from title
+                title = self._strip_markdown(title)
+                
+                # Get summary from remaining lines, but ensure it's different from title
+                if len(lines_in_para) > 1:
+                    summary = ' '.join(lines_in_para[1:])
+                else:
+                    # If only one line, try to extract a summary by removing title-like parts
+                    summary = para_clean
+                    # Remove title if it appears in summary
+                    if title.lower() in summary.lower():
+                        summary = summary.replace(title, '', 1).strip()
+                
+                # Strip markdown from summary too
+                summary = self._strip_markdown(summary)
+                
+                # If summary is too similar to title or empty, create a generic summary
+                if not summary or summary.lower() == title.lower() or len(summary) < 20:
+                    summary = "Ringkasan artikel tidak tersedia."
+                
+                # If we don't have this article yet, add it
+                if not any(a.get('title', '') == title for a in articles):
+                    articles.append({
+                        "title": title,
+                        "summary": summary[:300] if len(summary) > 300 else summary,
+                        "source_url": source_url
+                    })
+        
+        # Strategy 3: If still no articles, create from sources
+        if not articles and sources:
+            # Split content into chunks
+            content_chunks = [c.strip() for c in content.split('\n\n') if c.strip()]
+            for i, source in enumerate(sources[:limit]):
+                chunk = content_chunks[i] if i < len(content_chunks) else content[:200]
+                # Try to extract a better title from chunk
+                chunk_lines = chunk.split('\n')
+                title = self._strip_markdown(chunk_lines[0].strip()[:100]) if chunk_lines else f"Berita {i+1}"
+                summary = ' '.join(chunk_lines[1:]) if len(chunk_lines) > 1 else chunk
+                articles.append({
+                    "title": title if title else f"Berita {i+1}",
+                    "summary": summary[:300] + "..." if len(summary) > 300 else summary,
+                    "source_url": source if isinstance(source, str) else source.get('url', '') if isinstance(source, dict) else ''
+                })
+        
+        # Limit results
+        articles = articles[:limit]
+        
+        # Ensure all articles have required fields
+        for article in articles:
+            if 'source_url' not in article:
+                article['source_url'] = ''
+            if 'summary' not in article or not article['summary']:
+                article['summary'] = article.get('title', 'Tidak ada ringkasan')
+            if 'title' not in article or not article['title']:
+                article['title'] = 'Tidak ada judul'
+        
+        return articles
+    
+    def _strip_markdown(self, text: str) -> str:
+        """
+        Strip markdown formatting from text.
+        Removes **bold**, *italic*, __bold__, _italic_, and other markdown syntax.
+        """
+        if not text:
+            return text
+        
+        # Remove markdown bold (**text** or __text__)
+        text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)
+        text = re.sub(r'__(.+?)__', r'\1', text)
+        
+        # Remove markdown italic (*text* or _text_)
+        text = re.sub(r'\*(.+?)\*', r'\1', text)
+        text = re.sub(r'_(.+?)_', r'\1', text)
+        
+        # Remove markdown links [text](url)
+        text = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', text)
+        
+        # Remove markdown headers (# Header)
+        text = re.sub(r'^#+\s+', '', text, flags=re.MULTILINE)
+        
+        # Remove markdown code blocks
+        text = re.sub(r'`([^`]+)`', r'\1', text)
+        text = re.sub(r'```[\s\S]*?```', '', text)
+        
+        # Clean up extra spaces
+        text = re.sub(r'\s+', ' ', text).strip()
+        
+        return text
+
+
+def load_corpus(path: Path = CORPUS_PATH):
+    """Read [{"name", "content", "sources"}] corpus responses."""
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def variants(corpus, count: int, seed: int = 13):
+    """Shuffled recombinations of corpus lines, to exercise parser edge cases."""
+    rng = random.Random(seed)
+    lines = [line for item in corpus for line in item["content"].split("\n")]
+    sources = [source for item in corpus for source in item["sources"]]
+    for i in range(count):
+        picked = rng.sample(lines, min(len(lines), rng.randint(1, 40)))
+        yield {"name": f"variant-{i}", "content": "\n".join(picked), "sources": rng.sample(sources, rng.randint(0, 3))}
+
+
+def check_parity(cases, legacy: LegacyNewsParser) -> int:
+    mismatches = 0
+    for case in cases:
+        for limit in LIMITS:
+            expected = legacy._parse_news_articles(case["content"], case["sources"], limit)
+            actual = parse_news_articles(case["content"], case["sources"], limit)
+            if expected != actual:
+                mismatches += 1
+                print(f"❌ {case['name']} (limit={limit}) berbeda")
+    return mismatches
+
+
+def throughput(parse, corpus, repeats: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeats):
+        for item in corpus:
+            parse(item["content"], item["sources"], 10)
+    return repeats * len(corpus) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parser berita Perplexity")
+    parser.add_argument("--repeats", type=int, default=200, help="Jumlah pengulangan korpus untuk throughput")
+    parser.add_argument("--variants", type=int, default=500, help="Jumlah variasi acak untuk uji paritas")
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    legacy = LegacyNewsParser()
+
+    cases = corpus + list(variants(corpus, args.variants))
+    mismatches = check_parity(cases, legacy)
+    print(f"Paritas: {len(cases) * len(LIMITS) - mismatches}/{len(cases) * len(LIMITS)} identik")
+
+    old_rate = throughput(legacy._parse_news_articles, corpus, args.repeats)
+    new_rate = throughput(parse_news_articles, corpus, args.repeats)
+    print(f"Parser lama : {old_rate:10,.0f} respons/detik")
+    print(f"Parser baru : {new_rate:10,.0f} respons/detik ({new_rate / old_rate:.2f}x)")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Bandingkan akurasi vs latensi backend sentimen: PyTorch, ONNX fp32, dan ONNX int8.
+Label setiap backend harus sama dengan PyTorch setelah dipetakan oleh
+_transform_label_to_score; akurasi dihitung terhadap korpus berlabel.
+
+Contoh penggunaan: python scripts/compare_sentiment_backends.py --onnx-dir ./models/onnx
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config import SENTIMENT_ONNX_DIR
+from app.services.model_registry import MODEL_CANDIDATES
+from app.services.sentiment_backends import OnnxBackend, TorchPipelineBackend
+from app.services.sentiment_service import SentimentAnalysisService
+
+CORPUS_PATH = Path(__file__).resolve().parent / "fixtures" / "sentiment_corpus.tsv"
+
+
+def load_corpus(path: Path = CORPUS_PATH):
+    """Read (label, text) pairs from the TSV corpus."""
+    rows = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+        label, text = line.split("\t", 1)
+        rows.append((label, text))
+    return rows
+
+
+def score_to_label(score: float) -> str:
+    """Same thresholds as the consensus label."""
+    if score >= 0.6:
+        return "POSITIF"
+    if score <= 0.4:
+        return "NEGATIF"
+    return "NETRAL"
+
+
+def benchmark(backend, texts, batch_size: int, repeats: int):
+    backend.predict(texts[:batch_size], batch_size=batch_size)  # warm-up
+    timings = []
+    predictions = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        predictions = backend.predict(texts, batch_size=batch_size)
+        timings.append(time.perf_counter() - started)
+    return predictions, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perbandingan backend sentimen")
+    parser.add_argument("--model", default=MODEL_CANDIDATES[0])
+    parser.add_argument("--onnx-dir", default=SENTIMENT_ONNX_DIR)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    gold = [label for label, _ in corpus]
+    texts = [text for _, text in corpus]
+    to_score = SentimentAnalysisService()._transform_label_to_score
+
+    backends = [("torch", TorchPipelineBackend(args.model))]
+    for name, quantized in (("onnx-fp32", False), ("onnx-int8", True)):
+        try:
+            backends.append((name, OnnxBackend(args.onnx_dir, quantized=quantized)))
+        except Exception as e:
+            print(f"⚠️  {name} dilewati: {e}")
+
+    reference = None
+    print("=" * 78)
+    print(f"{'Backend':<12}{'ms/teks':>10}{'p50 batch ms':>15}{'Akurasi':>10}{'Sama dg torch':>16}{'Δ skor':>10}")
+    print("=" * 78)
+    for name, backend in backends:
+        predictions, timings = benchmark(backend, texts, args.batch_size, args.repeats)
+        labels = [p["label"] for p in predictions]
+        scores = [to_score(label) for label in labels]
+        if reference is None:
+            reference = (labels, scores)
+
+        accuracy = sum(score_to_label(s) == g for s, g in zip(scores, gold)) / len(gold)
+        agreement = sum(a == b for a, b in zip(labels, reference[0])) / len(labels)
+        score_delta = statistics.fmean(abs(a - b) for a, b in zip(scores, reference[1]))
+        per_text_ms = statistics.median(timings) * 1000 / len(texts)
+        print(
+            f"{name:<12}{per_text_ms:>10.2f}{statistics.median(timings) * 1000:>15.1f}"
+            f"{accuracy:>10.1%}{agreement:>16.1%}{score_delta:>10.3f}"
+        )
+    print("=" * 78)
+    print(f"Korpus: {len(texts)} teks, batch {args.batch_size}, {args.repeats} pengulangan")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""
+Ekspor model sentimen ke ONNX (opsional dikuantisasi int8) untuk SENTIMENT_BACKEND=onnx.
+Contoh penggunaan: python scripts/export_onnx_model.py --output ./models/onnx
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config import SENTIMENT_ONNX_DIR
+from app.services.model_registry import MODEL_CANDIDATES
+from app.services.sentiment_backends import export_onnx_model
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ekspor model sentimen ke ONNX")
+    parser.add_argument("--model", default=MODEL_CANDIDATES[0], help="Nama model Hugging Face")
+    parser.add_argument("--output", default=SENTIMENT_ONNX_DIR, help="Direktori keluaran")
+    parser.add_argument("--no-quantize", action="store_true", help="Lewati kuantisasi dinamis int8")
+    parser.add_argument("--opset", type=int, default=14, help="Versi opset ONNX")
+    args = parser.parse_args()
+
+    paths = export_onnx_model(args.model, args.output, quantize=not args.no_quantize, opset=args.opset)
+    for variant, path in paths.items():
+        size_mb = Path(path).stat().st_size / (1024 * 1024)
+        print(f"✅ {variant}: {path} ({size_mb:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
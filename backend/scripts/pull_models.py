@@ -0,0 +1,67 @@
+"""
+Isi direktori artefak model (SENTIMENT_MODEL_STORE) untuk instalasi offline.
+Dijalankan saat build image; saat runtime model dimuat langsung dari disk.
+
+Contoh penggunaan:
+    python scripts/pull_models.py pull                 # semua kandidat, format torch
+    python scripts/pull_models.py pull --format onnx   # model utama, ONNX int8
+    python scripts/pull_models.py list
+    python scripts/pull_models.py verify
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.model_registry import MODEL_CANDIDATES
+from app.services.model_store import FORMATS, model_store
+
+
+def pull(args) -> int:
+    models = args.model or (MODEL_CANDIDATES if args.format == "torch" else MODEL_CANDIDATES[:1])
+    for model_id in models:
+        entry = model_store.pull(model_id, fmt=args.format, revision=args.revision, quantize=not args.no_quantize)
+        print(f"✅ {entry['model_id']}@{entry['revision'][:12]} ({entry['format']}) → {entry['path']}")
+    return 0
+
+
+def list_models(args) -> int:
+    entries = model_store.entries()
+    if not entries:
+        print(f"Belum ada model di {model_store.root}")
+    for entry in entries:
+        print(f"{entry['model_id']:<55}{entry['format']:<7}{entry['revision'][:12]:<14}{entry['path']}")
+    return 0
+
+
+def verify(args) -> int:
+    failed = 0
+    for entry in model_store.entries():
+        ok = model_store.verify(entry["model_id"], entry["format"])
+        failed += not ok
+        print(f"{'✅' if ok else '❌'} {entry['model_id']} ({entry['format']})")
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kelola artefak model sentimen lokal")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    pull_parser = commands.add_parser("pull", help="Unduh model dan simpan ke direktori artefak")
+    pull_parser.add_argument("--model", action="append", help="Model Hugging Face (default: kandidat terkonfigurasi)")
+    pull_parser.add_argument("--format", choices=FORMATS, default="torch")
+    pull_parser.add_argument("--revision", default=None, help="Revisi/commit model (default: main)")
+    pull_parser.add_argument("--no-quantize", action="store_true", help="ONNX tanpa kuantisasi int8")
+    pull_parser.set_defaults(handler=pull)
+
+    commands.add_parser("list", help="Tampilkan isi manifest").set_defaults(handler=list_models)
+    commands.add_parser("verify", help="Periksa checksum setiap artefak").set_defaults(handler=verify)
+
+    args = parser.parse_args()
+    sys.exit(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Jalankan pool worker inferensi bersama untuk INFERENCE_EXECUTOR=remote.
+Model dimuat sekali lalu worker di-fork, sehingga bobot model dibagi
+(copy-on-write) dan menambah worker uvicorn tidak menambah memori model.
+
+Contoh penggunaan: python scripts/run_inference_workers.py --workers 2
+"""
+
+import argparse
+import signal
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config import (
+    INFERENCE_AUTHKEY,
+    INFERENCE_REMOTE_TIMEOUT,
+    INFERENCE_SOCKET,
+    INFERENCE_TORCH_THREADS,
+    INFERENCE_WORKERS,
+)
+from app.services.inference_workers import InferenceWorkerPool
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pool worker inferensi sentimen")
+    parser.add_argument("--socket", default=INFERENCE_SOCKET)
+    parser.add_argument("--workers", type=int, default=INFERENCE_WORKERS)
+    parser.add_argument("--torch-threads", type=int, default=INFERENCE_TORCH_THREADS or 1)
+    args = parser.parse_args()
+
+    Path(args.socket).parent.mkdir(parents=True, exist_ok=True)
+    pool = InferenceWorkerPool(
+        args.socket,
+        num_workers=args.workers,
+        torch_threads=args.torch_threads,
+        authkey=INFERENCE_AUTHKEY.encode() or None,
+        job_timeout=INFERENCE_REMOTE_TIMEOUT
+    )
+    pool.start()
+
+    def stop(signum, frame):
+        pool.shutdown()
+        sys.exit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        pool.serve_forever()
+    except KeyboardInterrupt:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
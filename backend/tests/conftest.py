@@ -0,0 +1,8 @@
+"""
+Shared test setup: make the ``app`` package importable when pytest runs from backend/.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,57 @@
+"""
+Tests for reading the announced result count from a search page.
+"""
+
+from app.services.case_parser import parse_results_page
+
+BASE_URL = "https://putusan3.mahkamahagung.go.id"
+
+
+def _entry(title: str) -> str:
+    return (
+        '<div class="entry-c"><div class="small">Putus : 01-01-2020</div>'
+        '<strong><a href="/direktori/putusan/c1.html">Putusan MAHKAMAH AGUNG Nomor 1 K/Pdt/2020</a></strong>'
+        f'<div>Tanggal 1 Januari 2020 {title}</div></div>'
+    )
+
+
+def _page(header: str, title: str) -> str:
+    return f"<html><body>{header}<div id='posts'>{_entry(title)}</div></body></html>"
+
+
+def test_total_is_read_from_the_heading_block():
+    html = _page('<div class="heading-block"><span>Ditemukan 1.287 data</span></div>', "gugatan PT X")
+
+    cases, total = parse_results_page(html, BASE_URL)
+
+    assert len(cases) == 1
+    assert total == 1287
+
+
+def test_number_in_a_case_title_is_not_the_total():
+    # No header on the page: only the result container mentions a count
+    html = _page("", "perkara yang ditemukan 5 putusan terkait PT X")
+
+    _, total = parse_results_page(html, BASE_URL)
+
+    assert total is None
+
+
+def test_header_wins_over_a_count_in_an_earlier_title():
+    html = (
+        "<html><body><div id='posts'>"
+        + _entry("ditemukan 5 putusan sebelumnya")
+        + "</div><ul class='pagination'><li>Ditemukan 40 data</li></ul></body></html>"
+    )
+
+    _, total = parse_results_page(html, BASE_URL)
+
+    assert total == 40
+
+
+def test_total_outside_known_classes_is_still_found():
+    html = _page("<p>Ditemukan 12 data</p>", "gugatan PT X")
+
+    _, total = parse_results_page(html, BASE_URL)
+
+    assert total == 12
@@ -0,0 +1,41 @@
+"""
+Tests for near-duplicate clustering and the streaming title guard.
+"""
+
+from app.services import dedup
+from app.services.dedup import cluster_articles, skip_repeated_titles
+
+
+def test_same_title_clusters_and_keeps_fullest_text():
+    articles = [
+        {"title": "Bank Mandiri laba naik", "summary": "Singkat."},
+        {"title": "Bank Mandiri: Laba Naik!", "summary": "Versi yang jauh lebih lengkap dari berita yang sama."},
+        {"title": "Sidang gugatan pailit ditunda", "summary": "Berita lain sama sekali."},
+    ]
+
+    clusters = cluster_articles(articles, max_distance=0)
+
+    assert [size for _, size in clusters] == [2, 1]
+    assert clusters[0][0] is articles[1]
+
+
+def test_repeated_titles_are_not_forwarded(monkeypatch):
+    monkeypatch.setattr(dedup, "NEWS_DEDUP_ENABLED", True)
+    scored = []
+    callback = skip_repeated_titles(lambda article: scored.append(article["summary"]))
+
+    callback({"title": "Bank Mandiri laba naik", "summary": "a"})
+    callback({"title": "bank mandiri - laba naik", "summary": "b"})
+    callback({"title": "Sidang ditunda", "summary": "c"})
+    # Untitled articles cannot be compared and always go through
+    callback({"title": "", "summary": "d"})
+    callback({"title": "", "summary": "e"})
+
+    assert scored == ["a", "c", "d", "e"]
+
+
+def test_title_guard_is_a_no_op_when_dedup_is_disabled(monkeypatch):
+    monkeypatch.setattr(dedup, "NEWS_DEDUP_ENABLED", False)
+    on_article = lambda article: None
+
+    assert skip_repeated_titles(on_article) is on_article
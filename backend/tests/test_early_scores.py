@@ -0,0 +1,46 @@
+"""
+Tests for scoring streamed articles ahead of analyze_texts.
+"""
+
+import asyncio
+from app.services.sentiment_service import SentimentAnalysisService
+
+GOOD = "Laba perusahaan naik tajam tahun ini"
+BAD = "Artikel ini membuat model gagal"
+SLOW = "Artikel ini tidak pernah diklaim"
+
+
+class FakeService(SentimentAnalysisService):
+    async def _score_cached_async(self, texts):
+        if BAD in texts:
+            raise RuntimeError("model error")
+        if SLOW in texts:
+            await asyncio.sleep(10)
+        return [{"consensus_score": 0.7, "text": text} for text in texts]
+
+
+def test_failed_early_score_only_fails_its_article():
+    async def main():
+        service = FakeService()
+        service.score_early(BAD)
+        service.score_early(GOOD)
+        await asyncio.sleep(0)
+        return await service.analyze_texts([GOOD, BAD, "pendek"])
+
+    good, bad, short = asyncio.run(main())
+
+    assert good["text"] == GOOD
+    assert "model error" in bad["error"]
+    assert "error" in short
+
+
+def test_unclaimed_early_scores_are_cancelled():
+    async def main():
+        service = FakeService()
+        service.score_early(SLOW)
+        task = service._early_scores[SLOW]
+        service.discard_early_scores()
+        await asyncio.sleep(0)
+        return task.cancelled(), service._early_scores
+
+    assert asyncio.run(main()) == (True, {})
@@ -0,0 +1,40 @@
+"""
+Tests for the per-host politeness scheduler.
+"""
+
+import asyncio
+import time
+from app.services.host_scheduler import HostScheduler
+
+
+def test_host_scheduler_paces_per_host_only():
+    async def main():
+        scheduler = HostScheduler(min_interval=0.1, burst=1)
+        started = time.monotonic()
+        finished = {}
+
+        async def request(url):
+            await scheduler.wait(url)
+            finished.setdefault(url.split("/")[2], []).append(time.monotonic() - started)
+
+        await asyncio.gather(
+            *(request(f"https://a.example/{i}") for i in range(3)),
+            request("https://b.example/x")
+        )
+        return finished, scheduler.stats()
+
+    finished, stats = asyncio.run(main())
+    assert finished["b.example"][0] < 0.05
+    assert max(finished["a.example"]) >= 0.18
+    assert stats["hosts"]["a.example"]["requests"] == 3
+
+
+def test_host_scheduler_disabled_with_zero_interval():
+    async def main():
+        scheduler = HostScheduler(min_interval=0)
+        started = time.monotonic()
+        for _ in range(5):
+            await scheduler.wait("https://a.example/")
+        return time.monotonic() - started
+
+    assert asyncio.run(main()) < 0.05
@@ -0,0 +1,110 @@
+"""
+Tests for the micro-batching inference queue.
+"""
+
+import asyncio
+from app.services.inference_queue import BatchInferenceQueue
+
+
+def test_concurrent_submissions_share_a_batch():
+    calls = []
+
+    def batch_fn(texts):
+        calls.append(list(texts))
+        return [text.upper() for text in texts]
+
+    async def main():
+        queue = BatchInferenceQueue(batch_fn, max_batch_size=8, max_wait_ms=20)
+        results = await asyncio.gather(*(queue.submit(f"t{i}") for i in range(5)))
+        await queue.close()
+        return results
+
+    assert asyncio.run(main()) == ["T0", "T1", "T2", "T3", "T4"]
+    assert len(calls) == 1
+
+
+def test_batches_respect_max_batch_size():
+    calls = []
+
+    def batch_fn(texts):
+        calls.append(len(texts))
+        return texts
+
+    async def main():
+        queue = BatchInferenceQueue(batch_fn, max_batch_size=2, max_wait_ms=20)
+        results = await queue.submit_many(["a", "b", "c", "d", "e"])
+        await queue.close()
+        return results
+
+    assert asyncio.run(main()) == ["a", "b", "c", "d", "e"]
+    assert max(calls) <= 2 and sum(calls) == 5
+
+
+def test_batch_error_fails_every_caller_in_the_batch():
+    def batch_fn(texts):
+        raise RuntimeError("model rusak")
+
+    async def main():
+        queue = BatchInferenceQueue(batch_fn, max_batch_size=4, max_wait_ms=10)
+        results = await asyncio.gather(queue.submit("a"), queue.submit("b"), return_exceptions=True)
+        await queue.close()
+        return results
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_cancelled_callers_are_skipped():
+    seen = []
+
+    def batch_fn(texts):
+        seen.extend(texts)
+        return texts
+
+    async def main():
+        queue = BatchInferenceQueue(batch_fn, max_batch_size=4, max_wait_ms=50)
+        gone = asyncio.ensure_future(queue.submit("gone"))
+        kept = asyncio.ensure_future(queue.submit("kept"))
+        await asyncio.sleep(0.01)
+        gone.cancel()
+        result = await kept
+        await queue.close()
+        return result
+
+    assert asyncio.run(main()) == "kept"
+    assert seen == ["kept"]
+
+
+def test_short_result_list_fails_the_whole_batch():
+    async def main():
+        queue = BatchInferenceQueue(lambda texts: texts[:1], max_batch_size=4, max_wait_ms=20)
+        gathered = asyncio.gather(queue.submit("a"), queue.submit("b"), return_exceptions=True)
+        results = await asyncio.wait_for(gathered, timeout=1)
+        await queue.close()
+        return results
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_cancelled_batch_fails_its_callers():
+    started = None
+
+    class SlowExecutor:
+        max_workers = 1
+
+        async def run(self, func, texts):
+            started.set()
+            await asyncio.sleep(10)
+
+    async def main():
+        nonlocal started
+        started = asyncio.Event()
+        queue = BatchInferenceQueue(lambda texts: texts, max_wait_ms=1, executor=SlowExecutor())
+        caller = asyncio.ensure_future(queue.submit("a"))
+        await started.wait()
+        await queue.close()
+        return await asyncio.wait_for(asyncio.gather(caller, return_exceptions=True), timeout=1)
+
+    (result,) = asyncio.run(main())
+    assert isinstance(result, RuntimeError)
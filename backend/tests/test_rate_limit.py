@@ -0,0 +1,52 @@
+"""
+Tests for the asyncio token bucket.
+"""
+
+import asyncio
+import time
+import pytest
+from app.utils.rate_limit import TokenBucket
+
+
+def test_bucket_allows_burst_then_paces():
+    async def main():
+        bucket = TokenBucket(rate=20, capacity=2)
+        started = time.monotonic()
+        for _ in range(4):
+            assert await bucket.acquire()
+        return time.monotonic() - started
+
+    # Two tokens banked, two more at 1/20 s each
+    elapsed = asyncio.run(main())
+    assert 0.08 <= elapsed < 0.3
+
+
+def test_bucket_rejects_when_wait_exceeds_max_wait():
+    async def main():
+        bucket = TokenBucket(rate=1, capacity=1)
+        assert await bucket.acquire(max_wait=0)
+        # Rejected callers reserve nothing
+        assert not await bucket.acquire(max_wait=0.1)
+        assert not await bucket.acquire(max_wait=0.1)
+        return bucket.delay()
+
+    assert asyncio.run(main()) <= 1.0
+
+
+def test_bucket_returns_token_when_waiter_is_cancelled():
+    async def main():
+        bucket = TokenBucket(rate=1, capacity=1)
+        await bucket.acquire()
+        waiter = asyncio.ensure_future(bucket.acquire())
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        return bucket.delay()
+
+    assert asyncio.run(main()) <= 1.0
+
+
+def test_bucket_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
@@ -0,0 +1,186 @@
+"""
+Tests for the circuit breaker state machine and the resilient caller built on it.
+"""
+
+import asyncio
+import time
+import httpx
+import pytest
+from app.services.resilience import CircuitBreaker, ResilientCaller, parse_retry_after
+from app.utils.exceptions import PerplexityQuotaExceededError, PerplexityUnavailableError
+
+
+def status_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://upstream.example/")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(status, request=request))
+
+
+def open_breaker(reset_timeout: float = 0.05) -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=reset_timeout)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    return breaker
+
+
+def caller(breaker: CircuitBreaker, **kwargs) -> ResilientCaller:
+    return ResilientCaller("test", max_attempts=1, base_delay=0, breaker=breaker, **kwargs)
+
+
+async def ok():
+    return "ok"
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert breaker.times_opened == 1
+
+
+def test_breaker_half_open_admits_a_single_probe():
+    breaker = open_breaker()
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    assert not breaker.allow()
+
+
+def test_half_open_probe_success_closes_and_failure_reopens():
+    breaker = open_breaker()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+    breaker = open_breaker()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+
+def test_release_frees_the_probe_without_changing_state():
+    breaker = open_breaker()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+
+
+def test_cancelled_half_open_probe_does_not_wedge_the_breaker():
+    async def main():
+        breaker = open_breaker()
+        upstream = caller(breaker)
+        await asyncio.sleep(0.06)
+
+        async def hang():
+            await asyncio.sleep(10)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(upstream.call(hang), timeout=0.05)
+        assert breaker.state == "half_open"
+        return await upstream.call(ok), breaker.state
+
+    assert asyncio.run(main()) == ("ok", "closed")
+
+
+def test_ignored_error_during_probe_releases_the_slot():
+    async def main():
+        breaker = open_breaker()
+        upstream = caller(breaker, ignore=(PerplexityQuotaExceededError,))
+        await asyncio.sleep(0.06)
+
+        async def quota():
+            raise PerplexityQuotaExceededError("kuota habis")
+
+        with pytest.raises(PerplexityQuotaExceededError):
+            await upstream.call(quota)
+        return await upstream.call(ok), breaker.state
+
+    assert asyncio.run(main()) == ("ok", "closed")
+
+
+def test_quota_rejection_releases_the_probe():
+    async def main():
+        breaker = open_breaker()
+        admitted = {"allow": False}
+
+        async def admit():
+            if not admitted["allow"]:
+                raise PerplexityQuotaExceededError("kuota habis")
+
+        upstream = caller(breaker, admit=admit)
+        await asyncio.sleep(0.06)
+        with pytest.raises(PerplexityQuotaExceededError):
+            await upstream.call(ok)
+        # Nothing went upstream, so the next request may still probe
+        assert breaker.state == "half_open"
+        admitted["allow"] = True
+        return await upstream.call(ok), breaker.state
+
+    assert asyncio.run(main()) == ("ok", "closed")
+
+
+def test_open_breaker_consumes_no_quota():
+    async def main():
+        admitted = {"n": 0}
+
+        async def admit():
+            admitted["n"] += 1
+
+        upstream = caller(open_breaker(reset_timeout=10), admit=admit)
+        for _ in range(5):
+            with pytest.raises(PerplexityUnavailableError):
+                await upstream.call(ok)
+        return admitted["n"], upstream.metrics["short_circuited"]
+
+    assert asyncio.run(main()) == (0, 5)
+
+
+def test_open_breaker_short_circuits():
+    async def main():
+        upstream = caller(open_breaker(reset_timeout=10))
+        with pytest.raises(PerplexityUnavailableError):
+            await upstream.call(ok)
+        return upstream.metrics["short_circuited"]
+
+    assert asyncio.run(main()) == 1
+
+
+def test_retries_transient_errors_but_not_client_errors():
+    async def main():
+        upstream = ResilientCaller("test", max_attempts=3, base_delay=0.001, breaker=CircuitBreaker(10, 10))
+        calls = {"n": 0}
+
+        async def flaky():
+            calls["n"] += 1
+            if calls["n"] < 3:
+                raise status_error(503)
+            return "ok"
+
+        result = await upstream.call(flaky)
+
+        async def rejected():
+            raise status_error(400)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await upstream.call(rejected)
+        return result, calls["n"], upstream.metrics["retries"], upstream.breaker.failures
+
+    # The 400 is neither retried nor counted against upstream health
+    assert asyncio.run(main()) == ("ok", 3, 2, 0)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("bukan tanggal") is None
@@ -0,0 +1,78 @@
+"""
+Tests for keying cached sentiment results on the model that produced them.
+"""
+
+import pytest
+from app.services import sentiment_service
+from app.services.model_registry import SentimentModelRegistry
+from app.services.sentiment_cache import SentimentResultCache
+from app.services.sentiment_service import SentimentAnalysisService
+
+TEXT = "Perusahaan ini menunjukkan kinerja yang sangat baik"
+
+
+class FakeLexicon:
+    def polarity_scores(self, text):
+        return {"compound": 0.0, "pos": 0.0, "neg": 0.0, "neu": 1.0}
+
+
+class FakeBackend:
+    name = "torch"
+    tokenizer = None
+
+    def __init__(self, label):
+        self.label = label
+        self.model_name = label
+
+    def predict(self, texts, batch_size=1):
+        return [{"label": self.label, "score": 0.9} for _ in texts]
+
+
+class FakeChunker:
+    def __init__(self, tokenizer, max_tokens):
+        pass
+
+    def chunk_many(self, texts):
+        return [[(text, len(text.split()))] for text in texts]
+
+
+def loaded_registry(label, ref, revision):
+    registry = SentimentModelRegistry()
+    registry._lexicon = FakeLexicon()
+    registry._backend = FakeBackend(label)
+    registry.model_ref = ref
+    registry.model_revision = revision
+    return registry
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = SentimentResultCache(persistent=False)
+    monkeypatch.setattr(sentiment_service, "sentiment_cache", cache)
+    monkeypatch.setattr(sentiment_service, "TokenChunker", FakeChunker)
+    return cache
+
+
+def test_fallback_scores_are_not_served_for_the_primary_model(cache):
+    fallback = SentimentAnalysisService(loaded_registry("1 star", "fallback/model", "hub"))
+    primary = SentimentAnalysisService(loaded_registry("5 stars", "primary/model", "abc123"))
+
+    assert fallback.analyze_text(TEXT)["transformer_scores"]["label"] == "1 star"
+    result = primary.analyze_text(TEXT)
+
+    assert result["transformer_scores"]["label"] == "5 stars"
+    assert result["model_id"].startswith("torch:primary/model@abc123:")
+    assert cache.stats()["memory_entries"] == 2
+
+
+def test_cache_is_bypassed_until_the_pool_reports_its_model(cache):
+    # Process and remote modes: no backend is loaded in the API process
+    api = SentimentAnalysisService(SentimentModelRegistry())
+    scored = SentimentAnalysisService(loaded_registry("5 stars", "primary/model", "abc123")).analyze_text(TEXT)
+
+    assert api._cache_lookup([TEXT], cache.get_many)[1] == {}
+
+    api._cache_store({"key": TEXT}, {"key": scored})
+
+    assert api.registry.model_id() == scored["model_id"]
+    assert len(api._cache_lookup([TEXT], cache.get_many)[1]) == 1
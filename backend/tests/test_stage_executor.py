@@ -0,0 +1,136 @@
+"""
+Tests for the stage-graph executor: ordering, concurrency, timeouts and fallbacks.
+"""
+
+import asyncio
+import time
+import pytest
+from app.services.stage_executor import StageExecutor
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_dependencies_receive_results_in_order():
+    order = []
+
+    async def fetch():
+        order.append("fetch")
+        return 2
+
+    async def double(fetch):
+        order.append("double")
+        return fetch * 2
+
+    async def total(fetch, double):
+        order.append("total")
+        return fetch + double
+
+    executor = StageExecutor("test")
+    executor.add_stage("fetch", fetch)
+    executor.add_stage("double", double, depends_on=["fetch"])
+    executor.add_stage("total", total, depends_on=["fetch", "double"])
+
+    results = run(executor.run())
+
+    assert results == {"fetch": 2, "double": 4, "total": 6}
+    assert order == ["fetch", "double", "total"]
+    assert all(entry["status"] == "sukses" for entry in executor.report.values())
+
+
+def test_independent_stages_run_concurrently():
+    async def slow():
+        await asyncio.sleep(0.2)
+        return True
+
+    executor = StageExecutor("test")
+    for name in ("a", "b", "c"):
+        executor.add_stage(name, slow)
+
+    started = time.perf_counter()
+    run(executor.run())
+
+    assert time.perf_counter() - started < 0.5
+
+
+def test_timeout_uses_fallback_and_is_reported():
+    async def hang():
+        await asyncio.sleep(10)
+
+    async def after(slow):
+        return f"got {slow}"
+
+    executor = StageExecutor("test")
+    executor.add_stage("slow", hang, timeout=0.05, fallback="cadangan")
+    executor.add_stage("after", after, depends_on=["slow"])
+
+    results = run(executor.run())
+
+    assert results == {"slow": "cadangan", "after": "got cadangan"}
+    assert executor.report["slow"]["status"] == "timeout"
+
+
+def test_failure_uses_callable_fallback_with_error():
+    async def boom():
+        raise ValueError("rusak")
+
+    executor = StageExecutor("test")
+    executor.add_stage("boom", boom, fallback=lambda e: {"error": str(e)})
+
+    results = run(executor.run())
+
+    assert results["boom"] == {"error": "rusak"}
+    assert executor.report["boom"]["status"] == "gagal"
+    assert executor.report["boom"]["error"] == "rusak"
+
+
+def test_error_stage_status_is_reported():
+    class QuotaError(Exception):
+        stage_status = "kuota_habis"
+
+    async def limited():
+        raise QuotaError("habis")
+
+    executor = StageExecutor("test")
+    executor.add_stage("limited", limited, fallback=None)
+    run(executor.run())
+
+    assert executor.report["limited"]["status"] == "kuota_habis"
+
+
+def test_required_stage_failure_cancels_others_and_raises():
+    cancelled = asyncio.Event()
+
+    async def long_running():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def required():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("wajib gagal")
+
+    async def main():
+        executor = StageExecutor("test")
+        executor.add_stage("long", long_running, fallback=None)
+        executor.add_stage("required", required)
+        with pytest.raises(RuntimeError, match="wajib gagal"):
+            await executor.run()
+        return cancelled.is_set()
+
+    assert run(main())
+
+
+def test_add_stage_rejects_unknown_dependency_and_duplicates():
+    async def noop():
+        return None
+
+    executor = StageExecutor("test")
+    with pytest.raises(ValueError):
+        executor.add_stage("b", noop, depends_on=["a"])
+    executor.add_stage("a", noop)
+    with pytest.raises(ValueError):
+        executor.add_stage("a", noop)
@@ -17,11 +17,13 @@ export interface SentimentScore {
     label: string;
     score: number;
     confidence: number;
-  };
+    chunks?: number;
+  } | null;
   consensus_score: number;
   sentiment_label: SentimentLabel;
   confidence: number;
   text_length: number;
+  tier?: "lexicon" | "transformer";
 }
 
 export interface SentimentAnalysis {
@@ -51,6 +53,7 @@ export interface LegalRecords {
   company_name: string;
   cases_found: number;
   cases: LegalCase[];
+  pages_crawled?: number;
   max_severity: string; // tinggi, sedang, rendah, tidak ada
   timestamp: string;
   source: string;
@@ -81,6 +84,7 @@ export interface NewsArticle {
   sentiment_label: SentimentLabel;
   sentiment_score: number;
   confidence: number;
+  cluster_size?: number;
 }
 
 export interface NewsAnalysis {
@@ -91,7 +95,7 @@ export interface NewsAnalysis {
   negative_count: number;
   articles: NewsArticle[];
   timestamp: string;
-  status: "sukses" | "gagal";
+  status: "sukses" | "gagal" | "kuota_habis" | "tidak_tersedia";
   error?: string;
 }
 